@@ -0,0 +1,96 @@
+"""
+Generators for synthetic ``[dependency-groups]`` tables, of various shapes.
+"""
+
+from __future__ import annotations
+
+import json
+import typing as t
+
+Table = t.Dict[str, t.List[t.Union[str, t.Dict[str, str]]]]
+
+_EXTRAS = ("toml", "tests", "socks", "crypto")
+_MARKERS = (
+    "python_version < '3.10'",
+    "sys_platform == 'win32'",
+    "platform_machine == 'x86_64' and python_version >= '3.9'",
+    "implementation_name == 'cpython'",
+)
+
+
+def _include(group: str) -> dict[str, str]:
+    return {"include-group": group}
+
+
+def wide(num_groups: int, requirements_per_group: int = 5) -> Table:
+    """
+    Many independent groups, with no includes.
+    """
+    return {
+        f"group-{i}": [f"package-{i}-{j}" for j in range(requirements_per_group)]
+        for i in range(num_groups)
+    }
+
+
+def deep(depth: int) -> Table:
+    """
+    A single long chain of includes, with one requirement per group.
+    """
+    table: Table = {
+        f"layer-{i}": [f"package-{i}", _include(f"layer-{i + 1}")] for i in range(depth)
+    }
+    table[f"layer-{depth}"] = ["leaf-package"]
+    return table
+
+
+def diamond(layers: int, width: int) -> Table:
+    """
+    Layers of groups, where every group includes every group in the layer below,
+    so that the same groups are reachable along many paths.
+    """
+    table: Table = {}
+    for layer in range(layers):
+        for i in range(width):
+            items: list[str | dict[str, str]] = [f"package-{layer}-{i}"]
+            if layer + 1 < layers:
+                items.extend(_include(f"node-{layer + 1}-{j}") for j in range(width))
+            table[f"node-{layer}-{i}"] = items
+    table["root"] = [_include(f"node-0-{i}") for i in range(width)]
+    return table
+
+
+def requirement_heavy(num_groups: int, requirements_per_group: int) -> Table:
+    """
+    Groups of complex requirements, with versions, extras, and markers. Each group
+    draws on a shared pool of requirements, so that the same strings recur across
+    groups, as in real tables.
+    """
+    pool = []
+    for i in range(requirements_per_group * 4):
+        requirement = f"package-{i}[{_EXTRAS[i % len(_EXTRAS)]}]>={i % 7}.{i % 3},<{i}"
+        if i % 2:
+            requirement += f"; {_MARKERS[i % len(_MARKERS)]}"
+        pool.append(requirement)
+
+    return {
+        f"group-{i}": [pool[(i + j) % len(pool)] for j in range(requirements_per_group)]
+        for i in range(num_groups)
+    }
+
+
+def to_pyproject(table: Table) -> str:
+    """
+    Render a table as the contents of a ``pyproject.toml`` file.
+    """
+    lines = ["[dependency-groups]"]
+    for name, items in table.items():
+        rendered = []
+        for item in items:
+            if isinstance(item, str):
+                rendered.append(json.dumps(item))
+            else:
+                rendered.append(
+                    f"{{include-group = {json.dumps(item['include-group'])}}}"
+                )
+        lines.append(f"{name} = [{', '.join(rendered)}]")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,93 @@
+"""
+Measure the import time of the CLI entrypoints with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter several times, and the fastest
+cumulative import time is reported, as JSON. The run fails if any module exceeds
+the time budget, or if it imports a module which should only be loaded lazily.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+
+CLI_MODULES = (
+    "dependency_groups.__main__",
+    "dependency_groups._lint_dependency_groups",
+    "dependency_groups._pip_wrapper",
+)
+# modules which must not be imported at CLI startup
+FORBIDDEN_MODULES = ("packaging",)
+
+
+def measure(module: str) -> tuple[int, set[str]]:
+    """
+    Import a module in a fresh interpreter, returning its cumulative import time in
+    microseconds, and the names of all modules imported.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        cumulative_times[name.strip()] = int(cumulative)
+    return cumulative_times[module], set(cumulative_times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=100.0,
+        help="The maximum allowed import time for each module. Default: 100",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="The number of times to import each module. Default: 5",
+    )
+    args = parser.parse_args()
+
+    results = []
+    failed = False
+    for module in CLI_MODULES:
+        timings = []
+        forbidden: set[str] = set()
+        for _ in range(args.runs):
+            import_time, imported = measure(module)
+            timings.append(import_time)
+            forbidden.update(
+                name for name in imported if name.split(".")[0] in FORBIDDEN_MODULES
+            )
+        best_ms = min(timings) / 1000
+        within_budget = best_ms <= args.budget_ms and not forbidden
+        failed = failed or not within_budget
+        results.append(
+            {
+                "module": module,
+                "best_ms": best_ms,
+                "runs_ms": [t / 1000 for t in timings],
+                "budget_ms": args.budget_ms,
+                "forbidden_imports": sorted(forbidden),
+                "ok": within_budget,
+            }
+        )
+
+    json.dump({"benchmark": "import_time", "results": results}, sys.stdout, indent=2)
+    print()
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark the resolver and CLIs on synthetic dependency group tables.
+
+Results are written as JSON, one record per measurement, for tracking regressions
+over time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing as t
+
+import _generators
+
+from dependency_groups import DEFAULT_REQUIREMENT_CACHE, DependencyGroupResolver
+
+# each scenario is a table, and the group to resolve within it
+Scenario = t.Tuple[_generators.Table, str]
+
+
+def scenarios(quick: bool) -> dict[str, Scenario]:
+    scale = 1 if quick else 10
+    return {
+        "wide": (_generators.wide(300 * scale), "group-0"),
+        "deep": (_generators.deep(300 * scale), "layer-0"),
+        # the resolution of the root grows as width ** layers, so the table is
+        # scaled by its width, with the number of layers held fixed
+        "diamond": (_generators.diamond(layers=4, width=8 if quick else 16), "root"),
+        "requirement-heavy": (
+            _generators.requirement_heavy(20 * scale, 50),
+            "group-0",
+        ),
+    }
+
+
+def timeit(func: t.Callable[[], object], repeat: int) -> dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min_ms": min(timings) * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+    }
+
+
+def bench_resolver(
+    name: str, scenario: Scenario, repeat: int
+) -> list[dict[str, t.Any]]:
+    table, group = scenario
+
+    def cold_resolve() -> None:
+        DEFAULT_REQUIREMENT_CACHE.clear()
+        DependencyGroupResolver(table).resolve(group)
+
+    def cold_compile() -> None:
+        DEFAULT_REQUIREMENT_CACHE.clear()
+        DependencyGroupResolver(table).compile()
+
+    def shared_cache_compile() -> None:
+        DependencyGroupResolver(table).compile()
+
+    warm_resolver = DependencyGroupResolver(table)
+    warm_resolver.compile()
+
+    def warm_resolve() -> None:
+        warm_resolver.resolve(group)
+
+    results = [
+        {"benchmark": "resolve-cold", **timeit(cold_resolve, repeat)},
+        {"benchmark": "compile-cold", **timeit(cold_compile, repeat)},
+        {"benchmark": "compile-shared-cache", **timeit(shared_cache_compile, repeat)},
+        {"benchmark": "resolve-warm", **timeit(warm_resolve, repeat)},
+    ]
+
+    for benchmark, compact in (
+        ("compile-peak-memory", False),
+        ("compile-peak-memory-compact", True),
+    ):
+        DEFAULT_REQUIREMENT_CACHE.clear()
+        tracemalloc.start()
+        resolver = DependencyGroupResolver(table, compact=compact)
+        resolver.compile()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del resolver
+        results.append(
+            {
+                "benchmark": benchmark,
+                "peak_kib": peak / 1024,
+                "retained_kib": retained / 1024,
+            }
+        )
+
+    for result in results:
+        result["scenario"] = name
+        result["groups"] = len(table)
+    return results
+
+
+def bench_cli(name: str, scenario: Scenario, repeat: int) -> list[dict[str, t.Any]]:
+    table, group = scenario
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pyproject = os.path.join(tmpdir, "pyproject.toml")
+        with open(pyproject, "w", encoding="utf-8") as fp:
+            fp.write(_generators.to_pyproject(table))
+        env = {**os.environ, "DEPENDENCY_GROUPS_CACHE_DIR": os.path.join(tmpdir, "c")}
+        command = [sys.executable, "-m", "dependency_groups", "-f", pyproject, group]
+
+        def run(*extra_args: str) -> None:
+            subprocess.run(
+                [*command, *extra_args], env=env, check=True, stdout=subprocess.DEVNULL
+            )
+
+        results = [
+            {"benchmark": "cli-uncached", **timeit(lambda: run("--no-cache"), repeat)},
+            {"benchmark": "cli-cached", **timeit(run, repeat)},
+        ]
+
+    for result in results:
+        result["scenario"] = name
+        result["groups"] = len(table)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--quick", action="store_true", help="Use small tables, for a fast run."
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="The number of times to run each benchmark. Default: 5",
+    )
+    parser.add_argument(
+        "--no-cli", action="store_true", help="Skip the CLI benchmarks."
+    )
+    parser.add_argument(
+        "-o", "--output", help="A file to write results to. Defaults to stdout."
+    )
+    args = parser.parse_args()
+
+    results = []
+    for name, scenario in scenarios(args.quick).items():
+        results.extend(bench_resolver(name, scenario, args.repeat))
+        if not args.no_cli:
+            results.extend(bench_cli(name, scenario, args.repeat))
+
+    output = {
+        "python": sys.version.split()[0],
+        "implementation": sys.implementation.name,
+        "results": results,
+    }
+    if args.output is None or args.output == "-":
+        json.dump(output, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(output, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main()
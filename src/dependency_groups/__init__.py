@@ -1,13 +1,66 @@
-from ._implementation import (
-    CyclicDependencyError,
-    DependencyGroupInclude,
-    DependencyGroupResolver,
-    resolve,
-)
+from __future__ import annotations
+
+import importlib
+
+# avoid importing `typing` at runtime, as it is slow to import
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing as t
+
+    from ._async import FileGroupResolution, resolve_files
+    from ._frozen import FrozenDependencyGroups
+    from ._implementation import (
+        BatchResolution,
+        CyclicDependencyError,
+        DependencyGroupInclude,
+        DependencyGroupResolver,
+        RequirementSource,
+        resolve,
+    )
+    from ._requirement_cache import DEFAULT_REQUIREMENT_CACHE, RequirementCache
+    from ._stats import ResolverStats
 
 __all__ = (
+    "BatchResolution",
     "CyclicDependencyError",
+    "DEFAULT_REQUIREMENT_CACHE",
     "DependencyGroupInclude",
     "DependencyGroupResolver",
+    "FileGroupResolution",
+    "FrozenDependencyGroups",
+    "RequirementCache",
+    "RequirementSource",
+    "ResolverStats",
     "resolve",
+    "resolve_files",
 )
+
+# the public API is imported on first access, so that the CLIs (which import this
+# package) only pay for importing `packaging` when they need it
+_LAZY_ATTRIBUTES = {
+    "BatchResolution": "_implementation",
+    "CyclicDependencyError": "_implementation",
+    "DEFAULT_REQUIREMENT_CACHE": "_requirement_cache",
+    "DependencyGroupInclude": "_implementation",
+    "DependencyGroupResolver": "_implementation",
+    "FileGroupResolution": "_async",
+    "FrozenDependencyGroups": "_frozen",
+    "RequirementCache": "_requirement_cache",
+    "RequirementSource": "_implementation",
+    "ResolverStats": "_stats",
+    "resolve": "_implementation",
+    "resolve_files": "_async",
+}
+
+
+def __getattr__(name: str) -> t.Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
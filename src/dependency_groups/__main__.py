@@ -1,11 +1,31 @@
+from __future__ import annotations
+
 import argparse
+import json
+import os
 import sys
+from collections.abc import Iterable, Iterator
 
-from ._implementation import resolve
+from ._cli_stats import CLIStats, cache_status, new_resolver
+from ._daemon import DaemonClient
+from ._disk_cache import ResolutionCache, resolve_table
+from ._loader import (
+    marker_environment_from_args,
+    marker_matrix_from_args,
+    parse_dependency_groups,
+    read_pyproject,
+    scan_dependency_groups,
+)
 from ._toml_compat import tomllib
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing as t
+
+    from packaging.requirements import Requirement
+
 
-def main() -> None:
+def main(*, argv: list[str] | None = None) -> None:
     if tomllib is None:
         print(
             "Usage error: dependency-groups CLI requires tomli or Python 3.11+",
@@ -13,9 +33,28 @@ def main() -> None:
         )
         raise SystemExit(2)
 
+    if argv is None:
+        argv = sys.argv[1:]
+    # `dependency-groups -- why` still resolves a group named "why"
+    if argv[:1] == ["why"]:
+        _why_main(argv[1:])
+        return
+    if argv[:1] == ["export"]:
+        _export_main(argv[1:])
+        return
+    if argv[:1] == ["daemon"]:
+        _daemon_main(argv[1:])
+        return
+
     parser = argparse.ArgumentParser(
         description=(
-            "A dependency-groups CLI. Prints out a resolved group, newline-delimited."
+            "A dependency-groups CLI. Prints out a resolved group, newline-delimited. "
+            "Use `dependency-groups why PROJECT` to find the groups which pull in a "
+            "project, `dependency-groups export` to save every resolved group to a "
+            "frozen file, and `dependency-groups daemon` to keep resolved groups in "
+            "memory between runs. Subcommands are only recognized as the first "
+            "argument; to resolve a group named why, export, or daemon, put `--` "
+            "before it, as in `dependency-groups -- why`."
         )
     )
     parser.add_argument(
@@ -38,27 +77,570 @@ def main() -> None:
         action="store_true",
         help="List the available dependency groups",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Remove duplicate requirements from the output.",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help=(
+            "Remove duplicate requirements, and merge requirements on the same "
+            "project into one, combining their extras and version specifiers."
+        ),
+    )
+    environment_args = parser.add_mutually_exclusive_group()
+    environment_args.add_argument(
+        "--filter-markers",
+        action="store_true",
+        help=(
+            "Only include requirements whose environment markers match the "
+            "current interpreter."
+        ),
+    )
+    environment_args.add_argument(
+        "--marker-environment",
+        metavar="FILE",
+        help=(
+            "Only include requirements whose environment markers match the "
+            "environment in this JSON file. Values which are not set in the file "
+            "are taken from the current interpreter."
+        ),
+    )
+    environment_args.add_argument(
+        "--matrix",
+        metavar="FILE",
+        help=(
+            "Resolve for each of the named marker environments in this JSON file, "
+            "which maps names to environments. Prints a JSON object mapping each "
+            "name to its requirements."
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=("requirements", "json", "jsonl"),
+        default="requirements",
+        help=(
+            "The output format. 'requirements' prints one requirement per line. "
+            "'json' prints an array of objects with the fields of each requirement, "
+            "and 'jsonl' prints one such object per line. Defaults to 'requirements'. "
+            "With --list, each object holds the name and normalized name of a group, "
+            "and the groups which it directly includes."
+        ),
+    )
+    parser.add_argument(
+        "--with-source",
+        action="store_true",
+        help=(
+            "With --format json or jsonl, include the group which lists each "
+            "requirement and the include path leading to it."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            "Do not read or write the on-disk cache of resolved groups, or use a "
+            "running daemon."
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help=(
+            "Print statistics about caching and resolution to stderr, as JSON, "
+            "when finished."
+        ),
+    )
+    args = parser.parse_args(argv)
+    structured = args.format != "requirements"
+    if args.with_source and not structured:
+        parser.error("--with-source requires --format json or jsonl")
+    if args.with_source and args.merge:
+        parser.error("--with-source cannot be combined with --merge")
+    if args.matrix and (structured or args.with_source):
+        parser.error("--matrix always produces JSON, and cannot be used with --format")
+    environment = marker_environment_from_args(
+        args.filter_markers, args.marker_environment
+    )
+
+    matrix = marker_matrix_from_args(args.matrix) if args.matrix else None
+
+    stats = CLIStats() if args.stats else None
+    try:
+        _run(args, environment, matrix, stats)
+    finally:
+        if stats is not None:
+            stats.write()
 
-    with open(args.pyproject_file, "rb") as fp:
-        pyproject = tomllib.load(fp)
 
-    dependency_groups_raw = pyproject.get("dependency-groups", {})
+def _run(
+    args: argparse.Namespace,
+    environment: dict[str, str] | None,
+    matrix: dict[str, dict[str, str]] | None,
+    stats: CLIStats | None,
+) -> None:
+    structured = args.format != "requirements"
+    # a running daemon can answer the same questions as the on-disk cache
+    daemon = None
+    if not (
+        structured
+        or matrix is not None
+        or environment is not None
+        or args.merge
+        or stats is not None
+    ):
+        daemon = DaemonClient.from_environment(disable=args.no_cache)
+    if daemon is not None:
+        if args.list:
+            names = daemon.list_groups(args.pyproject_file)
+            if names is not None:
+                print(*names)
+                return
+        elif args.GROUP_NAME:
+            answer = daemon.resolve(
+                args.pyproject_file, args.GROUP_NAME, dedupe=args.dedupe
+            )
+            if answer is not None:
+                _write_output(args.output, lambda fp: _write_lines(answer, fp))
+                return
 
     if args.list:
-        print(*dependency_groups_raw.keys())
+        # only the `[dependency-groups]` table is needed, so it is scanned for,
+        # rather than parsing the whole file or hashing it for the cache
+        dependency_groups_raw = scan_dependency_groups(args.pyproject_file)
+        if not structured:
+            print(*dependency_groups_raw)
+            return
+        groups = _group_records(dependency_groups_raw)
+        if args.format == "jsonl":
+            lines = (json.dumps(group) for group in groups)
+            _write_output(args.output, lambda fp: _write_lines(lines, fp, empty=""))
+        else:
+            _write_output(args.output, lambda fp: _write_json_array(groups, fp))
         return
+
+    pyproject_content = read_pyproject(args.pyproject_file)
+    # structured output needs parsed requirements, so the cache cannot serve it
+    cache = ResolutionCache.from_environment(disable=args.no_cache or structured)
+    cached = cache.load(pyproject_content) if cache is not None else None
+    if stats is not None:
+        stats.add_cache_result(cache_status(cache, cached))
+
     if not args.GROUP_NAME:
         print("A GROUP_NAME is required", file=sys.stderr)
         raise SystemExit(3)
 
-    content = "\n".join(resolve(dependency_groups_raw, *args.GROUP_NAME))
+    if matrix is not None:
+        _write_matrix(
+            parse_dependency_groups(pyproject_content),
+            args.GROUP_NAME,
+            matrix,
+            args.dedupe,
+            args.merge,
+            args.output,
+            stats,
+        )
+        return
+
+    if structured:
+        records = _resolve_records(
+            parse_dependency_groups(pyproject_content),
+            args.GROUP_NAME,
+            args.dedupe,
+            args.merge,
+            environment,
+            args.with_source,
+            stats,
+        )
+        if args.format == "jsonl":
+            lines = (json.dumps(record) for record in records)
+            _write_output(args.output, lambda fp: _write_lines(lines, fp, empty=""))
+        else:
+            _write_output(args.output, lambda fp: _write_json_array(records, fp))
+        return
+
+    dependency_groups_raw = None
+    if cache is not None and (cached is None or cached.missing(args.GROUP_NAME)):
+        # only the requested groups are resolved, so that a cold run on a large
+        # table does no more work than an uncached run
+        dependency_groups_raw = parse_dependency_groups(pyproject_content)
+        entry, resolver = resolve_table(
+            dependency_groups_raw,
+            groups=args.GROUP_NAME,
+            collect_stats=stats is not None,
+        )
+        cached = entry if cached is None else cached.merge(entry)
+        if stats is not None:
+            stats.add_resolver(resolver)
+        cache.store(pyproject_content, cached)
+
+    resolved: Iterable[str] | None = None
+    # merging and filtering requirements require parsing them, so the cache cannot
+    # serve them
+    if cached is not None and not args.merge and environment is None:
+        resolved = cached.iter_resolve(args.GROUP_NAME, dedupe=args.dedupe)
+    if resolved is None:
+        if dependency_groups_raw is None:
+            dependency_groups_raw = parse_dependency_groups(pyproject_content)
+        resolved = _resolve_lazily(
+            dependency_groups_raw,
+            args.GROUP_NAME,
+            args.dedupe,
+            args.merge,
+            environment,
+            stats,
+        )
+
+    _write_output(args.output, lambda fp: _write_lines(resolved, fp))
+
+
+def _why_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="dependency-groups why",
+        description=(
+            "Show which dependency groups pull in a project, and the include path "
+            "through which each group reaches it."
+        ),
+    )
+    parser.add_argument("PROJECT", help="The name of the project to look for.")
+    parser.add_argument(
+        "-f",
+        "--pyproject-file",
+        default="pyproject.toml",
+        help="The pyproject.toml file. Defaults to trying in the current directory.",
+    )
+    args = parser.parse_args(argv)
+
+    from ._implementation import DependencyGroupResolver
+
+    try:
+        resolver = DependencyGroupResolver(
+            parse_dependency_groups(read_pyproject(args.pyproject_file))
+        )
+        sources = resolver.why(args.PROJECT)
+    except (LookupError, ValueError, TypeError) as e:
+        _print_errors([f"{type(e).__name__}: {e}"])
+        raise SystemExit(1)
+
+    for source in sources:
+        if len(source.path) == 1:
+            print(f"{source.group}: {source.requirement}")
+        else:
+            print(
+                f"{source.group}: {source.requirement} "
+                f"(via {' -> '.join(source.path)})"
+            )
+    # groups which could not be resolved are not searched, so report them
+    errors = resolver.compile()
+    if errors:
+        _print_errors([f"{type(e).__name__}: {e}" for e in errors])
+        raise SystemExit(1)
+    if not sources:
+        print(
+            f"{args.PROJECT} is not required by any dependency group", file=sys.stderr
+        )
+        raise SystemExit(1)
+
+
+def _print_errors(messages: list[str]) -> None:
+    print("errors encountered while examining dependency groups:", file=sys.stderr)
+    for msg in messages:
+        print(f"  {msg}", file=sys.stderr)
+
+
+def _export_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="dependency-groups export",
+        description=(
+            "Resolve every dependency group, and write the results to a frozen JSON "
+            "file, which can be used without parsing pyproject.toml."
+        ),
+    )
+    parser.add_argument(
+        "-f",
+        "--pyproject-file",
+        default="pyproject.toml",
+        help="The pyproject.toml file. Defaults to trying in the current directory.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="dependency-groups.lock.json",
+        help="The frozen file. Defaults to dependency-groups.lock.json.",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help=(
+            "Do not write the frozen file, and instead exit with an error if it is "
+            "missing or out of date."
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    from ._frozen import FrozenDependencyGroups
+
+    pyproject_content = read_pyproject(args.pyproject_file)
+    if args.check:
+        try:
+            frozen = FrozenDependencyGroups.load(args.output)
+        except (OSError, ValueError) as e:
+            print(f"{args.output} could not be loaded: {e}", file=sys.stderr)
+            raise SystemExit(1)
+        if not frozen.check(pyproject_content):
+            print(
+                f"{args.output} is out of date with {args.pyproject_file}",
+                file=sys.stderr,
+            )
+            raise SystemExit(1)
+        return
+
+    try:
+        frozen = FrozenDependencyGroups.from_pyproject(pyproject_content)
+    except (LookupError, ValueError, TypeError) as e:
+        print(f"{type(e).__name__}: {e}", file=sys.stderr)
+        raise SystemExit(1)
+    frozen.dump(args.output)
+
+
+def _daemon_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="dependency-groups daemon",
+        description=(
+            "Run a daemon which keeps resolved dependency groups in memory, and "
+            "answers requests from the dependency-groups CLIs over a Unix domain "
+            "socket. The daemon runs in the foreground until it is interrupted or "
+            "stopped with --stop."
+        ),
+    )
+    parser.add_argument(
+        "--socket",
+        help=(
+            "The path of the socket. Defaults to DEPENDENCY_GROUPS_DAEMON_SOCKET, or "
+            "daemon.sock in the cache directory."
+        ),
+    )
+    control_args = parser.add_mutually_exclusive_group()
+    control_args.add_argument(
+        "--stop", action="store_true", help="Stop the running daemon."
+    )
+    control_args.add_argument(
+        "--status",
+        action="store_true",
+        help="Exit with an error if no daemon is running.",
+    )
+    args = parser.parse_args(argv)
+
+    from ._daemon import daemon_supported, default_socket_path
+
+    if not daemon_supported():
+        print(
+            "Usage error: the daemon requires support for Unix domain sockets",
+            file=sys.stderr,
+        )
+        raise SystemExit(2)
+    socket_path = args.socket or default_socket_path()
+
+    if args.stop or args.status:
+        response = DaemonClient(socket_path).request(
+            {"op": "shutdown" if args.stop else "ping"}
+        )
+        if response is None:
+            print(f"no daemon is running on {socket_path}", file=sys.stderr)
+            raise SystemExit(1)
+        state = "stopped" if args.stop else "running"
+        print(f"daemon (pid {response['pid']}) {state} on {socket_path}")
+        return
+
+    from ._daemon import serve
+
+    try:
+        serve(socket_path)
+    except (RuntimeError, OSError) as e:
+        print(e, file=sys.stderr)
+        raise SystemExit(1)
+
+
+def _group_records(dependency_groups_raw: t.Any) -> list[dict[str, t.Any]]:
+    from ._normalization import _normalize_name
+
+    records = []
+    for name, group in dependency_groups_raw.items():
+        includes = []
+        if isinstance(group, list):
+            includes = [
+                _normalize_name(item["include-group"])
+                for item in group
+                if isinstance(item, dict) and isinstance(item.get("include-group"), str)
+            ]
+        records.append(
+            {"name": name, "normalized": _normalize_name(name), "includes": includes}
+        )
+    return records
+
+
+def _resolve_lazily(
+    dependency_groups_raw: t.Any,
+    groups: list[str],
+    dedupe: bool,
+    merge: bool,
+    environment: dict[str, str] | None,
+    stats: CLIStats | None,
+) -> Iterable[str]:
+    resolver = new_resolver(dependency_groups_raw, stats)
+    if merge:
+        resolution = resolver.resolve_many(*groups, merge=True, environment=environment)
+        return [str(r) for r in resolution.requirements]
+
+    resolved = (
+        str(r)
+        for group in groups
+        for r in resolver.iter_resolve(group, environment=environment)
+    )
+    if dedupe:
+        return _unique(resolved)
+    return resolved
+
+
+def _write_matrix(
+    dependency_groups_raw: t.Any,
+    groups: list[str],
+    matrix: dict[str, dict[str, str]],
+    dedupe: bool,
+    merge: bool,
+    output: str | None,
+    stats: CLIStats | None,
+) -> None:
+    resolver = new_resolver(dependency_groups_raw, stats)
+    resolved = resolver.resolve_matrix(
+        *groups, environments=matrix, dedupe=dedupe, merge=merge
+    )
+    result = {
+        name: [str(r) for r in requirements] for name, requirements in resolved.items()
+    }
+    _write_output(output, lambda fp: fp.write(json.dumps(result, indent=2) + "\n"))
+
+
+def _resolve_records(
+    dependency_groups_raw: t.Any,
+    groups: list[str],
+    dedupe: bool,
+    merge: bool,
+    environment: dict[str, str] | None,
+    with_source: bool,
+    stats: CLIStats | None,
+) -> Iterator[dict[str, t.Any]]:
+    resolver = new_resolver(dependency_groups_raw, stats)
+    if merge:
+        resolution = resolver.resolve_many(*groups, merge=True, environment=environment)
+        for requirement in resolution.requirements:
+            yield _requirement_record(requirement)
+        return
+
+    seen = set()
+    for group in groups:
+        for source in resolver.iter_resolve_sources(group, environment=environment):
+            if dedupe:
+                line = str(source.requirement)
+                if line in seen:
+                    continue
+                seen.add(line)
+            record = _requirement_record(source.requirement)
+            if with_source:
+                record["group"] = source.path[-1]
+                record["path"] = list(source.path)
+            yield record
+
+
+def _requirement_record(requirement: Requirement) -> dict[str, t.Any]:
+    return {
+        "requirement": str(requirement),
+        "name": requirement.name,
+        "extras": sorted(requirement.extras),
+        "specifier": str(requirement.specifier),
+        "marker": None if requirement.marker is None else str(requirement.marker),
+        "url": requirement.url,
+    }
+
+
+def _unique(lines: Iterable[str]) -> Iterator[str]:
+    seen = set()
+    for line in lines:
+        if line not in seen:
+            seen.add(line)
+            yield line
+
+
+def _write_output(output: str | None, write: t.Callable[[t.TextIO], object]) -> None:
+    """
+    Write output to a file, or to stdout.
+
+    Output is produced while groups are being resolved, so a regular file is
+    written to a temporary file first and moved into place only if writing
+    succeeds, so that an error never leaves it truncated or half-written.
+    """
+    if output is None or output == "-":
+        write(sys.stdout)
+        return
+    if os.path.exists(output) and not os.path.isfile(output):
+        # e.g. a pipe or a device, which cannot be replaced
+        with open(output, "w", encoding="utf-8") as fp:
+            write(fp)
+        return
+
+    import tempfile
+
+    # write through symlinks, replacing the file which they point to
+    output = os.path.realpath(output)
+    directory, filename = os.path.split(output)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{filename}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fp:
+            write(fp)
+        os.chmod(tmp_path, _output_mode(output))
+        os.replace(tmp_path, output)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _output_mode(output: str) -> int:
+    # keep the mode of an existing file, or use the mode `open()` would have used
+    try:
+        return os.stat(output).st_mode & 0o7777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _write_lines(lines: Iterable[str], fp: t.TextIO, *, empty: str = "\n") -> None:
+    """
+    Write lines to a file as they are produced, rather than joining them first.
+
+    :param empty: the text to write if there are no lines
+    """
+    wrote = False
+    for line in lines:
+        fp.write(line)
+        fp.write("\n")
+        wrote = True
+    if not wrote:
+        fp.write(empty)
+
 
-    if args.output is None or args.output == "-":
-        print(content)
-    else:
-        with open(args.output, "w", encoding="utf-8") as fp:
-            print(content, file=fp)
+def _write_json_array(records: Iterable[dict[str, t.Any]], fp: t.TextIO) -> None:
+    """
+    Write a JSON array one element at a time, with one element per line.
+    """
+    separator = "[\n  "
+    for record in records:
+        fp.write(separator)
+        fp.write(json.dumps(record))
+        separator = ",\n  "
+    fp.write("[]\n" if separator == "[\n  " else "\n]\n")
 
 
 if __name__ == "__main__":
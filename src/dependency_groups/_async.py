@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import dataclasses
+import os
+from collections.abc import AsyncIterator, Iterable
+
+from packaging.requirements import Requirement
+
+from ._implementation import DependencyGroupResolver
+from ._loader import parse_dependency_groups, read_pyproject
+from ._normalization import _normalize_name
+from ._toml_compat import tomllib
+
+
+@dataclasses.dataclass(frozen=True)
+class FileGroupResolution:
+    """
+    The result of resolving one dependency group from one ``pyproject.toml`` file.
+    """
+
+    #: the path of the file, as a string
+    path: str
+    #: the normalized name of the group, or None if the file itself could not be
+    #: loaded, in which case ``errors`` describes the problem
+    group: str | None
+    #: the resolved requirements of the group, empty if there were errors
+    requirements: tuple[Requirement, ...] = ()
+    #: the errors encountered while loading the file or resolving the group
+    errors: tuple[Exception, ...] = ()
+
+
+async def resolve_files(
+    paths: Iterable[str | os.PathLike[str]],
+    *groups: str,
+    max_workers: int | None = None,
+    executor: concurrent.futures.Executor | None = None,
+) -> AsyncIterator[FileGroupResolution]:
+    """
+    Resolve dependency groups from many ``pyproject.toml`` files concurrently,
+    producing results as each file is finished.
+
+    Reading, parsing, and resolving each file is done in an executor, so that the
+    event loop is not blocked. Only a bounded number of files are in progress at
+    once, so very long sequences of paths can be processed in constant memory.
+
+    Results for a file are produced together, in the order of its groups, but files
+    are finished in no particular order.
+
+    :param paths: the ``pyproject.toml`` files to resolve
+    :param groups: the names of the groups to resolve in each file. If none are
+        given, every group in each file is resolved.
+    :param max_workers: the number of files to work on at once. If no ``executor``
+        is given, this is the number of worker threads. Defaults to the same number
+        as ``ThreadPoolExecutor``.
+    :param executor: an executor to run the work in. It is not shut down when the
+        iteration is finished.
+
+    :raises ImportError: if no TOML parser is available
+    """
+    if tomllib is None:
+        raise ImportError("resolve_files() requires tomli or Python 3.11+")
+
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    own_executor = executor is None
+    if executor is None:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+    # keep every worker busy while results are being consumed
+    limit = 2 * max_workers
+
+    loop = asyncio.get_running_loop()
+    pending: set[asyncio.Future[list[FileGroupResolution]]] = set()
+    path_iterator = iter(paths)
+    try:
+        while True:
+            for path in path_iterator:
+                pending.add(
+                    loop.run_in_executor(
+                        executor, _resolve_file, os.fspath(path), groups
+                    )
+                )
+                if len(pending) >= limit:
+                    break
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                for result in future.result():
+                    yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False)
+
+
+def _resolve_file(path: str, groups: tuple[str, ...]) -> list[FileGroupResolution]:
+    try:
+        resolver = DependencyGroupResolver(
+            parse_dependency_groups(read_pyproject(path))
+        )
+    except (OSError, ValueError, TypeError) as e:
+        # unreadable file, invalid TOML or UTF-8, or an invalid table
+        return [FileGroupResolution(path, None, errors=(e,))]
+
+    results = []
+    for group in [_normalize_name(g) for g in groups] or resolver.dependency_groups:
+        try:
+            requirements = resolver.resolve(group)
+        except (LookupError, ValueError, TypeError) as e:
+            results.append(FileGroupResolution(path, group, errors=(e,)))
+        else:
+            results.append(FileGroupResolution(path, group, requirements))
+    return results
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing as t
+
+    from ._implementation import DependencyGroupResolver
+
+
+class CLIStats:
+    """
+    Statistics for a run of one of the CLIs, reported as JSON by ``--stats``.
+
+    The statistics of every resolver used by the run are added together, except for
+    ``max_include_depth``, which is the greatest depth seen by any of them.
+    """
+
+    def __init__(self) -> None:
+        self._start = time.perf_counter()
+        self.cache = {"hit": 0, "miss": 0, "disabled": 0}
+        self.resolver: dict[str, t.Any] | None = None
+        # resolvers may be used lazily, so their statistics are read at the end
+        self._resolvers: list[DependencyGroupResolver] = []
+
+    def add_cache_result(self, status: str) -> None:
+        self.cache[status] += 1
+
+    def add_resolver(self, resolver: DependencyGroupResolver | None) -> None:
+        if resolver is not None and resolver not in self._resolvers:
+            self._resolvers.append(resolver)
+
+    def add_resolver_stats(self, stats: dict[str, t.Any] | None) -> None:
+        if stats is None:
+            return
+        if self.resolver is None:
+            self.resolver = dict(stats)
+            return
+        for field, value in stats.items():
+            if field == "max_include_depth":
+                self.resolver[field] = max(self.resolver[field], value)
+            else:
+                self.resolver[field] += value
+
+    def write(self, fp: t.TextIO | None = None) -> None:
+        for resolver in self._resolvers:
+            self.add_resolver_stats(resolver.stats()._asdict())
+        self._resolvers.clear()
+        report = {
+            "elapsed_time": time.perf_counter() - self._start,
+            "cache": self.cache,
+            "resolver": self.resolver,
+            "requirement_cache": None,
+        }
+        # only report on the requirement cache if it was used, rather than importing
+        # `packaging` just to report that it is empty
+        requirement_cache = sys.modules.get("dependency_groups._requirement_cache")
+        if requirement_cache is not None:
+            report["requirement_cache"] = (
+                requirement_cache.DEFAULT_REQUIREMENT_CACHE.info()._asdict()
+            )
+        json.dump(report, fp or sys.stderr)
+        (fp or sys.stderr).write("\n")
+
+
+def cache_status(cache: object, cached: object) -> str:
+    """
+    Describe the outcome of a disk cache lookup, for ``CLIStats.add_cache_result()``.
+    """
+    if cache is None:
+        return "disabled"
+    return "miss" if cached is None else "hit"
+
+
+def new_resolver(
+    dependency_groups: t.Any, stats: CLIStats | None
+) -> DependencyGroupResolver:
+    """
+    Create a resolver for a CLI, collecting its statistics if ``stats`` is given.
+    """
+    from ._implementation import DependencyGroupResolver
+
+    resolver = DependencyGroupResolver(
+        dependency_groups, collect_stats=stats is not None
+    )
+    if stats is not None:
+        stats.add_resolver(resolver)
+    return resolver
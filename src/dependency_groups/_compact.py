@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import array
+import threading
+import typing as t
+from collections.abc import Callable, Iterator
+
+from packaging.requirements import Requirement
+
+if t.TYPE_CHECKING:
+    from ._implementation import DependencyGroupInclude
+
+    _Item = t.Union[Requirement, DependencyGroupInclude]
+
+
+class CompactGroups:
+    """
+    The parsed and resolved groups of a resolver in compact mode.
+
+    Each distinct requirement string is parsed once and stored once, in a table
+    shared by all groups, and is identified by its position in the table. Groups
+    are stored as arrays of these positions. In parsed groups, includes are stored
+    as negative numbers, ``~i`` standing for the ``i``-th distinct include.
+
+    A group without includes resolves to exactly its parsed requirements, so it
+    shares one array for both.
+    """
+
+    def __init__(self) -> None:
+        self.requirements: list[Requirement] = []
+        self.includes: list[DependencyGroupInclude] = []
+        self.parsed: dict[str, array.array[int]] = {}
+        self.resolved: dict[str, array.array[int]] = {}
+        self._requirement_positions: dict[str, int] = {}
+        self._include_positions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def parse(
+        self,
+        group: str,
+        raw_group: list[object],
+        parse_item: Callable[[object], _Item],
+    ) -> tuple[_Item, ...]:
+        """
+        Parse a group, storing it, and return its items.
+
+        :param group: the name of the group
+        :param raw_group: the items of the group, as found in the table
+        :param parse_item: the function used to parse and validate new items
+        """
+        positions = array.array("i")
+        for item in raw_group:
+            if isinstance(item, str):
+                positions.append(self._intern_requirement(item, parse_item))
+            else:
+                positions.append(self._intern_include(parse_item(item)))
+        self.parsed[group] = positions
+        return self.items(positions)
+
+    def items(self, positions: array.array[int]) -> tuple[_Item, ...]:
+        requirements = self.requirements
+        includes = self.includes
+        return tuple(
+            requirements[position] if position >= 0 else includes[~position]
+            for position in positions
+        )
+
+    def resolve(self, group: str) -> tuple[Requirement, ...]:
+        """
+        Store the resolution of a parsed group, whose includes have all been
+        resolved, and return it. If the group was already resolved, the existing
+        resolution is kept.
+        """
+        resolved = self.resolved.get(group)
+        if resolved is None:
+            parsed = self.parsed[group]
+            if all(position >= 0 for position in parsed):
+                resolved = parsed
+            else:
+                resolved = array.array("i")
+                for position in parsed:
+                    if position >= 0:
+                        resolved.append(position)
+                    else:
+                        resolved.extend(
+                            self.resolved[self.includes[~position].include_group]
+                        )
+            resolved = self.resolved.setdefault(group, resolved)
+        requirements = self.requirements
+        return tuple(requirements[position] for position in resolved)
+
+    def _intern_requirement(
+        self, item: str, parse_item: Callable[[object], _Item]
+    ) -> int:
+        position = self._requirement_positions.get(item)
+        if position is None:
+            # parse outside of the lock, as it is the slow part
+            requirement = parse_item(item)
+            with self._lock:
+                position = self._requirement_positions.get(item)
+                if position is None:
+                    position = len(self.requirements)
+                    self.requirements.append(t.cast(Requirement, requirement))
+                    self._requirement_positions[item] = position
+        return position
+
+    def _intern_include(self, include: _Item) -> int:
+        include = t.cast("DependencyGroupInclude", include)
+        with self._lock:
+            position = self._include_positions.get(include.include_group)
+            if position is None:
+                position = len(self.includes)
+                self.includes.append(include)
+                self._include_positions[include.include_group] = position
+        return ~position
+
+
+class CompactParsedGroups(t.MutableMapping[str, t.Tuple["_Item", ...]]):
+    """
+    A view of the parsed groups in ``CompactGroups``, as tuples of items.
+
+    Groups are added by ``CompactGroups.parse()``.
+    """
+
+    def __init__(self, groups: CompactGroups) -> None:
+        self._groups = groups
+
+    def __getitem__(self, group: str) -> tuple[_Item, ...]:
+        return self._groups.items(self._groups.parsed[group])
+
+    def __setitem__(self, group: str, value: tuple[_Item, ...]) -> None:
+        raise TypeError("Compact groups are added when they are parsed")
+
+    def __delitem__(self, group: str) -> None:
+        del self._groups.parsed[group]
+
+    def __contains__(self, group: object) -> bool:
+        return group in self._groups.parsed
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._groups.parsed)
+
+    def __len__(self) -> int:
+        return len(self._groups.parsed)
+
+
+class CompactResolutions(t.MutableMapping[str, t.Tuple[Requirement, ...]]):
+    """
+    A view of the resolved groups in ``CompactGroups``, as tuples of requirements.
+
+    Groups are added by ``CompactGroups.resolve()``.
+    """
+
+    def __init__(self, groups: CompactGroups) -> None:
+        self._groups = groups
+
+    def __getitem__(self, group: str) -> tuple[Requirement, ...]:
+        requirements = self._groups.requirements
+        resolved = self._groups.resolved[group]
+        return tuple(requirements[position] for position in resolved)
+
+    def __setitem__(self, group: str, value: tuple[Requirement, ...]) -> None:
+        raise TypeError("Compact resolutions are added by CompactGroups.resolve()")
+
+    def __delitem__(self, group: str) -> None:
+        del self._groups.resolved[group]
+
+    def __contains__(self, group: object) -> bool:
+        return group in self._groups.resolved
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._groups.resolved)
+
+    def __len__(self) -> int:
+        return len(self._groups.resolved)
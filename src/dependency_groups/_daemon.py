@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import json
+import os
+
+from ._disk_cache import default_cache_dir
+
+# the client side of this module is used by the CLIs on every run, so it imports
+# `socket` only when there is a daemon to connect to, and the server imports the
+# resolver when it is started
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import socketserver
+    import typing as t
+
+    from ._disk_cache import CachedTable
+    from ._implementation import DependencyGroupResolver
+
+# bump this whenever the protocol changes, so that clients ignore old daemons
+PROTOCOL_VERSION = 1
+DEFAULT_MAX_ENTRIES = 256
+
+
+def default_socket_path() -> str:
+    """
+    Get the path of the daemon's socket, which may be set with
+    ``DEPENDENCY_GROUPS_DAEMON_SOCKET``.
+    """
+    if "DEPENDENCY_GROUPS_DAEMON_SOCKET" in os.environ:
+        return os.environ["DEPENDENCY_GROUPS_DAEMON_SOCKET"]
+    return os.path.join(default_cache_dir(), "daemon.sock")
+
+
+def daemon_supported() -> bool:
+    import socket
+
+    return hasattr(socket, "AF_UNIX")
+
+
+class DaemonClient:
+    """
+    A client for a running resolver daemon, for use by the CLIs.
+
+    Every method returns None if the daemon cannot answer, e.g. because it is not
+    running, or because the file or a group is not valid. The caller should then
+    do the work itself, which also produces the appropriate error messages.
+
+    :param socket_path: The path of the daemon's socket.
+    :param timeout: How long to wait for the daemon, in seconds.
+    """
+
+    def __init__(self, socket_path: str, *, timeout: float = 5.0) -> None:
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    @classmethod
+    def from_environment(cls, *, disable: bool = False) -> DaemonClient | None:
+        """
+        Get a client for CLI usage, or None if no daemon appears to be running, or
+        if use of the daemon is disabled, either by the caller or by setting
+        ``DEPENDENCY_GROUPS_NO_DAEMON``.
+        """
+        if disable or os.environ.get("DEPENDENCY_GROUPS_NO_DAEMON"):
+            return None
+        socket_path = default_socket_path()
+        # checking for the socket is much cheaper than failing to connect to it
+        if not os.path.exists(socket_path) or not daemon_supported():
+            return None
+        return cls(socket_path)
+
+    def request(self, message: dict[str, t.Any]) -> dict[str, t.Any] | None:
+        """
+        Send a request to the daemon, returning its response, or None if the
+        request failed.
+        """
+        import socket
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+                with sock.makefile("rb") as fp:
+                    response = json.loads(fp.readline())
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(response, dict)
+            or response.get("version") != PROTOCOL_VERSION
+            or "error" in response
+        ):
+            return None
+        return response
+
+    def resolve(
+        self, path: str, groups: list[str], *, dedupe: bool = False
+    ) -> list[str] | None:
+        """
+        Resolve groups from a ``pyproject.toml`` file, returning None if any of them
+        is not valid.
+        """
+        response = self.request(
+            {
+                "op": "resolve",
+                "path": os.path.abspath(path),
+                "groups": groups,
+                "dedupe": dedupe,
+            }
+        )
+        return None if response is None else response["requirements"]
+
+    def list_groups(self, path: str) -> list[str] | None:
+        """
+        List the groups in a ``pyproject.toml`` file, as written in the file.
+        """
+        response = self.request({"op": "list", "path": os.path.abspath(path)})
+        return None if response is None else response["names"]
+
+    def lint(self, path: str) -> list[str] | None:
+        """
+        Check every group in a ``pyproject.toml`` file, returning the errors found.
+        """
+        response = self.request({"op": "lint", "path": os.path.abspath(path)})
+        return None if response is None else response["errors"]
+
+
+class _Entry:
+    __slots__ = ("key", "table", "resolver")
+
+    def __init__(
+        self,
+        key: tuple[int, int],
+        table: CachedTable,
+        resolver: DependencyGroupResolver | None,
+    ) -> None:
+        self.key = key
+        self.table = table
+        self.resolver = resolver
+
+
+class ResolverDaemon:
+    """
+    The state of a resolver daemon: a warm resolver for each ``pyproject.toml``
+    file which has been requested, along with the resolution of its table.
+
+    Files are checked on every request, and are loaded again if their modification
+    time or size has changed. Resolvers are updated in place, so that only the
+    groups affected by a change are resolved again.
+
+    :param max_entries: The maximum number of files to keep. The least recently
+        used files beyond this limit are discarded.
+    """
+
+    def __init__(self, *, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        import collections
+        import threading
+
+        self.max_entries = max_entries
+        self._entries: collections.OrderedDict[str, _Entry] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def handle(self, message: t.Any) -> dict[str, t.Any]:
+        """
+        Answer a single request.
+        """
+        response = self._handle(message)
+        response["version"] = PROTOCOL_VERSION
+        return response
+
+    def _handle(self, message: t.Any) -> dict[str, t.Any]:
+        if not isinstance(message, dict):
+            return {"error": "request is not a JSON object"}
+        op = message.get("op")
+        if op == "ping":
+            return {"pid": os.getpid()}
+        if op not in ("resolve", "list", "lint"):
+            return {"error": f"unknown op: {op!r}"}
+        path = message.get("path")
+        if not isinstance(path, str):
+            return {"error": "path is not a string"}
+        try:
+            table = self._load(path)
+        except (OSError, ValueError) as e:
+            # unreadable file, invalid TOML or UTF-8
+            return {"error": f"{type(e).__name__}: {e}"}
+
+        if op == "list":
+            return {"names": table.names}
+        if op == "lint":
+            return {"errors": table.errors}
+        groups = message.get("groups")
+        if not isinstance(groups, list) or not all(isinstance(g, str) for g in groups):
+            return {"error": "groups is not a list of strings"}
+        requirements = table.resolve(groups, dedupe=bool(message.get("dedupe")))
+        if requirements is None:
+            return {"error": "groups could not be resolved"}
+        return {"requirements": requirements}
+
+    def _load(self, path: str) -> CachedTable:
+        from collections.abc import Mapping
+
+        from ._disk_cache import resolve_table, summarize_resolver
+        from ._loader import parse_dependency_groups, read_pyproject
+
+        with self._lock:
+            stat = os.stat(path)
+            key = (stat.st_mtime_ns, stat.st_size)
+            entry = self._entries.get(path)
+            if entry is not None and entry.key == key:
+                self._entries.move_to_end(path)
+                return entry.table
+
+            dependency_groups = parse_dependency_groups(read_pyproject(path))
+            resolver = None if entry is None else entry.resolver
+            if resolver is not None and isinstance(dependency_groups, Mapping):
+                try:
+                    resolver.update(dependency_groups)
+                except (ValueError, TypeError):
+                    resolver = None
+                else:
+                    table = summarize_resolver(resolver, list(dependency_groups))
+            if resolver is None:
+                table, resolver = resolve_table(dependency_groups)
+
+            self._entries[path] = _Entry(key, table, resolver)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return table
+
+
+def make_server(
+    socket_path: str, daemon: ResolverDaemon | None = None
+) -> socketserver.BaseServer:
+    """
+    Create a server which answers requests on a Unix domain socket, with one
+    thread per connection.
+
+    Each request and response is a JSON object on a single line. A connection may
+    be used for any number of requests. A ``shutdown`` request stops the server.
+
+    :raises OSError: if the socket cannot be created
+    """
+    import socketserver
+
+    state = daemon if daemon is not None else ResolverDaemon()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for line in self.rfile:
+                shutdown = False
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    response = {"version": PROTOCOL_VERSION, "error": "invalid JSON"}
+                else:
+                    if isinstance(message, dict) and message.get("op") == "shutdown":
+                        shutdown = True
+                        response = {"version": PROTOCOL_VERSION, "pid": os.getpid()}
+                    else:
+                        response = state.handle(message)
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                self.wfile.flush()
+                if shutdown:
+                    # this runs in a worker thread, so it can wait for the server
+                    self.server.shutdown()
+                    return
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    # only the current user may connect
+    old_umask = os.umask(0o177)
+    try:
+        return Server(socket_path, Handler)
+    finally:
+        os.umask(old_umask)
+
+
+def serve(socket_path: str) -> None:
+    """
+    Run a daemon on a socket until it is interrupted, removing the socket when it
+    stops.
+
+    A socket left behind by a daemon which is no longer running is replaced.
+
+    :raises RuntimeError: if another daemon is already running on the socket
+    :raises OSError: if the socket cannot be created
+    """
+    if os.path.exists(socket_path):
+        if DaemonClient(socket_path).request({"op": "ping"}) is not None:
+            raise RuntimeError(f"A daemon is already running on {socket_path}")
+        os.remove(socket_path)
+    directory = os.path.dirname(socket_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    server = make_server(socket_path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.remove(socket_path)
+        except OSError:
+            pass
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+
+from ._normalization import _normalize_name
+
+# this module is imported by the CLIs on every run, so it avoids importing
+# `typing` and `dataclasses`, which are slow to import
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ._implementation import DependencyGroupResolver
+
+# bump this whenever the format or meaning of cache entries changes
+CACHE_FORMAT_VERSION = 2
+DEFAULT_MAX_ENTRIES = 256
+
+
+class CachedTable:
+    """
+    The results of resolving an entire ``[dependency-groups]`` table.
+
+    :param names: the names of the groups, as written in the table
+    :param groups: the resolved requirements of each valid group, by normalized
+        group name
+    :param errors: the errors found in the table, formatted as
+        ``"ErrorType: message"``
+    :param complete: whether every group in the table was resolved. Otherwise, only
+        the groups which were requested (and those they include) are present, and
+        ``errors`` only describes problems with the table as a whole.
+    """
+
+    __slots__ = ("names", "groups", "errors", "complete")
+
+    def __init__(
+        self,
+        names: list[str],
+        groups: dict[str, list[str]],
+        errors: list[str],
+        complete: bool = True,
+    ) -> None:
+        self.names = names
+        self.groups = groups
+        self.errors = errors
+        self.complete = complete
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CachedTable):
+            return NotImplemented
+        return (self.names, self.groups, self.errors, self.complete) == (
+            other.names,
+            other.groups,
+            other.errors,
+            other.complete,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CachedTable(names={self.names!r}, groups={self.groups!r}, "
+            f"errors={self.errors!r}, complete={self.complete!r})"
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "names": self.names,
+            "groups": self.groups,
+            "errors": self.errors,
+            "complete": self.complete,
+        }
+
+    def missing(self, groups: Iterable[str]) -> bool:
+        """
+        Check whether any of the groups may be valid, but has not been resolved yet.
+        This is never the case for a complete table.
+        """
+        if self.complete:
+            return False
+        return not all(_normalize_name(group) in self.groups for group in groups)
+
+    def merge(self, other: CachedTable) -> CachedTable:
+        """
+        Combine two partial resolutions of the same table.
+        """
+        if other.complete:
+            return other
+        return CachedTable(
+            other.names, {**self.groups, **other.groups}, other.errors, self.complete
+        )
+
+    def resolve(
+        self, groups: Iterable[str], *, dedupe: bool = False
+    ) -> list[str] | None:
+        """
+        Resolve groups from the cached data, returning None if any of them is not
+        present (e.g. because it is invalid).
+
+        :param groups: the names of the groups to resolve
+        :param dedupe: if true, remove duplicate requirements
+        """
+        resolved = self.iter_resolve(groups, dedupe=dedupe)
+        return None if resolved is None else list(resolved)
+
+    def iter_resolve(
+        self, groups: Iterable[str], *, dedupe: bool = False
+    ) -> Iterator[str] | None:
+        """
+        Like ``resolve()``, but produce the requirements one at a time, rather than
+        building a new list.
+        """
+        normalized_groups = [_normalize_name(group) for group in groups]
+        if not all(group in self.groups for group in normalized_groups):
+            return None
+        resolved = (r for group in normalized_groups for r in self.groups[group])
+        if dedupe:
+            return _unique(resolved)
+        return resolved
+
+
+def _unique(items: Iterable[str]) -> Iterator[str]:
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
+
+
+def resolve_table(
+    dependency_groups: object,
+    *,
+    groups: Iterable[str] | None = None,
+    collect_stats: bool = False,
+) -> tuple[CachedTable, DependencyGroupResolver | None]:
+    """
+    Resolve a table, producing a cacheable summary of the results.
+
+    The resolver is also returned (unless the table could not be loaded at all), so
+    that callers can continue to use it.
+
+    :param groups: the groups to resolve. Resolving a few groups of a large table is
+        much faster than resolving all of them, but produces an incomplete summary,
+        without errors for the groups which were not resolved. Defaults to
+        resolving every group.
+    :param collect_stats: passed to the resolver
+    """
+    # imported here, so that warm runs never import `packaging`
+    from ._implementation import DependencyGroupResolver
+
+    names = list(dependency_groups) if isinstance(dependency_groups, Mapping) else []
+    try:
+        resolver = DependencyGroupResolver(
+            dependency_groups, collect_stats=collect_stats  # type: ignore[arg-type]
+        )
+    except (ValueError, TypeError) as e:
+        return CachedTable(names, {}, [f"{type(e).__name__}: {e}"]), None
+
+    if groups is None:
+        return summarize_resolver(resolver, names), resolver
+
+    for group in groups:
+        try:
+            resolver.resolve(group)
+        except (LookupError, ValueError, TypeError):
+            # invalid groups are left out, and reported by the caller
+            pass
+    return _summarize_resolutions(resolver, names, [], complete=False), resolver
+
+
+def summarize_resolver(
+    resolver: DependencyGroupResolver, names: list[str]
+) -> CachedTable:
+    """
+    Resolve every group with an existing resolver, producing a cacheable summary of
+    the results. Groups which the resolver has already resolved are not resolved
+    again.
+
+    :param names: the names of the groups, as written in the table
+    """
+    errors = [f"{type(e).__name__}: {e}" for e in resolver.compile()]
+    return _summarize_resolutions(resolver, names, errors, complete=True)
+
+
+def _summarize_resolutions(
+    resolver: DependencyGroupResolver,
+    names: list[str],
+    errors: list[str],
+    *,
+    complete: bool,
+) -> CachedTable:
+    groups = {
+        group: [str(r) for r in requirements]
+        for group, requirements in resolver._resolve_cache.items()
+    }
+    return CachedTable(names, groups, errors, complete)
+
+
+def default_cache_dir() -> str:
+    """
+    Get the cache directory, which may be set with ``DEPENDENCY_GROUPS_CACHE_DIR``.
+    """
+    if "DEPENDENCY_GROUPS_CACHE_DIR" in os.environ:
+        return os.environ["DEPENDENCY_GROUPS_CACHE_DIR"]
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(base, "dependency-groups")
+
+
+class ResolutionCache:
+    """
+    A directory of cached table resolutions, for use by the CLIs.
+
+    Entries are keyed by a hash of the raw contents of a ``pyproject.toml`` file, so
+    a warm run only needs to read and hash the file, skipping TOML parsing,
+    requirement parsing, and resolution. A changed file never matches a stale entry,
+    and old entries are pruned once the cache exceeds its size limit.
+
+    :param cache_dir: The directory holding the cache.
+    :param max_entries: The maximum number of entries to keep. When a new entry is
+        stored, the least recently used entries beyond this limit are removed.
+    """
+
+    def __init__(
+        self, cache_dir: str, *, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._fingerprint: bytes | None = None
+
+    @classmethod
+    def from_environment(cls, *, disable: bool = False) -> ResolutionCache | None:
+        """
+        Get the cache for CLI usage, or None if caching is disabled, either by the
+        caller or by setting ``DEPENDENCY_GROUPS_NO_CACHE``.
+        """
+        if disable or os.environ.get("DEPENDENCY_GROUPS_NO_CACHE"):
+            return None
+        return cls(default_cache_dir())
+
+    def load(self, content: bytes) -> CachedTable | None:
+        """
+        Get the cached resolution of a ``pyproject.toml`` file, if there is one.
+
+        :param content: the raw contents of the file
+        """
+        path = self._entry_path(content)
+        try:
+            with open(path, encoding="utf-8") as fp:
+                data = json.load(fp)
+            entry = CachedTable(
+                data["names"], data["groups"], data["errors"], data["complete"]
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        # mark the entry as recently used, so that it is not pruned
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def store(self, content: bytes, entry: CachedTable) -> None:
+        """
+        Save the resolution of a ``pyproject.toml`` file. Failures to write are
+        ignored, as the cache is only an optimization.
+
+        :param content: the raw contents of the file
+        :param entry: the resolved table
+        """
+        import tempfile
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write to a temporary file and move it into place, so that concurrent
+            # readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                json.dump(entry.to_dict(), fp, separators=(",", ":"))
+            os.replace(tmp_path, self._entry_path(content))
+        except OSError:
+            return
+        self.prune()
+
+    def prune(self) -> None:
+        """
+        Remove the least recently used entries beyond the size limit.
+        """
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith(".json")
+            ]
+            if len(entries) <= self.max_entries:
+                return
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[: len(entries) - self.max_entries]:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+    def _entry_path(self, content: bytes) -> str:
+        if self._fingerprint is None:
+            self._fingerprint = _installation_fingerprint()
+        digest = hashlib.sha256(b"%d\0" % CACHE_FORMAT_VERSION)
+        digest.update(self._fingerprint)
+        digest.update(content)
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}.json")
+
+
+def _installation_fingerprint() -> bytes:
+    """
+    Identify the installed versions of this package and of ``packaging``, which
+    determine the contents of cache entries, so that upgrading either one never
+    serves entries built by the old version.
+
+    Reading versions from package metadata is far slower than the rest of a warm
+    run, and ``packaging`` is not imported on warm runs, so this uses the files
+    themselves: the contents of ``packaging/__init__.py``, which holds its version,
+    and the modification times and sizes of this package's modules, which change
+    whenever it is reinstalled.
+    """
+    import importlib.machinery
+
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in ("_disk_cache.py", "_implementation.py"):
+        path = os.path.join(package_dir, module)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\0".encode())
+
+    spec = importlib.machinery.PathFinder.find_spec("packaging")
+    if spec is not None and spec.origin is not None:
+        try:
+            with open(spec.origin, "rb") as fp:
+                digest.update(fp.read())
+        except OSError:
+            pass
+    return digest.digest()
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+
+from ._normalization import _normalize_name
+
+# frozen artifacts are read in deployment, where startup time matters, so this
+# module avoids importing `typing`, `tomllib`, and `packaging` unless it has to
+# build an artifact
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing as t
+
+# bump this whenever the format or meaning of frozen artifacts changes
+FROZEN_FORMAT_VERSION = 1
+
+
+class FrozenDependencyGroups:
+    """
+    The fully resolved contents of a ``[dependency-groups]`` table, which can be
+    saved as a compact JSON artifact and used in place of the table.
+
+    Answering ``resolve()`` from a loaded artifact needs neither a TOML parser nor
+    ``packaging``. The artifact records hashes of the file and table it was built
+    from, so that ``check()`` can cheaply verify that it is up to date.
+
+    :param requirements: every distinct requirement string, in normalized form
+    :param groups: the resolved requirements of each group, by normalized group
+        name, as positions in ``requirements``
+    :param includes: the groups directly included by each group, by normalized
+        group name
+    :param source_hash: the SHA-256 hash of the ``pyproject.toml`` file
+    :param table_hash: the SHA-256 hash of the ``[dependency-groups]`` table
+    """
+
+    __slots__ = ("requirements", "groups", "includes", "source_hash", "table_hash")
+
+    def __init__(
+        self,
+        requirements: list[str],
+        groups: dict[str, list[int]],
+        includes: dict[str, list[str]],
+        source_hash: str,
+        table_hash: str,
+    ) -> None:
+        self.requirements = requirements
+        self.groups = groups
+        self.includes = includes
+        self.source_hash = source_hash
+        self.table_hash = table_hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FrozenDependencyGroups):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return (
+            f"FrozenDependencyGroups(groups={list(self.groups)!r}, "
+            f"source_hash={self.source_hash!r})"
+        )
+
+    @classmethod
+    def from_pyproject(cls, content: bytes) -> FrozenDependencyGroups:
+        """
+        Resolve every group in the ``[dependency-groups]`` table of a
+        ``pyproject.toml`` file.
+
+        :param content: the raw contents of the file
+
+        :raises ValueError: if the table or any of its groups is not valid, with the
+            first problem found
+        :raises TypeError: if the table or any of its groups is not valid, with the
+            first problem found
+        :raises LookupError: if an included group is absent
+        """
+        from ._loader import parse_dependency_groups
+
+        return cls.from_table(
+            parse_dependency_groups(content), source_hash=_sha256(content)
+        )
+
+    @classmethod
+    def from_table(
+        cls, dependency_groups: Mapping[str, t.Any], *, source_hash: str = ""
+    ) -> FrozenDependencyGroups:
+        """
+        Resolve every group in a ``[dependency-groups]`` table.
+
+        :param dependency_groups: the table
+        :param source_hash: the hash of the file containing the table, if any
+
+        :raises ValueError: if the table or any of its groups is not valid, with the
+            first problem found
+        :raises TypeError: if the table or any of its groups is not valid, with the
+            first problem found
+        :raises LookupError: if an included group is absent
+        """
+        from ._implementation import DependencyGroupInclude, DependencyGroupResolver
+
+        resolver = DependencyGroupResolver(dependency_groups)
+        errors = resolver.compile()
+        if errors:
+            raise errors[0]
+
+        requirements: list[str] = []
+        positions: dict[str, int] = {}
+        groups: dict[str, list[int]] = {}
+        includes: dict[str, list[str]] = {}
+        for group in resolver.dependency_groups:
+            resolved = groups[group] = []
+            for requirement in resolver.resolve(group):
+                requirement_string = str(requirement)
+                position = positions.get(requirement_string)
+                if position is None:
+                    position = positions[requirement_string] = len(requirements)
+                    requirements.append(requirement_string)
+                resolved.append(position)
+            includes[group] = [
+                _normalize_name(item.include_group)
+                for item in resolver.lookup(group)
+                if isinstance(item, DependencyGroupInclude)
+            ]
+        return cls(
+            requirements,
+            groups,
+            includes,
+            source_hash=source_hash,
+            table_hash=_table_hash(dependency_groups),
+        )
+
+    @classmethod
+    def from_dict(cls, data: t.Any) -> FrozenDependencyGroups:
+        """
+        Load an artifact from its JSON data.
+
+        :raises ValueError: if the data is not a valid artifact of this version
+        """
+        try:
+            if data["version"] != FROZEN_FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported frozen dependency groups version: {data['version']}"
+                )
+            return cls(
+                list(data["requirements"]),
+                {group: list(items) for group, items in data["groups"].items()},
+                {group: list(items) for group, items in data["includes"].items()},
+                source_hash=data["source_hash"],
+                table_hash=data["table_hash"],
+            )
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid frozen dependency groups: {e!r}") from e
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "version": FROZEN_FORMAT_VERSION,
+            "source_hash": self.source_hash,
+            "table_hash": self.table_hash,
+            "requirements": self.requirements,
+            "groups": self.groups,
+            "includes": self.includes,
+        }
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> FrozenDependencyGroups:
+        """
+        Read an artifact written by ``dump()``.
+
+        :raises OSError: if the file cannot be read
+        :raises ValueError: if the file is not a valid artifact of this version
+        """
+        with open(path, encoding="utf-8") as fp:
+            return cls.from_dict(json.load(fp))
+
+    def dump(self, path: str | os.PathLike[str]) -> None:
+        """
+        Write the artifact to a file, as compact JSON.
+        """
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump(self.to_dict(), fp, separators=(",", ":"))
+            fp.write("\n")
+
+    def resolve(self, *groups: str, dedupe: bool = False) -> list[str]:
+        """
+        Get the resolved requirements of one or more groups, as strings.
+
+        :param groups: the names of the groups to resolve
+        :param dedupe: if true, remove duplicate requirements
+
+        :raises TypeError: if a group name is not a string
+        :raises LookupError: if a group is absent
+        """
+        positions: list[int] = []
+        for group in groups:
+            if not isinstance(group, str):
+                raise TypeError("Dependency group name is not a str")
+            normalized = _normalize_name(group)
+            if normalized not in self.groups:
+                raise LookupError(f"Dependency group '{normalized}' not found")
+            positions.extend(self.groups[normalized])
+        if dedupe:
+            positions = list(dict.fromkeys(positions))
+        requirements = self.requirements
+        return [requirements[position] for position in positions]
+
+    def check(self, content: bytes) -> bool:
+        """
+        Check whether the artifact is up to date with a ``pyproject.toml`` file.
+
+        The hash of the file is compared first, which needs no parsing. If the file
+        has changed, its ``[dependency-groups]`` table is parsed and compared, so that
+        changes elsewhere in the file do not make the artifact stale.
+
+        :param content: the raw contents of the file
+        """
+        if self.source_hash == _sha256(content):
+            return True
+
+        from ._loader import parse_dependency_groups
+
+        try:
+            return self.table_hash == _table_hash(parse_dependency_groups(content))
+        except (ValueError, TypeError):
+            # invalid TOML, or a table which could never have been frozen
+            return False
+
+
+def _sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _table_hash(dependency_groups: Mapping[str, t.Any]) -> str:
+    # the order of groups is kept, as it is the order in which they are listed
+    return _sha256(
+        json.dumps(dependency_groups, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+    )
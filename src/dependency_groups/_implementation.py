@@ -1,40 +1,58 @@
 from __future__ import annotations
 
+import copy
 import dataclasses
-import re
-from collections.abc import Mapping
+import threading
+import time
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
 
 from packaging.requirements import Requirement
+from packaging.utils import canonicalize_name
 
+from ._compact import CompactGroups, CompactParsedGroups, CompactResolutions
+from ._markers import EnvironmentKey, MarkerEvaluator, environment_key
+from ._normalization import (
+    _group_name_aliases,
+    _normalize_group_names,
+    _normalize_name,
+)
+from ._requirement_cache import DEFAULT_REQUIREMENT_CACHE, RequirementCache
+from ._stats import ResolverStats, StatsCollector
 
-def _normalize_name(name: str) -> str:
-    return re.sub(r"[-_.]+", "-", name).lower()
 
+@dataclasses.dataclass
+class DependencyGroupInclude:
+    __slots__ = ("include_group",)
 
-def _normalize_group_names(
-    dependency_groups: Mapping[str, str | Mapping[str, str]]
-) -> Mapping[str, str | Mapping[str, str]]:
-    original_names: dict[str, list[str]] = {}
-    normalized_groups = {}
+    include_group: str
 
-    for group_name, value in dependency_groups.items():
-        normed_group_name = _normalize_name(group_name)
-        original_names.setdefault(normed_group_name, []).append(group_name)
-        normalized_groups[normed_group_name] = value
 
-    errors = []
-    for normed_name, names in original_names.items():
-        if len(names) > 1:
-            errors.append(f"{normed_name} ({', '.join(names)})")
-    if errors:
-        raise ValueError(f"Duplicate dependency group names: {', '.join(errors)}")
+@dataclasses.dataclass(frozen=True)
+class BatchResolution:
+    """
+    The result of resolving several dependency groups at once.
+    """
 
-    return normalized_groups
+    #: the resolved requirements of each requested group, by normalized group name
+    groups: dict[str, tuple[Requirement, ...]]
+    #: the requirements of all of the requested groups, in the order requested
+    requirements: tuple[Requirement, ...]
 
 
-@dataclasses.dataclass
-class DependencyGroupInclude:
-    include_group: str
+@dataclasses.dataclass(frozen=True)
+class RequirementSource:
+    """
+    A dependency group which pulls in a requirement, and how it does so.
+    """
+
+    #: the normalized name of the group
+    group: str
+    #: the requirement, as written in the group which lists it
+    requirement: Requirement
+    #: the include path from ``group`` to the group which lists the requirement,
+    #: starting with ``group`` itself. A path of length one means that the group
+    #: lists the requirement directly.
+    path: tuple[str, ...]
 
 
 class CyclicDependencyError(ValueError):
@@ -62,34 +80,87 @@ class DependencyGroupResolver:
     A resolver for Dependency Group data.
 
     This class handles caching, name normalization, cycle detection, and other
-    parsing requirements. There are only two public methods for exploring the data:
-    ``lookup()`` and ``resolve()``.
+    parsing requirements. There are two public methods for exploring the data:
+    ``lookup()`` and ``resolve()``. Several groups can be resolved together with
+    ``resolve_many()``, and whole tables can be processed eagerly with
+    ``compile()`` or ``resolve_all()``.
+
+    A resolver may be shared between threads. Each group is parsed once, even when
+    several threads need it at the same time, and concurrent calls which resolve
+    the same group return the same result. ``update()`` must not be called while
+    other threads are using the resolver.
 
     :param dependency_groups: A mapping, as provided via pyproject
         ``[dependency-groups]``.
+    :param requirement_cache: The cache used to parse requirement strings. Defaults
+        to a cache shared by all resolvers, so the same ``Requirement`` objects may
+        be returned by several resolvers, and must not be modified. Pass ``None`` to
+        parse every requirement independently.
+    :param compact: If true, use less memory to hold parsed and resolved groups, at
+        some cost in speed. Each distinct requirement is stored once, in a table
+        shared by all groups, and groups are stored as arrays of positions in that
+        table. Resolutions are rebuilt from the table when they are read, and
+        deduplicated or filtered resolutions are not cached. This does not save
+        memory on flat tables in which every requirement is distinct.
+    :param collect_stats: If true, count and time the work done by the resolver,
+        for reporting via ``stats()``.
     """
 
     def __init__(
         self,
         dependency_groups: Mapping[str, str | Mapping[str, str]],
+        *,
+        requirement_cache: RequirementCache | None = DEFAULT_REQUIREMENT_CACHE,
+        compact: bool = False,
+        collect_stats: bool = False,
     ) -> None:
         if not isinstance(dependency_groups, Mapping):
             raise TypeError("Dependency Groups table is not a mapping")
-        self.dependency_groups = _normalize_group_names(dependency_groups)
+        self._stats = StatsCollector() if collect_stats else None
+        self.dependency_groups = self._normalize_table(dependency_groups)
+        # the spellings of group names used in the table, mapped to normalized names
+        self._aliases = _group_name_aliases(dependency_groups)
+        self._requirement_cache = requirement_cache
         # a map of group names to parsed data
-        self._parsed_groups: dict[
+        self._parsed_groups: MutableMapping[
             str, tuple[Requirement | DependencyGroupInclude, ...]
         ] = {}
-        # a map of group names to their ancestors, used for cycle detection
-        self._include_graph_ancestors: dict[str, tuple[str, ...]] = {}
         # a cache of completed resolutions to Requirement lists
-        self._resolve_cache: dict[str, tuple[Requirement, ...]] = {}
+        self._resolve_cache: MutableMapping[str, tuple[Requirement, ...]] = {}
+        # in compact mode, the storage behind both of the above
+        self._compact_groups: CompactGroups | None = None
+        if compact:
+            self._compact_groups = CompactGroups()
+            self._parsed_groups = CompactParsedGroups(self._compact_groups)
+            self._resolve_cache = CompactResolutions(self._compact_groups)
+        # a cache of deduplicated resolutions, keyed by group name and whether or not
+        # requirements were merged
+        self._dedupe_cache: dict[tuple[str, bool], tuple[Requirement, ...]] = {}
+        # a cache of resolutions filtered by marker environment, keyed by group name,
+        # whether or not requirements were deduplicated or merged, and environment
+        self._filter_cache: dict[
+            tuple[str, bool, bool, EnvironmentKey], tuple[Requirement, ...]
+        ] = {}
+        self._marker_evaluator = MarkerEvaluator()
+        # an index from normalized project names to the groups which pull them in,
+        # built on first use by ``why()``
+        self._project_index: dict[str, tuple[RequirementSource, ...]] | None = None
+        # guards the creation of per-group parse locks, which are held by the thread
+        # parsing a group
+        self._lock = threading.Lock()
+        self._parse_locks: dict[str, threading.Lock] = {}
+        # guards building the project index
+        self._index_lock = threading.Lock()
 
     def lookup(self, group: str) -> tuple[Requirement | DependencyGroupInclude, ...]:
         """
         Lookup a group name, returning the parsed dependency data for that group.
         This will not resolve includes.
 
+        The returned ``Requirement`` objects come from the resolver's requirement
+        cache, which by default is shared by all resolvers, so they must not be
+        modified. Copy a requirement before changing it.
+
         :param group: the name of the group to lookup
 
         :raises ValueError: if the data does not appear to be valid dependency group
@@ -98,16 +169,127 @@ class DependencyGroupResolver:
         :raises LookupError: if group name is absent
         :raises packaging.requirements.InvalidRequirement: if a specifier is not valid
         """
-        if not isinstance(group, str):
-            raise TypeError("Dependency group name is not a str")
-        group = _normalize_name(group)
+        group = self._group_name(group)
         return self._parse_group(group)
 
-    def resolve(self, group: str) -> tuple[Requirement, ...]:
+    def resolve(
+        self,
+        group: str,
+        *,
+        dedupe: bool = False,
+        merge: bool = False,
+        environment: Mapping[str, str] | None = None,
+    ) -> tuple[Requirement, ...]:
         """
         Resolve a dependency group to a list of requirements.
 
+        As with ``lookup()``, the returned ``Requirement`` objects may be shared
+        with other resolvers, and must not be modified.
+
+        :param group: the name of the group to resolve
+        :param dedupe: if true, remove duplicate requirements from the result,
+            keeping the first occurrence of each
+        :param merge: if true, remove duplicates and also merge requirements on the
+            same project into a single requirement, combining their extras and
+            specifiers. Only requirements with the same marker and URL are merged.
+        :param environment: if given, only requirements whose markers match this
+            marker environment are included. The environment is applied over that
+            of the current interpreter, so an empty mapping selects requirements for
+            the current interpreter.
+
+        :raises TypeError: if the inputs appear to be the wrong types
+        :raises ValueError: if the data does not appear to be valid dependency group
+            data
+        :raises LookupError: if group name is absent
+        :raises packaging.requirements.InvalidRequirement: if a specifier is not valid
+        """
+        group = self._group_name(group)
+        if self._stats is None:
+            return self._resolve_and_cache(group, dedupe, merge, environment)
+        start = time.perf_counter()
+        try:
+            return self._resolve_and_cache(group, dedupe, merge, environment)
+        finally:
+            self._stats.resolve_time += time.perf_counter() - start
+
+    def _resolve_and_cache(
+        self,
+        group: str,
+        dedupe: bool,
+        merge: bool,
+        environment: Mapping[str, str] | None,
+    ) -> tuple[Requirement, ...]:
+        resolved = self._resolve(group, group)
+        # in compact mode, derived results are computed again on each call, rather
+        # than being held as tuples
+        keep = self._compact_groups is None
+        if dedupe or merge:
+            key = (group, merge)
+            deduped = self._dedupe_cache.get(key)
+            if deduped is None:
+                deduped = _dedupe_requirements(resolved, merge=merge)
+                if keep:
+                    deduped = self._dedupe_cache.setdefault(key, deduped)
+            resolved = deduped
+        if environment is None:
+            return resolved
+
+        filter_key = (group, dedupe or merge, merge, environment_key(environment))
+        filtered = self._filter_cache.get(filter_key)
+        if filtered is None:
+            filtered = tuple(self._marker_evaluator.filter(resolved, filter_key[3]))
+            if keep:
+                filtered = self._filter_cache.setdefault(filter_key, filtered)
+        return filtered
+
+    def iter_resolve(
+        self, group: str, *, environment: Mapping[str, str] | None = None
+    ) -> Iterator[Requirement]:
+        """
+        Resolve a dependency group lazily, producing requirements one at a time, in
+        the order in which they are included.
+
+        Unlike ``resolve()``, the results are not stored, so very large groups can be
+        processed without holding all of their requirements in memory. Groups which
+        have already been resolved are read from the cache.
+
+        Invalid data is only detected when it is reached, so errors may be raised
+        after some requirements have been produced.
+
+        :param group: the name of the group to resolve
+        :param environment: if given, only requirements whose markers match this
+            marker environment are included. The environment is applied over that
+            of the current interpreter, so an empty mapping selects requirements for
+            the current interpreter.
+
+        :raises TypeError: if the inputs appear to be the wrong types
+        :raises ValueError: if the data does not appear to be valid dependency group
+            data
+        :raises LookupError: if group name is absent
+        :raises packaging.requirements.InvalidRequirement: if a specifier is not valid
+        """
+        group = self._group_name(group)
+        if environment is None:
+            return self._iter_resolve(group, group)
+        return self._marker_evaluator.filter(
+            self._iter_resolve(group, group), environment_key(environment)
+        )
+
+    def iter_resolve_sources(
+        self, group: str, *, environment: Mapping[str, str] | None = None
+    ) -> Iterator[RequirementSource]:
+        """
+        Resolve a dependency group lazily, like ``iter_resolve()``, but produce the
+        include path which leads to each requirement along with it.
+
+        Cached resolutions cannot provide include paths, so the include graph is
+        always walked in full.
+
         :param group: the name of the group to resolve
+        :param environment: if given, only requirements whose markers match this
+            marker environment are included. The environment is applied over that
+            of the current interpreter, so an empty mapping selects requirements for
+            the current interpreter.
 
         :raises TypeError: if the inputs appear to be the wrong types
         :raises ValueError: if the data does not appear to be valid dependency group
@@ -115,18 +297,612 @@ class DependencyGroupResolver:
         :raises LookupError: if group name is absent
         :raises packaging.requirements.InvalidRequirement: if a specifier is not valid
         """
+        group = self._group_name(group)
+        sources = self._iter_resolve_sources(group)
+        if environment is None:
+            return sources
+        key = environment_key(environment)
+        return (
+            source
+            for source in sources
+            if self._marker_evaluator.matches(source.requirement, key)
+        )
+
+    def resolve_many(
+        self,
+        *groups: str,
+        dedupe: bool = False,
+        merge: bool = False,
+        environment: Mapping[str, str] | None = None,
+    ) -> BatchResolution:
+        """
+        Resolve several dependency groups at once, producing both the requirements
+        of each group and their union.
+
+        Groups which include the same groups share all of the work of resolving
+        them, and each requested group is only resolved once.
+
+        :param groups: the names of the groups to resolve
+        :param dedupe: if true, remove duplicate requirements from the results,
+            including duplicates between groups
+        :param merge: if true, remove duplicates and also merge requirements on the
+            same project into a single requirement, combining their extras and
+            specifiers
+        :param environment: if given, only requirements whose markers match this
+            marker environment are included. The environment is applied over that
+            of the current interpreter, so an empty mapping selects requirements for
+            the current interpreter.
+
+        :raises TypeError: if the inputs appear to be the wrong types
+        :raises ValueError: if the data does not appear to be valid dependency group
+            data
+        :raises LookupError: if group name is absent
+        :raises packaging.requirements.InvalidRequirement: if a specifier is not valid
+        """
+        by_group: dict[str, tuple[Requirement, ...]] = {}
+        requested: list[str] = []
+        for group in groups:
+            group = self._group_name(group)
+            if group not in by_group:
+                by_group[group] = self.resolve(
+                    group, dedupe=dedupe, merge=merge, environment=environment
+                )
+            requested.append(group)
+
+        union = tuple(r for group in requested for r in by_group[group])
+        if (dedupe or merge) and len(requested) > 1:
+            union = _dedupe_requirements(union, merge=merge)
+        return BatchResolution(groups=by_group, requirements=union)
+
+    def resolve_matrix(
+        self,
+        *groups: str,
+        environments: Mapping[str, Mapping[str, str]],
+        dedupe: bool = False,
+        merge: bool = False,
+    ) -> dict[str, tuple[Requirement, ...]]:
+        """
+        Resolve dependency groups for several marker environments at once.
+
+        The groups are resolved once, and their requirements are then partitioned
+        between the environments in a single pass. Each distinct marker is evaluated
+        once per environment.
+
+        :param groups: the names of the groups to resolve. As with
+            ``resolve_many()``, the requirements of all of the groups are combined.
+        :param environments: the marker environments to resolve for, keyed by name.
+            Each is applied over the environment of the current interpreter.
+        :param dedupe: if true, remove duplicate requirements from the results
+        :param merge: if true, remove duplicates and also merge requirements on the
+            same project into a single requirement, combining their extras and
+            specifiers
+
+        :returns: the requirements which apply to each environment, keyed by the
+            name of the environment
+
+        :raises TypeError: if the inputs appear to be the wrong types
+        :raises ValueError: if the data does not appear to be valid dependency group
+            data
+        :raises LookupError: if group name is absent
+        :raises packaging.requirements.InvalidRequirement: if a specifier is not valid
+        """
+        if not isinstance(environments, Mapping):
+            raise TypeError("Marker environments are not a mapping")
+        resolution = self.resolve_many(*groups, dedupe=dedupe, merge=merge)
+        partitions = self._marker_evaluator.partition(
+            resolution.requirements,
+            {
+                name: environment_key(environment)
+                for name, environment in environments.items()
+            },
+        )
+        return {name: tuple(requirements) for name, requirements in partitions.items()}
+
+    def compile(self) -> list[Exception]:
+        """
+        Parse and resolve every group in the table, in a single pass over the include
+        graph.
+
+        Cycles are found in one traversal (using Tarjan's strongly connected
+        components algorithm), and groups are resolved bottom-up, so that each group
+        is parsed and resolved exactly once.
+
+        Rather than stopping at the first problem, all errors are collected and
+        returned. Each cycle in the include graph is reported once, as a
+        ``CyclicDependencyError``. Groups which are invalid or which include an
+        invalid group are left unresolved.
+
+        :returns: a list of the errors encountered, empty if all groups are valid
+        """
+        if self._stats is None:
+            return self._compile()
+        start = time.perf_counter()
+        try:
+            return self._compile()
+        finally:
+            self._stats.resolve_time += time.perf_counter() - start
+
+    def stats(self) -> ResolverStats:
+        """
+        Get the statistics collected by this resolver.
+
+        :raises RuntimeError: if the resolver was not created with
+            ``collect_stats=True``
+        """
+        if self._stats is None:
+            raise RuntimeError(
+                "Statistics are only collected by resolvers created with "
+                "collect_stats=True"
+            )
+        return self._stats.snapshot()
+
+    def _compile(self) -> list[Exception]:
+        errors: list[Exception] = []
+        # groups which cannot be resolved, either due to their own errors or because
+        # they include such a group
+        failed: set[str] = set()
+
+        # the include edges of every group which still needs to be resolved
+        edges: dict[str, list[str]] = {}
+        for group in self.dependency_groups:
+            if group in self._resolve_cache:
+                if self._stats is not None:
+                    self._stats.resolve_hits += 1
+                continue
+            try:
+                parsed = self._parse_group(group)
+            except (LookupError, ValueError, TypeError) as e:
+                errors.append(e)
+                failed.add(group)
+                continue
+            edges[group] = [
+                item.include_group
+                for item in parsed
+                if isinstance(item, DependencyGroupInclude)
+            ]
+            if self._stats is not None:
+                self._stats.edges_walked += len(edges[group])
+
+        for group_edges in edges.values():
+            for include_group in group_edges:
+                if (
+                    include_group not in self.dependency_groups
+                    and include_group not in failed
+                ):
+                    errors.append(
+                        LookupError(f"Dependency group '{include_group}' not found")
+                    )
+                    failed.add(include_group)
+
+        # Tarjan's algorithm, with an explicit stack in place of recursion
+        # it emits each strongly connected component after all of the components
+        # which it includes, which is exactly the order needed for resolution
+        index: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        component_stack: list[str] = []
+        on_component_stack: set[str] = set()
+        for root in edges:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            component_stack.append(root)
+            on_component_stack.add(root)
+            work: list[tuple[str, Iterator[str]]] = [(root, iter(edges[root]))]
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    # groups which are cached or failed need no further traversal
+                    if child not in edges:
+                        continue
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        component_stack.append(child)
+                        on_component_stack.add(child)
+                        work.append((child, iter(edges[child])))
+                        if self._stats is not None:
+                            self._stats.include_depth(len(work) - 1)
+                        break
+                    if child in on_component_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] != index[node]:
+                        continue
+
+                    component = []
+                    while True:
+                        member = component_stack.pop()
+                        on_component_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+
+                    if len(component) > 1 or node in edges[node]:
+                        # report the cycle as seen when resolving the first group
+                        # of the component which was reached
+                        includer = next(
+                            member for member in component if node in edges[member]
+                        )
+                        errors.append(CyclicDependencyError(node, includer, node))
+                        failed.update(component)
+                    else:
+                        self._compile_group(node, failed)
+
+        return errors
+
+    def why(self, project: str) -> tuple[RequirementSource, ...]:
+        """
+        Find the groups which pull in a project, directly or through includes.
+
+        An index of every project in the table is built on the first call, after
+        which each query is a single lookup.
+
+        Groups which cannot be resolved are left out of the index, so that one
+        invalid group does not prevent queries about the others. Use ``compile()``
+        to find the errors in those groups.
+
+        :param project: the name of the project. Names are compared after
+            normalization, so ``Typing_Extensions`` matches ``typing-extensions``.
+
+        :returns: one source for each group and requirement which pulls in the
+            project, ordered by group as in the table. Where a group reaches the same
+            requirement along several include paths, the shortest is reported.
+
+        :raises TypeError: if the project name is not a str
+        """
+        if not isinstance(project, str):
+            raise TypeError("Project name is not a str")
+        project_index = self._project_index
+        if project_index is None:
+            with self._index_lock:
+                if self._project_index is None:
+                    self._project_index = self._build_project_index()
+                project_index = self._project_index
+        return project_index.get(canonicalize_name(project), ())
+
+    def update(
+        self, dependency_groups: Mapping[str, str | Mapping[str, str]]
+    ) -> set[str]:
+        """
+        Replace the table of dependency groups, keeping the cached work for groups
+        which are not affected by the change.
+
+        Groups whose data changed are parsed again when they are next used. Their
+        cached resolutions are discarded, along with those of every group which
+        includes them, directly or transitively. All other groups keep their parsed
+        and resolved data.
+
+        This method is not safe to call while other threads are using the resolver.
+
+        Groups are compared by value, so the new table should be a new object, e.g.
+        freshly loaded from ``pyproject.toml``, rather than the old table modified in
+        place.
+
+        :param dependency_groups: The new mapping, as provided via pyproject
+            ``[dependency-groups]``.
+
+        :returns: the normalized names of the groups whose cached data was discarded
+
+        :raises TypeError: if the table is not a mapping
+        :raises ValueError: if the table contains duplicate group names
+        """
+        if not isinstance(dependency_groups, Mapping):
+            raise TypeError("Dependency Groups table is not a mapping")
+        new_groups = self._normalize_table(dependency_groups)
+        old_groups = self.dependency_groups
+
+        changed = {
+            group
+            for group in old_groups.keys() | new_groups.keys()
+            if group not in old_groups
+            or group not in new_groups
+            or old_groups[group] != new_groups[group]
+        }
+
+        # walk the reverse include graph to find every group whose resolution
+        # depends on a changed group
+        includers = self._reverse_includes()
+        invalidated = set(changed)
+        pending = list(changed)
+        while pending:
+            for includer in includers.get(pending.pop(), ()):
+                if includer not in invalidated:
+                    invalidated.add(includer)
+                    pending.append(includer)
+
+        self.dependency_groups = new_groups
+        self._aliases = _group_name_aliases(dependency_groups)
+        for group in changed:
+            self._parsed_groups.pop(group, None)
+        for group in invalidated:
+            self._resolve_cache.pop(group, None)
+        for dedupe_key in [k for k in self._dedupe_cache if k[0] in invalidated]:
+            del self._dedupe_cache[dedupe_key]
+        for filter_key in [k for k in self._filter_cache if k[0] in invalidated]:
+            del self._filter_cache[filter_key]
+        if invalidated:
+            self._project_index = None
+        return invalidated
+
+    def resolve_all(self) -> dict[str, tuple[Requirement, ...]]:
+        """
+        Resolve every dependency group to a list of requirements.
+
+        :returns: a dict mapping each normalized group name to its requirements
+
+        :raises TypeError: if the data appears to be the wrong type
+        :raises ValueError: if the data does not appear to be valid dependency group
+            data
+        :raises LookupError: if an included group is absent
+        :raises packaging.requirements.InvalidRequirement: if a specifier is not valid
+        """
+        errors = self.compile()
+        if errors:
+            raise errors[0]
+        return {group: self._resolve_cache[group] for group in self.dependency_groups}
+
+    def _compile_group(self, group: str, failed: set[str]) -> None:
+        """
+        Resolve a single group for ``compile()``, after all of its includes have been
+        resolved.
+
+        :param group: The name of the group to resolve.
+        :param failed: The groups which could not be resolved. If the group includes
+            any of these, it will be added to this set.
+        """
+        if self._stats is not None:
+            self._stats.resolve_misses += 1
+        resolved_group: list[Requirement] = []
+        for item in self._parsed_groups[group]:
+            if isinstance(item, Requirement):
+                resolved_group.append(item)
+            elif item.include_group in failed:
+                failed.add(group)
+                return
+            else:
+                if self._stats is not None:
+                    self._stats.resolve_hits += 1
+                resolved_group.extend(self._resolve_cache[item.include_group])
+        self._store_resolution(group, resolved_group)
+
+    def _iter_resolve(self, group: str, requested_group: str) -> Iterator[Requirement]:
+        """
+        This is a helper for ``iter_resolve()``, which walks the include graph in the
+        same way as ``_resolve()``, but yields requirements rather than collecting
+        them.
+
+        :param group: The name of the group to resolve.
+        :param requested_group: The group which was used in the original, user-facing
+            request.
+        """
+        stats = self._stats
+        if group in self._resolve_cache:
+            if stats is not None:
+                stats.resolve_hits += 1
+            yield from self._resolve_cache[group]
+            return
+        if stats is not None:
+            stats.resolve_misses += 1
+
+        path: list[str] = [group]
+        on_path: set[str] = {group}
+        stack: list[Iterator[Requirement | DependencyGroupInclude]] = [
+            iter(self._parse_group(group))
+        ]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, Requirement):
+                    yield item
+                elif isinstance(item, DependencyGroupInclude):
+                    include_group = item.include_group
+                    if include_group in on_path:
+                        raise CyclicDependencyError(
+                            requested_group, path[-1], include_group
+                        )
+                    if stats is not None:
+                        stats.edges_walked += 1
+                    if include_group in self._resolve_cache:
+                        if stats is not None:
+                            stats.resolve_hits += 1
+                        yield from self._resolve_cache[include_group]
+                        continue
+                    stack.append(iter(self._parse_group(include_group)))
+                    path.append(include_group)
+                    on_path.add(include_group)
+                    if stats is not None:
+                        stats.resolve_misses += 1
+                        stats.include_depth(len(path) - 1)
+                    break
+                else:  # unreachable
+                    raise NotImplementedError(
+                        f"Invalid dependency group item after parse: {item}"
+                    )
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+
+    def _group_name(self, group: object) -> str:
+        """
+        Check and normalize a group name given by a caller.
+        """
         if not isinstance(group, str):
             raise TypeError("Dependency group name is not a str")
-        group = _normalize_name(group)
-        return self._resolve(group, group)
+        normalized = self._aliases.get(group)
+        if normalized is None:
+            normalized = _normalize_name(group)
+        return normalized
+
+    def _normalize_table(
+        self, dependency_groups: Mapping[str, str | Mapping[str, str]]
+    ) -> Mapping[str, str | Mapping[str, str]]:
+        if self._stats is None:
+            return _normalize_group_names(dependency_groups)
+        start = time.perf_counter()
+        try:
+            return _normalize_group_names(dependency_groups)
+        finally:
+            self._stats.normalize_time += time.perf_counter() - start
+
+    def _reverse_includes(self) -> dict[str, set[str]]:
+        """
+        Build an index from each group to the parsed groups which include it.
+
+        Only parsed groups can have been resolved, so this covers every include which
+        contributed to a cached resolution.
+        """
+        includers: dict[str, set[str]] = {}
+        for group, items in list(self._parsed_groups.items()):
+            for item in items:
+                if isinstance(item, DependencyGroupInclude):
+                    includers.setdefault(item.include_group, set()).add(group)
+        return includers
+
+    def _build_project_index(self) -> dict[str, tuple[RequirementSource, ...]]:
+        """
+        Build the index used by ``why()``.
+
+        For each group, a breadth-first search over the reverse include graph finds
+        every group which includes it, along with the next step on a shortest path
+        back to it. Each requirement which a group lists directly is then attributed
+        to all of those groups which could be resolved.
+        """
+        # errors are left to ``compile()``, and groups which failed are not cached
+        self.compile()
+        resolved = self._resolve_cache
+
+        includers = self._reverse_includes()
+        order = {
+            group: position for position, group in enumerate(self.dependency_groups)
+        }
+        sources: dict[str, list[RequirementSource]] = {}
+        for listing_group, items in list(self._parsed_groups.items()):
+            requirements = [item for item in items if isinstance(item, Requirement)]
+            if not requirements:
+                continue
+
+            # the next group on the path from each includer to the listing group
+            next_step: dict[str, str] = {listing_group: listing_group}
+            queue = [listing_group]
+            for group in queue:
+                for includer in sorted(includers.get(group, ()), key=order.__getitem__):
+                    if includer not in next_step:
+                        next_step[includer] = group
+                        queue.append(includer)
+
+            for group in queue:
+                if group not in resolved:
+                    continue
+                path = [group]
+                while path[-1] != listing_group:
+                    path.append(next_step[path[-1]])
+                for requirement in requirements:
+                    sources.setdefault(canonicalize_name(requirement.name), []).append(
+                        RequirementSource(group, requirement, tuple(path))
+                    )
+
+        return {
+            project: _unique_sources(
+                sorted(
+                    project_sources,
+                    key=lambda source: (order[source.group], len(source.path)),
+                )
+            )
+            for project, project_sources in sources.items()
+        }
+
+    def _iter_resolve_sources(self, group: str) -> Iterator[RequirementSource]:
+        """
+        This is a helper for ``iter_resolve_sources()``, which walks the include
+        graph in the same way as ``_iter_resolve()``, without using cached
+        resolutions.
+
+        :param group: The name of the group to resolve.
+        """
+        path: list[str] = [group]
+        on_path: set[str] = {group}
+        stack: list[Iterator[Requirement | DependencyGroupInclude]] = [
+            iter(self._parse_group(group))
+        ]
+        # the current path as a tuple, shared by all requirements of the same group
+        current_path: tuple[str, ...] = (group,)
+        stats = self._stats
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, Requirement):
+                    yield RequirementSource(group, item, current_path)
+                elif isinstance(item, DependencyGroupInclude):
+                    include_group = item.include_group
+                    if include_group in on_path:
+                        raise CyclicDependencyError(group, path[-1], include_group)
+                    stack.append(iter(self._parse_group(include_group)))
+                    path.append(include_group)
+                    on_path.add(include_group)
+                    current_path = tuple(path)
+                    if stats is not None:
+                        stats.edges_walked += 1
+                        stats.include_depth(len(path) - 1)
+                    break
+                else:  # unreachable
+                    raise NotImplementedError(
+                        f"Invalid dependency group item after parse: {item}"
+                    )
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+                current_path = tuple(path)
 
     def _parse_group(
         self, group: str
     ) -> tuple[Requirement | DependencyGroupInclude, ...]:
         # short circuit -- never do the work twice
-        if group in self._parsed_groups:
-            return self._parsed_groups[group]
+        parsed = self._parsed_groups.get(group)
+        if parsed is not None:
+            if self._stats is not None:
+                self._stats.parse_hits += 1
+            return parsed
 
+        # a lock per group ensures that concurrent callers parse each group once,
+        # without serializing work on different groups
+        with self._lock:
+            group_lock = self._parse_locks.get(group)
+            if group_lock is None:
+                group_lock = self._parse_locks[group] = threading.Lock()
+        with group_lock:
+            parsed = self._parsed_groups.get(group)
+            if parsed is None:
+                if self._stats is None:
+                    parsed = self._parse_group_items(group)
+                else:
+                    parsed = self._parse_group_items_with_stats(group, self._stats)
+                # in compact mode, the group was stored as it was parsed
+                if self._compact_groups is None:
+                    self._parsed_groups[group] = parsed
+            elif self._stats is not None:
+                self._stats.parse_hits += 1
+        with self._lock:
+            self._parse_locks.pop(group, None)
+        return parsed
+
+    def _parse_group_items_with_stats(
+        self, group: str, stats: StatsCollector
+    ) -> tuple[Requirement | DependencyGroupInclude, ...]:
+        stats.parse_misses += 1
+        start = time.perf_counter()
+        try:
+            parsed = self._parse_group_items(group)
+        finally:
+            stats.parse_time += time.perf_counter() - start
+        stats.requirements_parsed += sum(
+            1 for item in parsed if isinstance(item, Requirement)
+        )
+        return parsed
+
+    def _parse_group_items(
+        self, group: str
+    ) -> tuple[Requirement | DependencyGroupInclude, ...]:
         if group not in self.dependency_groups:
             raise LookupError(f"Dependency group '{group}' not found")
 
@@ -134,65 +910,192 @@ class DependencyGroupResolver:
         if not isinstance(raw_group, list):
             raise TypeError(f"Dependency group '{group}' is not a list")
 
-        elements: list[Requirement | DependencyGroupInclude] = []
-        for item in raw_group:
-            if isinstance(item, str):
-                # packaging.requirements.Requirement parsing ensures that this is a
-                # valid PEP 508 Dependency Specifier
-                # raises InvalidRequirement on failure
-                elements.append(Requirement(item))
-            elif isinstance(item, dict):
-                if tuple(item.keys()) != ("include-group",):
-                    raise ValueError(f"Invalid dependency group item: {item}")
-
-                include_group = next(iter(item.values()))
-                elements.append(DependencyGroupInclude(include_group=include_group))
-            else:
+        if self._compact_groups is not None:
+            return self._compact_groups.parse(group, raw_group, self._parse_item)
+        return tuple(self._parse_item(item) for item in raw_group)
+
+    def _parse_item(self, item: object) -> Requirement | DependencyGroupInclude:
+        if isinstance(item, str):
+            # packaging.requirements.Requirement parsing ensures that this is a
+            # valid PEP 508 Dependency Specifier
+            # raises InvalidRequirement on failure
+            return self._parse_requirement(item)
+        if isinstance(item, dict):
+            if tuple(item.keys()) != ("include-group",):
                 raise ValueError(f"Invalid dependency group item: {item}")
 
-        self._parsed_groups[group] = tuple(elements)
-        return self._parsed_groups[group]
+            include_group = next(iter(item.values()))
+            return DependencyGroupInclude(include_group=include_group)
+        raise ValueError(f"Invalid dependency group item: {item}")
+
+    def _store_resolution(
+        self, group: str, resolved_group: list[Requirement]
+    ) -> tuple[Requirement, ...]:
+        """
+        Cache the resolution of a group, once all of its includes are resolved.
+
+        If another thread resolved the same group first, its result is kept, so that
+        every caller sees the same requirements.
+        """
+        if self._compact_groups is not None:
+            # rebuilt from the stored positions, rather than by looking up each
+            # requirement
+            return self._compact_groups.resolve(group)
+        return self._resolve_cache.setdefault(group, tuple(resolved_group))
+
+    def _parse_requirement(self, item: str) -> Requirement:
+        if self._requirement_cache is None:
+            return Requirement(item)
+        return self._requirement_cache.get(item)
 
     def _resolve(self, group: str, requested_group: str) -> tuple[Requirement, ...]:
         """
         This is a helper for cached resolution to strings.
 
+        The include graph is walked with an explicit stack rather than by recursion,
+        so that arbitrarily deep chains of includes can be resolved. Each group is
+        parsed and resolved at most once, and the groups on the current include
+        path are tracked for cycle detection.
+
         :param group: The name of the group to resolve.
         :param requested_group: The group which was used in the original, user-facing
             request.
         """
-        if group in self._resolve_cache:
-            return self._resolve_cache[group]
+        stats = self._stats
+        cached = self._resolve_cache.get(group)
+        if cached is not None:
+            if stats is not None:
+                stats.resolve_hits += 1
+            return cached
+        if stats is not None:
+            stats.resolve_misses += 1
 
-        parsed = self._parse_group(group)
+        # the include path from the requested group to the group currently being
+        # resolved, along with a set of the same names for fast membership checks
+        path: list[str] = [group]
+        on_path: set[str] = {group}
+        # one frame per group on the path: an iterator over its parsed items and the
+        # requirements which have been resolved so far
+        frames: list[
+            tuple[Iterator[Requirement | DependencyGroupInclude], list[Requirement]]
+        ] = [(iter(self._parse_group(group)), [])]
 
-        resolved_group = []
-        for item in parsed:
-            if isinstance(item, Requirement):
-                resolved_group.append(item)
-            elif isinstance(item, DependencyGroupInclude):
-                if item.include_group in self._include_graph_ancestors.get(group, ()):
-                    raise CyclicDependencyError(
-                        requested_group, group, item.include_group
+        while frames:
+            items, resolved_group = frames[-1]
+            current_group = path[-1]
+            for item in items:
+                if isinstance(item, Requirement):
+                    resolved_group.append(item)
+                elif isinstance(item, DependencyGroupInclude):
+                    include_group = item.include_group
+                    if include_group in on_path:
+                        raise CyclicDependencyError(
+                            requested_group, current_group, include_group
+                        )
+                    if stats is not None:
+                        stats.edges_walked += 1
+                    if include_group in self._resolve_cache:
+                        if stats is not None:
+                            stats.resolve_hits += 1
+                        resolved_group.extend(self._resolve_cache[include_group])
+                        continue
+                    # descend into the included group, resuming this one later
+                    frames.append((iter(self._parse_group(include_group)), []))
+                    path.append(include_group)
+                    on_path.add(include_group)
+                    if stats is not None:
+                        stats.resolve_misses += 1
+                        stats.include_depth(len(path) - 1)
+                    break
+                else:  # unreachable
+                    raise NotImplementedError(
+                        f"Invalid dependency group item after parse: {item}"
                     )
-                self._include_graph_ancestors[item.include_group] = (
-                    *self._include_graph_ancestors.get(group, ()),
-                    group,
-                )
-                resolved_group.extend(
-                    self._resolve(item.include_group, requested_group)
-                )
-            else:  # unreachable
-                raise NotImplementedError(
-                    f"Invalid dependency group item after parse: {item}"
-                )
+            else:
+                # every item in the group has been consumed, so it is complete
+                frames.pop()
+                path.pop()
+                on_path.discard(current_group)
+                resolved = self._store_resolution(current_group, resolved_group)
+                if frames:
+                    frames[-1][1].extend(resolved_group)
+
+        return resolved
+
+
+def _unique_sources(
+    sources: Iterable[RequirementSource],
+) -> tuple[RequirementSource, ...]:
+    """
+    Keep only the first source for each group and requirement.
+    """
+    seen: set[tuple[str, str]] = set()
+    unique = []
+    for source in sources:
+        key = (source.group, str(source.requirement))
+        if key not in seen:
+            seen.add(key)
+            unique.append(source)
+    return tuple(unique)
+
+
+def _dedupe_requirements(
+    requirements: Iterable[Requirement], *, merge: bool
+) -> tuple[Requirement, ...]:
+    """
+    Remove duplicates from a sequence of requirements, preserving the order in which
+    each requirement first appears.
+
+    :param requirements: The requirements to deduplicate.
+    :param merge: If true, requirements on the same project (by normalized name) are
+        combined into one, provided that they have the same marker and URL.
+    """
+    if not merge:
+        unique: dict[str, Requirement] = {}
+        for requirement in requirements:
+            unique.setdefault(str(requirement), requirement)
+        return tuple(unique.values())
+
+    merged: dict[tuple[str, str | None, str | None], Requirement] = {}
+    for requirement in requirements:
+        key = (
+            canonicalize_name(requirement.name),
+            requirement.url,
+            None if requirement.marker is None else str(requirement.marker),
+        )
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = requirement
+        elif existing is not requirement:
+            merged[key] = _merge_requirements(existing, requirement)
+    return tuple(merged.values())
+
+
+def _merge_requirements(first: Requirement, second: Requirement) -> Requirement:
+    """
+    Combine two requirements on the same project, taking the union of their extras
+    and the intersection of their specifiers.
+
+    Requirements may be shared between resolvers, so neither input is modified. If
+    the second requirement adds nothing to the first, the first is returned.
+    """
+    adds_specifier = bool(second.specifier) and second.specifier != first.specifier
+    if second.extras <= first.extras and not adds_specifier:
+        return first
 
-        self._resolve_cache[group] = tuple(resolved_group)
-        return self._resolve_cache[group]
+    merged = copy.copy(first)
+    merged.extras = first.extras | second.extras
+    merged.specifier = first.specifier & second.specifier
+    return merged
 
 
 def resolve(
-    dependency_groups: Mapping[str, str | Mapping[str, str]], /, *groups: str
+    dependency_groups: Mapping[str, str | Mapping[str, str]],
+    /,
+    *groups: str,
+    dedupe: bool = False,
+    merge: bool = False,
+    environment: Mapping[str, str] | None = None,
 ) -> tuple[str, ...]:
     """
     Resolve a dependency group to a tuple of requirements, as strings.
@@ -200,6 +1103,14 @@ def resolve(
     :param dependency_groups: the parsed contents of the ``[dependency-groups]`` table
         from ``pyproject.toml``
     :param groups: the name of the group(s) to resolve
+    :param dedupe: if true, remove duplicate requirements from the result, keeping
+        the first occurrence of each
+    :param merge: if true, remove duplicates and also merge requirements on the same
+        project into a single requirement, combining their extras and specifiers
+    :param environment: if given, only requirements whose markers match this marker
+        environment are included. The environment is applied over that of the
+        current interpreter, so an empty mapping selects requirements for the
+        current interpreter.
 
     :raises TypeError: if the inputs appear to be the wrong types
     :raises ValueError: if the data does not appear to be valid dependency group data
@@ -207,4 +1118,7 @@ def resolve(
     :raises packaging.requirements.InvalidRequirement: if a specifier is not valid
     """
     resolver = DependencyGroupResolver(dependency_groups)
-    return tuple(str(r) for group in groups for r in resolver.resolve(group))
+    resolution = resolver.resolve_many(
+        *groups, dedupe=dedupe, merge=merge, environment=environment
+    )
+    return tuple(str(r) for r in resolution.requirements)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+
+class InstallResult(t.NamedTuple):
+    """
+    The outcome of installing requirements into one target interpreter.
+    """
+
+    #: the interpreter which was installed into
+    python: str
+    #: the exit status of the installer
+    returncode: int
+    #: the combined stdout and stderr of the installer, if it was captured
+    output: t.Optional[str]
+
+
+def install_command(
+    installer: str, requirements: list[str], python: str | None = None
+) -> list[str]:
+    """
+    Build the command which installs requirements with an installer.
+
+    :param installer: ``pip`` or ``uv``
+    :param requirements: the requirement strings to install
+    :param python: the interpreter to install into. Defaults to the current
+        interpreter.
+
+    :raises ValueError: if the installer does not run a command
+    """
+    python = python or sys.executable
+    if installer == "pip":
+        return [python, "-m", "pip", "install", *requirements]
+    if installer == "uv":
+        return ["uv", "pip", "install", "--python", python, *requirements]
+    raise ValueError(f"Installer {installer!r} does not run a command")
+
+
+def write_requirements_file(requirements: list[str], path: str) -> None:
+    """
+    Write requirements to a file, one per line, for use by another tool.
+
+    :param requirements: the requirement strings to write
+    :param path: the file to write, or ``-`` for stdout
+    """
+    content = "".join(f"{requirement}\n" for requirement in requirements)
+    if path == "-":
+        sys.stdout.write(content)
+    else:
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(content)
+
+
+def install(
+    installer: str,
+    requirements: list[str],
+    pythons: list[str],
+    *,
+    jobs: int = 1,
+) -> int:
+    """
+    Install requirements into several interpreters, using a bounded pool of
+    workers.
+
+    With one target, the installer writes directly to stdout and stderr. With more,
+    the output of each target is captured and printed as a block, in the order in
+    which the targets were given, so that concurrent installs are not interleaved.
+
+    :param installer: ``pip`` or ``uv``
+    :param requirements: the requirement strings to install
+    :param pythons: the interpreters to install into
+    :param jobs: the number of installs to run at once
+
+    :returns: 0 if every install succeeded, otherwise the exit status of the first
+        target which failed, in the order in which they were given
+    """
+    if len(pythons) == 1:
+        results = [_install_one(installer, requirements, pythons[0], capture=False)]
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(pythons)))) as pool:
+            futures = [
+                pool.submit(_install_one, installer, requirements, python, True)
+                for python in pythons
+            ]
+            results = []
+            for future in futures:
+                result = future.result()
+                sys.stdout.write(f"==> {result.python}\n{result.output}")
+                sys.stdout.flush()
+                results.append(result)
+
+    failures = [result for result in results if result.returncode != 0]
+    for result in failures:
+        print(
+            f"{installer} failed for {result.python} "
+            f"(exit status {result.returncode})",
+            file=sys.stderr,
+        )
+    return failures[0].returncode if failures else 0
+
+
+def _install_one(
+    installer: str, requirements: list[str], python: str, capture: bool
+) -> InstallResult:
+    command = install_command(installer, requirements, python)
+    try:
+        if not capture:
+            return InstallResult(python, subprocess.run(command).returncode, None)
+        proc = subprocess.run(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+    except OSError as e:
+        message = f"could not run {command[0]}: {e}\n"
+        if not capture:
+            sys.stderr.write(message)
+        return InstallResult(python, 1, message if capture else None)
+    return InstallResult(python, proc.returncode, proc.stdout)
@@ -1,11 +1,91 @@
 from __future__ import annotations
 
 import argparse
+import glob
+import os
 import sys
 
-from ._implementation import DependencyGroupResolver
+from ._cli_stats import CLIStats, cache_status
+from ._daemon import DaemonClient
+from ._disk_cache import ResolutionCache, resolve_table
+from ._loader import parse_dependency_groups, read_pyproject
 from ._toml_compat import tomllib
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing as t
+
+
+def _lint_file(
+    path: str, use_cache: bool = True, collect_stats: bool = False
+) -> tuple[list[str], dict[str, t.Any] | None]:
+    """
+    Lint a single pyproject.toml file.
+
+    :returns: a list of error messages, and if ``collect_stats`` is set, the
+        statistics for the file. The statistics are a plain dict, so that they can be
+        returned from a worker process.
+    """
+    stats: dict[str, t.Any] | None = None
+    if collect_stats:
+        stats = {"cache": None, "resolver": None}
+    else:
+        daemon = DaemonClient.from_environment(disable=not use_cache)
+        errors = daemon.lint(path) if daemon is not None else None
+        if errors is not None:
+            return errors, stats
+    try:
+        pyproject_content = read_pyproject(path)
+    except OSError as e:
+        return [f"{type(e).__name__}: {e}"], stats
+
+    cache = ResolutionCache.from_environment(disable=not use_cache)
+    cached = cache.load(pyproject_content) if cache is not None else None
+    if cached is not None and not cached.complete:
+        # only some groups have been resolved, and linting needs all of them
+        cached = None
+    if stats is not None:
+        stats["cache"] = cache_status(cache, cached)
+    if cached is None:
+        try:
+            dependency_groups_raw = parse_dependency_groups(pyproject_content)
+        except ValueError as e:
+            # invalid TOML or invalid UTF-8
+            return [f"{type(e).__name__}: {e}"], stats
+        cached, resolver = resolve_table(
+            dependency_groups_raw, collect_stats=collect_stats
+        )
+        if stats is not None and resolver is not None:
+            stats["resolver"] = resolver.stats()._asdict()
+        if cache is not None:
+            cache.store(pyproject_content, cached)
+    return cached.errors, stats
+
+
+def _discover_files(paths: list[str], recursive: bool) -> list[str]:
+    """
+    Expand paths, directories, and glob patterns into a list of pyproject.toml files.
+    """
+    found: dict[str, None] = {}
+    for path in paths:
+        if glob.has_magic(path):
+            expanded = sorted(glob.glob(path, recursive=True))
+        else:
+            expanded = [path]
+
+        for candidate in expanded:
+            if not os.path.isdir(candidate):
+                found[candidate] = None
+            elif not recursive:
+                found[os.path.join(candidate, "pyproject.toml")] = None
+            else:
+                for dirpath, dirnames, filenames in os.walk(candidate):
+                    # skip hidden directories, e.g. `.git`, `.tox`, and `.venv`
+                    dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                    if "pyproject.toml" in filenames:
+                        found[os.path.join(dirpath, "pyproject.toml")] = None
+    return list(found)
+
 
 def main(*, argv: list[str] | None = None) -> None:
     if tomllib is None:
@@ -21,37 +101,121 @@ def main(*, argv: list[str] | None = None) -> None:
             "This will eagerly load and check all of your Dependency Groups."
         )
     )
+    parser.add_argument(
+        "PATH",
+        nargs="*",
+        help=(
+            "pyproject.toml files, directories containing them, or glob patterns. "
+            "May be combined with --pyproject-file."
+        ),
+    )
     parser.add_argument(
         "-f",
         "--pyproject-file",
-        default="pyproject.toml",
         help="The pyproject.toml file. Defaults to trying in the current directory.",
     )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="Search directories recursively for pyproject.toml files.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "The number of files to lint in parallel. "
+            "Use 0 to use one process per CPU. Defaults to 1."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            "Do not read or write the on-disk cache of resolved groups, or use a "
+            "running daemon."
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help=(
+            "Print statistics about caching and resolution to stderr, as JSON, "
+            "when finished. Statistics are combined across all files."
+        ),
+    )
     args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+    stats = CLIStats() if args.stats else None
+    try:
+        _lint(args, stats)
+    finally:
+        if stats is not None:
+            stats.write()
 
-    with open(args.pyproject_file, "rb") as fp:
-        pyproject = tomllib.load(fp)
-    dependency_groups_raw = pyproject.get("dependency-groups", {})
 
-    errors: list[str] = []
-    try:
-        resolver = DependencyGroupResolver(dependency_groups_raw)
-    except (ValueError, TypeError) as e:
-        errors.append(f"{type(e).__name__}: {e}")
+def _lint(args: argparse.Namespace, stats: CLIStats | None) -> None:
+
+    paths = list(args.PATH)
+    if args.pyproject_file is not None:
+        paths.insert(0, args.pyproject_file)
+    if not paths:
+        paths = ["pyproject.toml"]
+    files = _discover_files(paths, args.recursive)
+    if not files:
+        print("no pyproject.toml files found", file=sys.stderr)
+        raise SystemExit(3)
+
+    jobs = args.jobs or os.cpu_count() or 1
+    use_cache = [not args.no_cache] * len(files)
+    collect_stats = [stats is not None] * len(files)
+    if jobs > 1 and len(files) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+            results = list(
+                executor.map(
+                    _lint_file,
+                    files,
+                    use_cache,
+                    collect_stats,
+                    chunksize=max(1, len(files) // (jobs * 4)),
+                )
+            )
     else:
-        for groupname in resolver.dependency_groups:
-            try:
-                resolver.resolve(groupname)
-            except (LookupError, ValueError, TypeError) as e:
-                errors.append(f"{type(e).__name__}: {e}")
+        results = list(map(_lint_file, files, use_cache, collect_stats))
+
+    if stats is not None:
+        for _, file_stats in results:
+            if file_stats is not None:
+                if file_stats["cache"] is not None:
+                    stats.add_cache_result(file_stats["cache"])
+                stats.add_resolver_stats(file_stats["resolver"])
+
+    # a single file is reported without a filename, for compatibility
+    if len(files) == 1:
+        errors = results[0][0]
+        if errors:
+            print("errors encountered while examining dependency groups:")
+            for msg in errors:
+                print(f"  {msg}")
+            sys.exit(1)
+        else:
+            print("ok")
+            sys.exit(0)
 
-    if errors:
+    failures = [(path, errors) for path, (errors, _) in zip(files, results) if errors]
+    if failures:
         print("errors encountered while examining dependency groups:")
-        for msg in errors:
-            print(f"  {msg}")
+        for path, errors in failures:
+            print(f"  {path}:")
+            for msg in errors:
+                print(f"    {msg}")
+        print(f"{len(failures)} of {len(files)} files had errors")
         sys.exit(1)
     else:
-        print("ok")
+        print(f"ok ({len(files)} files)")
         sys.exit(0)
 
 
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import mmap
+import re
+import sys
+
+from ._toml_compat import tomllib
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing as t
+
+
+def read_pyproject(path: str) -> bytes:
+    with open(path, "rb") as fp:
+        return fp.read()
+
+
+def parse_dependency_groups(content: bytes) -> t.Any:
+    """
+    Parse the ``[dependency-groups]`` table from the contents of a ``pyproject.toml``
+    file, returning an empty table if there is none.
+    """
+    pyproject = tomllib.loads(content.decode("utf-8"))
+    return pyproject.get("dependency-groups", {})
+
+
+# a `[dependency-groups]` table header, alone on its line
+_TABLE_HEADER = re.compile(
+    rb"^[ \t]*\[[ \t]*dependency-groups[ \t]*\][ \t]*(?:#[^\n]*)?\r?$", re.MULTILINE
+)
+# the start of any line which may begin a table header
+_ANY_HEADER = re.compile(rb"^[ \t]*\[", re.MULTILINE)
+_TABLE_NAME = re.compile(rb"dependency-groups")
+# the start or end of a multi-line string, which may contain lines like headers
+_MULTILINE_STRING = re.compile(rb"\"\"\"|'''")
+
+
+def scan_dependency_groups(path: str) -> t.Any:
+    """
+    Read the ``[dependency-groups]`` table of a ``pyproject.toml`` file, parsing only
+    that table when possible.
+
+    The file is memory-mapped and searched for the header of the table, and only the
+    region up to the next table header is parsed. If the layout of the file is
+    ambiguous, e.g. because the table is written with dotted keys or inline,
+    ``dependency-groups`` appears anywhere else in the file, or a multi-line string
+    comes before the end of the table, or if the region cannot be parsed on its own,
+    the whole file is parsed instead.
+
+    When only the table is parsed, errors in the rest of the file are not detected.
+    """
+    region = None
+    try:
+        with open(path, "rb") as fp, mmap.mmap(
+            fp.fileno(), 0, access=mmap.ACCESS_READ
+        ) as buffer:
+            region = _dependency_groups_region(buffer)
+    except ValueError:
+        # empty files cannot be mapped
+        return {}
+    except OSError:
+        # some files, e.g. on special filesystems, cannot be mapped either
+        pass
+
+    if region is not None:
+        try:
+            return tomllib.loads(region.decode("utf-8"))["dependency-groups"]
+        except (ValueError, KeyError):
+            pass
+    return parse_dependency_groups(read_pyproject(path))
+
+
+def _dependency_groups_region(buffer: mmap.mmap) -> bytes | None:
+    if len(_TABLE_NAME.findall(buffer)) != 1:
+        return None
+    header = _TABLE_HEADER.search(buffer)
+    if header is None:
+        return None
+    end = _ANY_HEADER.search(buffer, header.end())
+    stop = end.start() if end is not None else len(buffer)
+    # the header, or the line which ends the table, may be inside a string
+    if _MULTILINE_STRING.search(buffer, 0, stop) is not None:
+        return None
+    return buffer[header.start() : stop]
+
+
+def marker_environment_from_args(
+    filter_markers: bool, marker_environment_file: str | None
+) -> dict[str, str] | None:
+    """
+    Get the marker environment requested via ``--filter-markers`` or
+    ``--marker-environment``, exiting with a usage error if the file is not valid.
+
+    :returns: the marker environment, or None if no filtering was requested
+    """
+    if marker_environment_file is None:
+        return {} if filter_markers else None
+
+    environment: dict[str, str] = _load_json(
+        marker_environment_file, "marker environment"
+    )
+    if not _is_environment(environment):
+        print(
+            "Usage error: marker environment must be a JSON object of strings",
+            file=sys.stderr,
+        )
+        raise SystemExit(2)
+    return environment
+
+
+def marker_matrix_from_args(matrix_file: str) -> dict[str, dict[str, str]]:
+    """
+    Load the named marker environments given via ``--matrix``, exiting with a usage
+    error if the file is not valid.
+    """
+    matrix: dict[str, dict[str, str]] = _load_json(matrix_file, "environment matrix")
+    if not isinstance(matrix, dict) or not all(
+        _is_environment(environment) for environment in matrix.values()
+    ):
+        print(
+            "Usage error: environment matrix must be a JSON object mapping names "
+            "to marker environments",
+            file=sys.stderr,
+        )
+        raise SystemExit(2)
+    return matrix
+
+
+def _load_json(path: str, description: str) -> t.Any:
+    try:
+        with open(path, encoding="utf-8") as fp:
+            return json.load(fp)
+    except (OSError, ValueError) as e:
+        print(f"Usage error: could not read {description}: {e}", file=sys.stderr)
+        raise SystemExit(2)
+
+
+def _is_environment(value: t.Any) -> bool:
+    return isinstance(value, dict) and all(
+        isinstance(item, str) for item in value.values()
+    )
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import typing as t
+from collections.abc import Iterable, Iterator, Mapping
+
+from packaging.markers import Marker
+from packaging.requirements import Requirement
+
+# a hashable form of a marker environment
+EnvironmentKey = t.Tuple[t.Tuple[str, str], ...]
+
+
+def environment_key(environment: Mapping[str, str]) -> EnvironmentKey:
+    return tuple(sorted(environment.items()))
+
+
+class MarkerEvaluator:
+    """
+    Evaluates requirement markers against target environments.
+
+    Results are memoized per unique marker string and environment, so requirements
+    which share a marker (even if they were parsed separately) only evaluate it once
+    for each environment.
+
+    As in ``packaging``, an environment is evaluated as an overlay on the
+    environment of the current interpreter. An empty environment therefore selects
+    requirements for the current interpreter.
+    """
+
+    def __init__(self) -> None:
+        # the string form of each marker, keyed by object identity
+        # markers are stored alongside their strings to keep them alive, so that their
+        # ids cannot be reused
+        self._marker_strings: dict[int, tuple[Marker, str]] = {}
+        # the first parsed marker seen for each marker string
+        self._markers: dict[str, Marker] = {}
+        self._results: dict[tuple[str, EnvironmentKey], bool] = {}
+
+    def matches(self, requirement: Requirement, environment: EnvironmentKey) -> bool:
+        """
+        Check whether a requirement applies to an environment. Requirements without
+        markers always apply.
+
+        :param requirement: the requirement to check
+        :param environment: the environment, as produced by ``environment_key()``
+        """
+        if requirement.marker is None:
+            return True
+
+        marker_string = self._marker_string(requirement.marker)
+        key = (marker_string, environment)
+        result = self._results.get(key)
+        if result is None:
+            marker = self._markers.setdefault(marker_string, requirement.marker)
+            result = self._results[key] = marker.evaluate(dict(environment))
+        return result
+
+    def filter(
+        self, requirements: Iterable[Requirement], environment: EnvironmentKey
+    ) -> Iterator[Requirement]:
+        """
+        Filter requirements down to those which apply to an environment.
+        """
+        for requirement in requirements:
+            if self.matches(requirement, environment):
+                yield requirement
+
+    def partition(
+        self,
+        requirements: Iterable[Requirement],
+        environments: Mapping[str, EnvironmentKey],
+    ) -> dict[str, list[Requirement]]:
+        """
+        Sort requirements into the named environments to which they apply, in a
+        single pass over the requirements.
+
+        :param requirements: the requirements to partition
+        :param environments: the environments, as produced by ``environment_key()``,
+            keyed by name
+        """
+        partitions: dict[str, list[Requirement]] = {name: [] for name in environments}
+        # the environments matched by each marker string, so that each requirement
+        # is only checked against all of the environments once per distinct marker
+        matched_by_marker: dict[str, list[list[Requirement]]] = {}
+        everywhere = list(partitions.values())
+        for requirement in requirements:
+            if requirement.marker is None:
+                targets = everywhere
+            else:
+                marker_string = self._marker_string(requirement.marker)
+                if marker_string not in matched_by_marker:
+                    matched_by_marker[marker_string] = [
+                        partitions[name]
+                        for name, environment in environments.items()
+                        if self.matches(requirement, environment)
+                    ]
+                targets = matched_by_marker[marker_string]
+            for target in targets:
+                target.append(requirement)
+        return partitions
+
+    def _marker_string(self, marker: Marker) -> str:
+        cached = self._marker_strings.get(id(marker))
+        if cached is None:
+            cached = self._marker_strings[id(marker)] = (marker, str(marker))
+        return cached[1]
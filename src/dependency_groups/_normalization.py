@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import functools
+import re
+from collections.abc import Mapping
+
+_SEPARATOR_PATTERN = re.compile(r"[-_.]+")
+
+
+# names are often looked up repeatedly, e.g. when they come from user input, so
+# results are memoized, with a bound in case the names are unbounded
+@functools.lru_cache(maxsize=4096)
+def _normalize_name(name: str) -> str:
+    # fast path: lowercase names with only single hyphens are already normalized
+    # other types fall through to the pattern, which raises TypeError for them
+    if (
+        isinstance(name, str)
+        and name.islower()
+        and "_" not in name
+        and "." not in name
+        and "--" not in name
+    ):
+        return name
+    return _SEPARATOR_PATTERN.sub("-", name).lower()
+
+
+def _group_name_aliases(
+    dependency_groups: Mapping[str, str | Mapping[str, str]]
+) -> dict[str, str]:
+    """
+    Map each name in a table, both as written and normalized, to its normalized
+    name, so that the common spellings of a group can be resolved with one lookup.
+    """
+    aliases = {}
+    for group_name in dependency_groups:
+        normed_group_name = _normalize_name(group_name)
+        aliases[group_name] = normed_group_name
+        aliases[normed_group_name] = normed_group_name
+    return aliases
+
+
+def _normalize_group_names(
+    dependency_groups: Mapping[str, str | Mapping[str, str]]
+) -> Mapping[str, str | Mapping[str, str]]:
+    original_names: dict[str, list[str]] = {}
+    normalized_groups = {}
+
+    for group_name, value in dependency_groups.items():
+        normed_group_name = _normalize_name(group_name)
+        original_names.setdefault(normed_group_name, []).append(group_name)
+        normalized_groups[normed_group_name] = value
+
+    errors = []
+    for normed_name, names in original_names.items():
+        if len(names) > 1:
+            errors.append(f"{normed_name} ({', '.join(names)})")
+    if errors:
+        raise ValueError(f"Duplicate dependency group names: {', '.join(errors)}")
+
+    return normalized_groups
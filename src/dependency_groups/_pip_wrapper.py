@@ -1,17 +1,46 @@
 from __future__ import annotations
 
 import argparse
+import os
 import subprocess
 import sys
 
-from ._implementation import DependencyGroupResolver
+from ._cli_stats import CLIStats, cache_status
+from ._daemon import DaemonClient
+from ._disk_cache import CachedTable, ResolutionCache, resolve_table
+from ._loader import (
+    marker_environment_from_args,
+    parse_dependency_groups,
+    read_pyproject,
+)
 from ._toml_compat import tomllib
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ._implementation import DependencyGroupResolver
+
 
 def _invoke_pip(deps: list[str]) -> None:
     subprocess.check_call([sys.executable, "-m", "pip", "install", *deps])
 
 
+def _group_errors(
+    cached: CachedTable, resolver: DependencyGroupResolver | None, groups: list[str]
+) -> list[str]:
+    # if the table itself could not be loaded, that is the only error
+    if resolver is None:
+        return cached.errors
+
+    # otherwise, resolve each group separately, to report all of the errors
+    errors = []
+    for groupname in groups:
+        try:
+            resolver.resolve(groupname)
+        except (LookupError, ValueError, TypeError) as e:
+            errors.append(f"{type(e).__name__}: {e}")
+    return errors
+
+
 def main(*, argv: list[str] | None = None) -> None:
     if tomllib is None:
         print(
@@ -30,32 +59,196 @@ def main(*, argv: list[str] | None = None) -> None:
         default="pyproject.toml",
         help="The pyproject.toml file. Defaults to trying in the current directory.",
     )
+    environment_args = parser.add_mutually_exclusive_group()
+    environment_args.add_argument(
+        "--filter-markers",
+        action="store_true",
+        help=(
+            "Only include requirements whose environment markers match the "
+            "current interpreter."
+        ),
+    )
+    environment_args.add_argument(
+        "--marker-environment",
+        metavar="FILE",
+        help=(
+            "Only include requirements whose environment markers match the "
+            "environment in this JSON file. Values which are not set in the file "
+            "are taken from the current interpreter."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            "Do not read or write the on-disk cache of resolved groups, or use a "
+            "running daemon."
+        ),
+    )
+    parser.add_argument(
+        "--skip-satisfied",
+        action="store_true",
+        help=(
+            "Check the requirements against the installed distributions first, "
+            "and do not run pip if all of them are satisfied. Otherwise, every "
+            "requirement is passed to pip, so that satisfied requirements still "
+            "constrain the others. Requirements with extras or URLs are never "
+            "considered satisfied."
+        ),
+    )
+    parser.add_argument(
+        "--installer",
+        choices=("pip", "uv", "requirements-file"),
+        default="pip",
+        help=(
+            "The installer to use. 'requirements-file' writes the requirements to "
+            "the file given by --output, for use by another tool. Defaults to pip."
+        ),
+    )
+    parser.add_argument(
+        "--python",
+        action="append",
+        metavar="PYTHON",
+        help=(
+            "An interpreter to install into. May be given more than once, to "
+            "install into several environments in parallel. Defaults to the "
+            "current interpreter."
+        ),
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help=(
+            "The number of --python targets to install into in parallel. "
+            "Defaults to 0, which uses one per CPU."
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        help=(
+            "The file to write for '--installer requirements-file'. "
+            "Defaults to stdout."
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help=(
+            "Print statistics about caching and resolution to stderr, as JSON, "
+            "before invoking pip."
+        ),
+    )
     args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+    if args.jobs < 0:
+        parser.error("--jobs must not be negative")
+    if args.installer == "requirements-file":
+        if args.python:
+            parser.error("--python cannot be used with '--installer requirements-file'")
+    elif args.output is not None:
+        parser.error("--output can only be used with '--installer requirements-file'")
+    if args.skip_satisfied and args.python:
+        # installed distributions can only be checked for the current interpreter
+        parser.error("--skip-satisfied cannot be used with --python")
+    environment = marker_environment_from_args(
+        args.filter_markers, args.marker_environment
+    )
 
-    with open(args.pyproject_file, "rb") as fp:
-        pyproject = tomllib.load(fp)
-    dependency_groups_raw = pyproject.get("dependency-groups", {})
-
-    errors: list[str] = []
-    resolved: list[str] = []
+    stats = CLIStats() if args.stats else None
     try:
-        resolver = DependencyGroupResolver(dependency_groups_raw)
-    except (ValueError, TypeError) as e:
-        errors.append(f"{type(e).__name__}: {e}")
-    else:
-        for groupname in args.DEPENDENCY_GROUP:
-            try:
-                resolved.extend(str(r) for r in resolver.resolve(groupname))
-            except (LookupError, ValueError, TypeError) as e:
-                errors.append(f"{type(e).__name__}: {e}")
+        resolved = _resolve(args, environment, stats)
+    finally:
+        if stats is not None:
+            stats.write()
+
+    if args.skip_satisfied:
+        from ._satisfied import installed_versions, unsatisfied_requirements
+
+        # satisfied requirements still constrain what pip may install for the
+        # others, so they are only dropped when nothing needs to be installed
+        if not unsatisfied_requirements(resolved, installed_versions()):
+            if args.installer != "requirements-file":
+                print("all requirements are already satisfied")
+                return
+            resolved = []
+
+    if args.installer == "pip" and not args.python:
+        _invoke_pip(resolved)
+        return
+
+    from ._installers import install, write_requirements_file
 
-    if errors:
+    if args.installer == "requirements-file":
+        write_requirements_file(resolved, args.output or "-")
+        return
+    pythons = list(dict.fromkeys(args.python or [sys.executable]))
+    status = install(
+        args.installer, resolved, pythons, jobs=args.jobs or os.cpu_count() or 1
+    )
+    if status:
+        raise SystemExit(status)
+
+
+def _resolve(
+    args: argparse.Namespace,
+    environment: dict[str, str] | None,
+    stats: CLIStats | None,
+) -> list[str]:
+    collect_stats = stats is not None
+    if environment is None and not collect_stats:
+        daemon = DaemonClient.from_environment(disable=args.no_cache)
+        if daemon is not None:
+            answer = daemon.resolve(
+                args.pyproject_file, args.DEPENDENCY_GROUP, dedupe=True
+            )
+            if answer is not None:
+                return answer
+
+    pyproject_content = read_pyproject(args.pyproject_file)
+    cache = ResolutionCache.from_environment(disable=args.no_cache)
+    cached = cache.load(pyproject_content) if cache is not None else None
+    if stats is not None:
+        stats.add_cache_result(cache_status(cache, cached))
+    resolver = None
+    if cached is None or cached.missing(args.DEPENDENCY_GROUP):
+        entry, resolver = resolve_table(
+            parse_dependency_groups(pyproject_content),
+            groups=args.DEPENDENCY_GROUP,
+            collect_stats=collect_stats,
+        )
+        cached = entry if cached is None else cached.merge(entry)
+        if cache is not None:
+            cache.store(pyproject_content, cached)
+
+    resolved = None
+    if environment is None:
+        resolved = cached.resolve(args.DEPENDENCY_GROUP, dedupe=True)
+    if resolved is None:
+        if resolver is None:
+            cached, resolver = resolve_table(
+                parse_dependency_groups(pyproject_content), collect_stats=collect_stats
+            )
+        if resolver is not None and environment is not None:
+            # filtering requires parsed requirements, so the cache cannot serve it
+            try:
+                resolution = resolver.resolve_many(
+                    *args.DEPENDENCY_GROUP, dedupe=True, environment=environment
+                )
+            except (LookupError, ValueError, TypeError):
+                pass
+            else:
+                resolved = [str(r) for r in resolution.requirements]
+    if stats is not None:
+        stats.add_resolver(resolver)
+    if resolved is None:
         print("errors encountered while examining dependency groups:")
-        for msg in errors:
+        for msg in _group_errors(cached, resolver, args.DEPENDENCY_GROUP):
             print(f"  {msg}")
         sys.exit(1)
-
-    _invoke_pip(resolved)
+    return resolved
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import collections
+import threading
+import typing as t
+
+from packaging.requirements import Requirement
+
+
+class RequirementCacheInfo(t.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class RequirementCache:
+    """
+    A bounded, least-recently-used cache of parsed requirements, keyed by the
+    requirement string.
+
+    The same requirement strings tend to recur across groups and across tables, and
+    parsing them is the most expensive part of reading a group. By default, all
+    resolvers share a single cache, ``DEFAULT_REQUIREMENT_CACHE``.
+
+    Cached ``Requirement`` objects are shared between all users of the cache, and
+    must not be modified.
+
+    :param maxsize: The maximum number of requirements to hold. When the cache is
+        full, the least recently used requirement is evicted. A size of ``0``
+        disables caching.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative")
+        self._maxsize = maxsize
+        self._data: collections.OrderedDict[str, Requirement] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """
+        The maximum number of requirements to hold. Reducing the size evicts the
+        least recently used requirements immediately.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int) -> None:
+        if value < 0:
+            raise ValueError("maxsize must not be negative")
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def get(self, requirement_string: str) -> Requirement:
+        """
+        Get the parsed form of a requirement string, parsing it on a cache miss.
+
+        :param requirement_string: the requirement to parse
+
+        :raises packaging.requirements.InvalidRequirement: if the requirement is not
+            valid
+        """
+        with self._lock:
+            requirement = self._data.get(requirement_string)
+            if requirement is not None:
+                self._data.move_to_end(requirement_string)
+                self.hits += 1
+                return requirement
+            self.misses += 1
+
+        # parse without holding the lock, so that other threads are not blocked
+        requirement = Requirement(requirement_string)
+        with self._lock:
+            if self._maxsize:
+                requirement = self._data.setdefault(requirement_string, requirement)
+                self._evict()
+        return requirement
+
+    def info(self) -> RequirementCacheInfo:
+        """
+        Get the hit and miss counts, and current size, of the cache.
+        """
+        with self._lock:
+            return RequirementCacheInfo(
+                self.hits, self.misses, self._maxsize, len(self._data)
+            )
+
+    def clear(self) -> None:
+        """
+        Remove all requirements from the cache, and reset its statistics.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _evict(self) -> None:
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+
+DEFAULT_REQUIREMENT_CACHE = RequirementCache()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
+
+from ._requirement_cache import DEFAULT_REQUIREMENT_CACHE
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from importlib.metadata import Distribution
+
+    from packaging.specifiers import SpecifierSet
+
+
+def installed_versions(
+    distributions: Iterable[Distribution] | None = None,
+) -> dict[str, str]:
+    """
+    Find the installed version of every distribution, in a single scan.
+
+    As with ``importlib.metadata``, if a distribution is installed more than once,
+    the first one found on ``sys.path`` is used.
+
+    :param distributions: the distributions to scan. Defaults to all of those
+        visible to the current interpreter.
+
+    :returns: a mapping of normalized project names to versions
+    """
+    if distributions is None:
+        from importlib.metadata import distributions as all_distributions
+
+        distributions = all_distributions()
+
+    versions: dict[str, str] = {}
+    for distribution in distributions:
+        name = distribution.metadata["Name"]
+        if name:
+            versions.setdefault(canonicalize_name(name), distribution.version)
+    return versions
+
+
+def unsatisfied_requirements(
+    requirements: Iterable[str], installed: dict[str, str]
+) -> list[str]:
+    """
+    Filter requirements down to those which the installed distributions do not
+    satisfy.
+
+    Requirements whose markers do not match the current interpreter are dropped, as
+    pip would ignore them. This errs on the side of keeping requirements: those
+    with extras or URLs are always kept, because checking them would require
+    inspecting the dependencies or origin of the installed distribution.
+
+    :param requirements: the requirement strings to check
+    :param installed: installed versions, as returned by ``installed_versions()``
+    """
+    unsatisfied = []
+    for requirement_string in requirements:
+        requirement = DEFAULT_REQUIREMENT_CACHE.get(requirement_string)
+        if requirement.marker is not None and not requirement.marker.evaluate():
+            continue
+        if requirement.extras or requirement.url:
+            unsatisfied.append(requirement_string)
+            continue
+
+        version = installed.get(canonicalize_name(requirement.name))
+        if version is None or not _version_matches(requirement.specifier, version):
+            unsatisfied.append(requirement_string)
+    return unsatisfied
+
+
+def _version_matches(specifier: SpecifierSet, version: str) -> bool:
+    try:
+        parsed = Version(version)
+    except InvalidVersion:
+        return False
+    # an installed pre-release satisfies a requirement which it matches, even though
+    # pip would not select it for a new installation
+    return specifier.contains(parsed, prereleases=True)
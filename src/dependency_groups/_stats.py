@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import typing as t
+
+
+class ResolverStats(t.NamedTuple):
+    """
+    Statistics collected by a ``DependencyGroupResolver`` created with
+    ``collect_stats=True``.
+
+    Times are in seconds. Parsing happens during resolution, so ``parse_time`` is
+    included in ``resolve_time``.
+    """
+
+    #: lookups of groups which had already been parsed
+    parse_hits: int
+    #: lookups of groups which had to be parsed
+    parse_misses: int
+    #: the time spent parsing groups
+    parse_time: float
+    #: the number of requirement strings parsed, including those which were found
+    #: in the requirement cache
+    requirements_parsed: int
+    #: lookups of groups which had already been resolved
+    resolve_hits: int
+    #: lookups of groups which had to be resolved
+    resolve_misses: int
+    #: the time spent in ``resolve()`` and ``compile()``, including the methods
+    #: which use them
+    resolve_time: float
+    #: the time spent normalizing the names of groups in the table
+    normalize_time: float
+    #: the longest chain of includes followed. ``compile()`` visits each group
+    #: once, so it may follow shorter chains than exist in the table.
+    max_include_depth: int
+    #: the number of includes followed
+    edges_walked: int
+
+
+class StatsCollector:
+    """
+    The mutable counters behind ``ResolverStats``.
+
+    Counters are updated without locking, so the statistics of a resolver shared
+    between threads are approximate.
+    """
+
+    __slots__ = ResolverStats._fields
+
+    def __init__(self) -> None:
+        for field in self.__slots__:
+            setattr(self, field, 0)
+
+    if t.TYPE_CHECKING:
+        parse_hits: int
+        parse_misses: int
+        parse_time: float
+        requirements_parsed: int
+        resolve_hits: int
+        resolve_misses: int
+        resolve_time: float
+        normalize_time: float
+        max_include_depth: int
+        edges_walked: int
+
+    def include_depth(self, depth: int) -> None:
+        if depth > self.max_include_depth:
+            self.max_include_depth = depth
+
+    def snapshot(self) -> ResolverStats:
+        return ResolverStats(*(getattr(self, field) for field in self.__slots__))
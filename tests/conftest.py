@@ -0,0 +1,36 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch):
+    # never read or write the user's real cache during tests
+    monkeypatch.setenv("DEPENDENCY_GROUPS_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("DEPENDENCY_GROUPS_NO_CACHE", raising=False)
+    # nor talk to a daemon started by the user
+    monkeypatch.delenv("DEPENDENCY_GROUPS_DAEMON_SOCKET", raising=False)
+    monkeypatch.delenv("DEPENDENCY_GROUPS_NO_DAEMON", raising=False)
+
+
+@pytest.fixture
+def diamond():
+    """
+    Build layers of groups, where every group includes every group in the layer
+    below, so that the same groups are reachable along many paths.
+
+    Each group lists a requirement of its own, followed by any ``requirements``
+    shared by every group.
+    """
+
+    def make(layers, width, *, requirements=()):
+        groups = {}
+        for layer in range(layers):
+            for i in range(width):
+                items = [f"package-{layer}-{i}", *requirements]
+                if layer + 1 < layers:
+                    items.extend(
+                        {"include-group": f"node-{layer + 1}-{j}"} for j in range(width)
+                    )
+                groups[f"node-{layer}-{i}"] = items
+        return groups
+
+    return make
@@ -0,0 +1,123 @@
+import asyncio
+import concurrent.futures
+
+import pytest
+from packaging.requirements import Requirement
+
+from dependency_groups import FileGroupResolution, resolve_files
+
+
+def write_project(path, content):
+    path.mkdir(parents=True, exist_ok=True)
+    pyproject = path / "pyproject.toml"
+    pyproject.write_text(content)
+    return pyproject
+
+
+@pytest.fixture
+def projects(tmp_path):
+    return [
+        write_project(
+            tmp_path / f"project-{i}",
+            f"""\
+[dependency-groups]
+test = ["pytest", {{include-group = "runtime"}}]
+Runtime = ["package-{i}"]
+""",
+        )
+        for i in range(20)
+    ]
+
+
+def collect(*args, **kwargs):
+    async def _collect():
+        return [result async for result in resolve_files(*args, **kwargs)]
+
+    return asyncio.run(_collect())
+
+
+def test_resolve_files_all_groups(projects):
+    results = collect(projects, max_workers=3)
+    assert len(results) == 2 * len(projects)
+    by_file = {}
+    for result in results:
+        by_file.setdefault(result.path, []).append(result)
+    assert set(by_file) == {str(path) for path in projects}
+
+    for i, path in enumerate(projects):
+        test, runtime = by_file[str(path)]
+        assert test == FileGroupResolution(
+            str(path), "test", (Requirement("pytest"), Requirement(f"package-{i}"))
+        )
+        assert runtime.group == "runtime"
+        assert runtime.requirements == (Requirement(f"package-{i}"),)
+        assert runtime.errors == ()
+
+
+def test_resolve_files_selected_groups(projects):
+    results = collect(projects, "RUNTIME")
+    assert len(results) == len(projects)
+    assert {result.group for result in results} == {"runtime"}
+
+
+def test_resolve_files_reports_errors(tmp_path, projects):
+    missing = tmp_path / "missing" / "pyproject.toml"
+    invalid = write_project(tmp_path / "invalid", "[dependency-groups\n")
+    cyclic = write_project(
+        tmp_path / "cyclic",
+        """\
+[dependency-groups]
+a = [{include-group = "a"}]
+test = ["pytest"]
+""",
+    )
+    results = collect([missing, invalid, cyclic, projects[0]], "test")
+    by_path = {result.path: result for result in results}
+
+    assert by_path[str(missing)].group is None
+    assert isinstance(by_path[str(missing)].errors[0], FileNotFoundError)
+    assert by_path[str(invalid)].group is None
+    assert isinstance(by_path[str(invalid)].errors[0], ValueError)
+    assert by_path[str(cyclic)].requirements == (Requirement("pytest"),)
+    assert by_path[str(projects[0])].errors == ()
+
+    results = collect([cyclic])
+    assert [(r.group, type(r.errors[0]).__name__) for r in results if r.errors] == [
+        ("a", "CyclicDependencyError")
+    ]
+
+
+def test_resolve_files_limits_pending_work(projects):
+    submitted = []
+
+    class RecordingExecutor(concurrent.futures.ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(args[0])
+            return super().submit(fn, *args, **kwargs)
+
+    def paths():
+        for path in projects:
+            # never more than two files are pending when the next path is requested
+            assert len(submitted) - consumed[0] <= 2
+            yield path
+
+    consumed = [0]
+
+    async def _consume():
+        with RecordingExecutor(1) as executor:
+            async for result in resolve_files(
+                paths(), "test", max_workers=1, executor=executor
+            ):
+                consumed[0] += 1
+
+    asyncio.run(_consume())
+    assert len(submitted) == len(projects)
+    assert consumed[0] == len(projects)
+
+
+def test_resolve_files_early_exit(projects):
+    async def _first():
+        async for result in resolve_files(projects, "test"):
+            return result
+
+    assert asyncio.run(_first()).group == "test"
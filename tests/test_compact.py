@@ -0,0 +1,95 @@
+import array
+import gc
+import pickle
+import tracemalloc
+
+import pytest
+
+from dependency_groups import DependencyGroupInclude, DependencyGroupResolver
+
+GROUPS = {
+    "base": ["attrs>=22", "urllib3<2; python_version < '3.10'"],
+    "test": ["pytest", "attrs>=22", {"include-group": "base"}],
+    "lint": ["flake8", {"include-group": "base"}],
+    "ci": [{"include-group": "test"}, {"include-group": "lint"}],
+}
+
+
+@pytest.mark.parametrize("requirement_cache", ("default", None))
+def test_compact_results_match(requirement_cache):
+    kwargs = {} if requirement_cache == "default" else {"requirement_cache": None}
+    regular = DependencyGroupResolver(GROUPS, **kwargs)
+    compact = DependencyGroupResolver(GROUPS, compact=True, **kwargs)
+
+    assert compact.resolve_all() == regular.resolve_all()
+    for group in GROUPS:
+        assert compact.resolve(group) == regular.resolve(group)
+        assert compact.resolve(group, merge=True) == regular.resolve(group, merge=True)
+        assert list(compact.iter_resolve(group)) == list(regular.iter_resolve(group))
+        assert compact.lookup(group) == regular.lookup(group)
+    assert compact.why("attrs") == regular.why("attrs")
+
+
+def test_compact_stores_index_arrays():
+    resolver = DependencyGroupResolver(GROUPS, compact=True, requirement_cache=None)
+    resolver.compile()
+    groups = resolver._compact_groups
+    for stored in (groups.parsed, groups.resolved):
+        assert set(stored) == set(GROUPS)
+        assert all(isinstance(value, array.array) for value in stored.values())
+    # each distinct requirement string is stored once
+    assert len(groups.requirements) == 4
+    assert resolver.lookup("test")[1] is resolver.lookup("base")[0]
+    # a group without includes shares its parsed array
+    assert groups.resolved["base"] is groups.parsed["base"]
+    # derived results are not held
+    resolver.resolve("ci", dedupe=True, environment={})
+    assert resolver._dedupe_cache == {}
+    assert resolver._filter_cache == {}
+
+
+def test_compact_update():
+    resolver = DependencyGroupResolver(GROUPS, compact=True)
+    resolver.compile()
+    resolver.update({**GROUPS, "base": ["cattrs"]})
+    assert [r.name for r in resolver.resolve("ci")] == [
+        "pytest",
+        "attrs",
+        "cattrs",
+        "flake8",
+        "cattrs",
+    ]
+
+
+def retained_memory(groups, **kwargs):
+    gc.collect()
+    tracemalloc.start()
+    resolver = DependencyGroupResolver(groups, requirement_cache=None, **kwargs)
+    resolver.compile()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resolver
+    return size
+
+
+def test_compact_uses_less_memory(diamond):
+    groups = diamond(layers=6, width=8)
+    assert retained_memory(groups, compact=True) < retained_memory(groups) * 0.75
+
+
+def test_compact_uses_less_memory_on_flat_table():
+    # no includes, but requirements recur across groups, as in real tables
+    pool = [f"package-{i}>={i % 5}; python_version >= '3.{i % 9}'" for i in range(40)]
+    groups = {
+        f"group-{i}": [pool[(i + j) % len(pool)] for j in range(10)] for i in range(200)
+    }
+    assert retained_memory(groups, compact=True) < retained_memory(groups) * 0.5
+
+
+def test_include_records_are_slotted():
+    include = DependencyGroupInclude(include_group="test")
+    assert not hasattr(include, "__dict__")
+    with pytest.raises(AttributeError):
+        include.other = 1
+    assert pickle.loads(pickle.dumps(include)) == include
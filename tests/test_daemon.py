@@ -0,0 +1,215 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+from dependency_groups._daemon import (
+    DaemonClient,
+    ResolverDaemon,
+    make_server,
+    serve,
+)
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="requires Unix domain sockets"
+)
+
+
+@pytest.fixture
+def pyproject(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        """\
+[dependency-groups]
+test = ["pytest", {include-group = "runtime"}]
+lint = ["flake8", {include-group = "runtime"}]
+Runtime = ["click"]
+"""
+    )
+    return path
+
+
+@pytest.fixture
+def socket_path(monkeypatch):
+    # socket paths have a short length limit, so avoid the long pytest tmp_path
+    directory = tempfile.mkdtemp(prefix="dg-")
+    path = os.path.join(directory, "daemon.sock")
+    monkeypatch.setenv("DEPENDENCY_GROUPS_DAEMON_SOCKET", path)
+    yield path
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def daemon(socket_path):
+    state = ResolverDaemon()
+    server = make_server(socket_path, state)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield state
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _rewrite(path, content):
+    # make sure that the change is visible even with a coarse mtime
+    stat = path.stat()
+    path.write_text(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_handle_requests(pyproject):
+    daemon = ResolverDaemon()
+    path = str(pyproject)
+    assert daemon.handle({"op": "list", "path": path}) == {
+        "version": 1,
+        "names": ["test", "lint", "Runtime"],
+    }
+    assert daemon.handle(
+        {"op": "resolve", "path": path, "groups": ["test", "lint"], "dedupe": True}
+    ) == {"version": 1, "requirements": ["pytest", "click", "flake8"]}
+    assert daemon.handle({"op": "lint", "path": path}) == {"version": 1, "errors": []}
+
+
+@pytest.mark.parametrize(
+    "message",
+    (
+        [],
+        {"op": "nope"},
+        {"op": "list"},
+        {"op": "list", "path": "/no/such/pyproject.toml"},
+        {"op": "resolve", "path": "PYPROJECT", "groups": "test"},
+        {"op": "resolve", "path": "PYPROJECT", "groups": ["nope"]},
+    ),
+)
+def test_handle_errors(pyproject, message):
+    if isinstance(message, dict) and message.get("path") == "PYPROJECT":
+        message["path"] = str(pyproject)
+    assert "error" in ResolverDaemon().handle(message)
+
+
+def test_handle_invalidates_changed_files(pyproject):
+    daemon = ResolverDaemon()
+    path = str(pyproject)
+    request = {"op": "resolve", "path": path, "groups": ["test"]}
+    assert daemon.handle(request)["requirements"] == ["pytest", "click"]
+    resolver = daemon._entries[path].resolver
+
+    _rewrite(
+        pyproject,
+        pyproject.read_text().replace('Runtime = ["click"]', 'Runtime = ["attrs"]'),
+    )
+    assert daemon.handle(request)["requirements"] == ["pytest", "attrs"]
+    # the resolver was updated in place, rather than replaced
+    assert daemon._entries[path].resolver is resolver
+
+    _rewrite(pyproject, '[dependency-groups]\ntest = [{include-group = "nope"}]\n')
+    assert "error" in daemon.handle(request)
+    assert daemon.handle({"op": "lint", "path": path})["errors"] == [
+        "LookupError: Dependency group 'nope' not found"
+    ]
+
+
+def test_handle_evicts_old_files(tmp_path):
+    daemon = ResolverDaemon(max_entries=2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"pyproject{i}.toml"
+        path.write_text('[dependency-groups]\ntest = ["pytest"]\n')
+        paths.append(str(path))
+        daemon.handle({"op": "list", "path": str(path)})
+    assert list(daemon._entries) == paths[1:]
+
+
+def test_client(daemon, socket_path, pyproject):
+    client = DaemonClient.from_environment()
+    assert client is not None
+    assert client.resolve(str(pyproject), ["test"]) == ["pytest", "click"]
+    assert client.list_groups(str(pyproject)) == ["test", "lint", "Runtime"]
+    assert client.lint(str(pyproject)) == []
+    assert client.resolve(str(pyproject), ["nope"]) is None
+    assert DaemonClient.from_environment(disable=True) is None
+
+
+def test_client_without_daemon(socket_path, pyproject, monkeypatch):
+    assert DaemonClient.from_environment() is None
+    # a socket left behind by a daemon which is not running
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(socket_path)
+    sock.close()
+    client = DaemonClient.from_environment()
+    assert client is not None
+    assert client.resolve(str(pyproject), ["test"]) is None
+
+    monkeypatch.setenv("DEPENDENCY_GROUPS_NO_DAEMON", "1")
+    assert DaemonClient.from_environment() is None
+
+
+def _fail_to_read(path):
+    raise AssertionError("the daemon should have answered")
+
+
+def test_clis_use_daemon(daemon, pyproject, monkeypatch, capsys):
+    from dependency_groups import _lint_dependency_groups, _pip_wrapper
+    from dependency_groups.__main__ import main
+
+    monkeypatch.setattr("dependency_groups.__main__.read_pyproject", _fail_to_read)
+    monkeypatch.setattr(_pip_wrapper, "read_pyproject", _fail_to_read)
+    monkeypatch.setattr(_lint_dependency_groups, "read_pyproject", _fail_to_read)
+
+    main(argv=["-f", str(pyproject), "test", "lint", "--dedupe"])
+    assert capsys.readouterr().out == "pytest\nclick\nflake8\n"
+    main(argv=["-f", str(pyproject), "--list"])
+    assert capsys.readouterr().out == "test lint Runtime\n"
+
+    pip_calls = []
+    monkeypatch.setattr(_pip_wrapper, "_invoke_pip", pip_calls.append)
+    _pip_wrapper.main(argv=["-f", str(pyproject), "test", "lint"])
+    assert pip_calls == [["pytest", "click", "flake8"]]
+
+    with pytest.raises(SystemExit) as excinfo:
+        _lint_dependency_groups.main(argv=[str(pyproject)])
+    assert excinfo.value.code == 0
+
+
+def test_clis_fall_back_for_errors(daemon, pyproject, capsys):
+    from dependency_groups.__main__ import main
+
+    with pytest.raises(LookupError, match="'nope' not found"):
+        main(argv=["-f", str(pyproject), "nope"])
+    # options which the daemon does not support are handled in-process
+    main(argv=["-f", str(pyproject), "test", "--format", "jsonl"])
+    assert '"name": "pytest"' in capsys.readouterr().out
+
+
+def test_daemon_cli(socket_path, pyproject, capsys):
+    from dependency_groups.__main__ import main
+
+    with pytest.raises(SystemExit) as excinfo:
+        main(argv=["daemon", "--status"])
+    assert excinfo.value.code == 1
+    assert capsys.readouterr().err == f"no daemon is running on {socket_path}\n"
+
+    thread = threading.Thread(target=main, kwargs={"argv": ["daemon"]})
+    thread.start()
+    client = DaemonClient(socket_path)
+    for _ in range(500):
+        if client.request({"op": "ping"}) is not None:
+            break
+        time.sleep(0.01)
+
+    main(argv=["daemon", "--status"])
+    assert capsys.readouterr().out.startswith("daemon (pid ")
+    # a second daemon is refused
+    with pytest.raises(RuntimeError, match="already running"):
+        serve(socket_path)
+
+    main(argv=["daemon", "--stop"])
+    assert " stopped on " in capsys.readouterr().out
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert not os.path.exists(socket_path)
@@ -0,0 +1,228 @@
+import os
+
+import pytest
+
+from dependency_groups._disk_cache import CachedTable, ResolutionCache, resolve_table
+
+PYPROJECT = b"""\
+[dependency-groups]
+test = ["pytest", {include-group = "runtime"}]
+runtime = ["click"]
+bad = [{include-group = "missing"}]
+"""
+
+
+def test_resolve_table():
+    entry, resolver = resolve_table(
+        {
+            "test": ["pytest", {"include-group": "runtime"}],
+            "Runtime": ["click"],
+            "bad": [{"include-group": "missing"}],
+        }
+    )
+    assert resolver is not None
+    assert entry.names == ["test", "Runtime", "bad"]
+    assert entry.groups == {"test": ["pytest", "click"], "runtime": ["click"]}
+    assert entry.errors == ["LookupError: Dependency group 'missing' not found"]
+
+
+def test_resolve_table_partially():
+    entry, resolver = resolve_table(
+        {
+            "test": ["pytest", {"include-group": "runtime"}],
+            "Runtime": ["click"],
+            "lint": ["flake8"],
+            "bad": [{"include-group": "missing"}],
+        },
+        groups=["test", "bad"],
+    )
+    assert resolver is not None
+    assert entry == CachedTable(
+        ["test", "Runtime", "lint", "bad"],
+        {"test": ["pytest", "click"], "runtime": ["click"]},
+        [],
+        complete=False,
+    )
+    assert not entry.missing(["test", "Runtime"])
+    assert entry.missing(["lint"])
+
+    more, _ = resolve_table({"lint": ["flake8"]}, groups=["lint"])
+    merged = entry.merge(more)
+    assert merged.groups == {
+        "test": ["pytest", "click"],
+        "runtime": ["click"],
+        "lint": ["flake8"],
+    }
+    assert not merged.complete
+    # a complete table is never missing groups, as absent groups are invalid
+    full, _ = resolve_table({"lint": ["flake8"]})
+    assert not full.missing(["nope"])
+    assert entry.merge(full) is full
+
+
+def test_resolve_table_not_a_mapping():
+    entry, resolver = resolve_table([])
+    assert resolver is None
+    assert entry == CachedTable(
+        [], {}, ["TypeError: Dependency Groups table is not a mapping"]
+    )
+
+
+def test_cached_table_resolve():
+    entry = CachedTable(
+        ["test", "lint"], {"test": ["pytest", "click"], "lint": ["click"]}, []
+    )
+    assert entry.resolve(["Test", "lint"]) == ["pytest", "click", "click"]
+    assert entry.resolve(["Test", "lint"], dedupe=True) == ["pytest", "click"]
+    assert entry.resolve(["test", "missing"]) is None
+
+
+def test_store_and_load_roundtrip(tmp_path):
+    cache = ResolutionCache(str(tmp_path))
+    assert cache.load(PYPROJECT) is None
+
+    entry = CachedTable(["test"], {"test": ["pytest"]}, [])
+    cache.store(PYPROJECT, entry)
+    assert cache.load(PYPROJECT) == entry
+    # any change to the file content is a miss
+    assert cache.load(PYPROJECT + b"\n") is None
+
+
+def test_installation_changes_are_a_miss(tmp_path):
+    cache = ResolutionCache(str(tmp_path))
+    cache.store(PYPROJECT, CachedTable([], {}, []))
+    assert cache.load(PYPROJECT) is not None
+
+    # e.g. after upgrading this package or `packaging`
+    upgraded = ResolutionCache(str(tmp_path))
+    upgraded._fingerprint = b"another installation"
+    assert upgraded.load(PYPROJECT) is None
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ResolutionCache(str(tmp_path))
+    cache.store(PYPROJECT, CachedTable([], {}, []))
+    (entry_path,) = tmp_path.iterdir()
+    entry_path.write_text("{not json")
+    assert cache.load(PYPROJECT) is None
+
+
+def test_prune_removes_least_recently_used(tmp_path):
+    cache = ResolutionCache(str(tmp_path), max_entries=2)
+    for i in range(2):
+        cache.store(b"%d" % i, CachedTable([str(i)], {}, []))
+    # make entry 0 look old, then use it so that it becomes the most recent
+    for path in tmp_path.iterdir():
+        os.utime(path, (0, 0))
+    assert cache.load(b"0") is not None
+    cache.store(b"2", CachedTable(["2"], {}, []))
+
+    assert len(list(tmp_path.iterdir())) == 2
+    assert cache.load(b"0") is not None
+    assert cache.load(b"1") is None
+    assert cache.load(b"2") is not None
+
+
+def test_disabled_by_environment(monkeypatch):
+    assert ResolutionCache.from_environment() is not None
+    assert ResolutionCache.from_environment(disable=True) is None
+    monkeypatch.setenv("DEPENDENCY_GROUPS_NO_CACHE", "1")
+    assert ResolutionCache.from_environment() is None
+
+
+def no_toml_parsing(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("TOML was parsed")
+
+    for module in ("__main__", "_lint_dependency_groups", "_pip_wrapper"):
+        monkeypatch.setattr(f"dependency_groups.{module}.parse_dependency_groups", fail)
+
+
+@pytest.mark.parametrize(
+    "argv, expect_output",
+    (
+        (["test"], "pytest\nclick\n"),
+        (["--list"], "test runtime bad\n"),
+    ),
+)
+def test_main_cli_warm_run_skips_parsing(
+    capsys, tmp_path, monkeypatch, argv, expect_output
+):
+    from dependency_groups.__main__ import main
+
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_bytes(PYPROJECT)
+    main(argv=["-f", str(tomlfile), "test"])
+    capsys.readouterr()
+
+    no_toml_parsing(monkeypatch)
+    main(argv=["-f", str(tomlfile), *argv])
+    assert capsys.readouterr().out == expect_output
+
+
+def test_lint_cli_warm_run_skips_parsing(capsys, tmp_path, monkeypatch):
+    from dependency_groups._lint_dependency_groups import main
+
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_bytes(PYPROJECT)
+    for _ in range(2):
+        with pytest.raises(SystemExit):
+            main(argv=["-f", str(tomlfile)])
+        assert capsys.readouterr().out == (
+            "errors encountered while examining dependency groups:\n"
+            "  LookupError: Dependency group 'missing' not found\n"
+        )
+        no_toml_parsing(monkeypatch)
+
+
+def test_pip_wrapper_warm_run_skips_parsing(tmp_path, monkeypatch):
+    from dependency_groups._pip_wrapper import main
+
+    pip_calls = []
+    monkeypatch.setattr(
+        "dependency_groups._pip_wrapper._invoke_pip",
+        lambda deps: pip_calls.append(deps),
+    )
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_bytes(PYPROJECT)
+    main(argv=["-f", str(tomlfile), "test"])
+    no_toml_parsing(monkeypatch)
+    main(argv=["-f", str(tomlfile), "test", "runtime"])
+    assert pip_calls == [["pytest", "click"], ["pytest", "click"]]
+
+
+def test_no_cache_flag(tmp_path, capsys):
+    from dependency_groups.__main__ import main
+
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_bytes(PYPROJECT)
+    main(argv=["-f", str(tomlfile), "--no-cache", "test"])
+    assert capsys.readouterr().out == "pytest\nclick\n"
+    assert not (tmp_path / "cache").exists()
+
+
+def test_cold_run_resolves_only_requested_groups(tmp_path, capsys, monkeypatch):
+    from dependency_groups.__main__ import main
+    from dependency_groups._disk_cache import ResolutionCache
+
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_bytes(PYPROJECT)
+    main(argv=["-f", str(tomlfile), "runtime"])
+    assert capsys.readouterr().out == "click\n"
+    entry = ResolutionCache.from_environment().load(PYPROJECT)
+    assert entry.groups == {"runtime": ["click"]}
+    assert not entry.complete
+
+    # further groups are added to the entry
+    main(argv=["-f", str(tomlfile), "test"])
+    assert capsys.readouterr().out == "pytest\nclick\n"
+    entry = ResolutionCache.from_environment().load(PYPROJECT)
+    assert entry.groups == {"runtime": ["click"], "test": ["pytest", "click"]}
+
+    # the linter needs every group, so it does not use a partial entry
+    from dependency_groups._lint_dependency_groups import main as lint_main
+
+    with pytest.raises(SystemExit):
+        lint_main(argv=["-f", str(tomlfile)])
+    assert "'missing' not found" in capsys.readouterr().out
+    assert ResolutionCache.from_environment().load(PYPROJECT).complete
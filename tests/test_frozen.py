@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from dependency_groups import FrozenDependencyGroups
+
+PYPROJECT = b"""\
+[project]
+name = "example"
+
+[dependency-groups]
+test = ["pytest>=7", {include-group = "runtime"}]
+lint = ["Flake8", {include-group = "runtime"}]
+Runtime = ["click", "attrs ; python_version >= '3'"]
+"""
+
+
+@pytest.fixture
+def frozen():
+    return FrozenDependencyGroups.from_pyproject(PYPROJECT)
+
+
+def test_frozen_resolve(frozen):
+    assert frozen.resolve("test") == [
+        "pytest>=7",
+        "click",
+        'attrs; python_version >= "3"',
+    ]
+    assert frozen.resolve("RUNTIME") == ["click", 'attrs; python_version >= "3"']
+    assert frozen.resolve("test", "lint", dedupe=True) == [
+        "pytest>=7",
+        "click",
+        'attrs; python_version >= "3"',
+        "Flake8",
+    ]
+    # each distinct requirement is stored once
+    assert len(frozen.requirements) == 4
+
+
+def test_frozen_resolve_errors(frozen):
+    with pytest.raises(LookupError, match="'nope' not found"):
+        frozen.resolve("nope")
+    with pytest.raises(TypeError):
+        frozen.resolve(1)
+
+
+def test_frozen_includes(frozen):
+    assert frozen.includes == {"test": ["runtime"], "lint": ["runtime"], "runtime": []}
+
+
+def test_frozen_round_trip(frozen, tmp_path):
+    path = tmp_path / "frozen.json"
+    frozen.dump(path)
+    loaded = FrozenDependencyGroups.load(path)
+    assert loaded == frozen
+    assert loaded.resolve("lint") == frozen.resolve("lint")
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        [],
+        {},
+        {"version": 99},
+        {"version": 1, "requirements": [], "groups": []},
+    ),
+)
+def test_frozen_load_invalid(tmp_path, data):
+    path = tmp_path / "frozen.json"
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError):
+        FrozenDependencyGroups.load(path)
+
+
+def test_frozen_invalid_table():
+    with pytest.raises(LookupError):
+        FrozenDependencyGroups.from_table({"a": [{"include-group": "b"}]})
+    with pytest.raises(ValueError, match="Cyclic"):
+        FrozenDependencyGroups.from_table({"a": [{"include-group": "a"}]})
+
+
+def test_frozen_check(frozen):
+    assert frozen.check(PYPROJECT)
+    # changes outside of the table do not make the artifact stale
+    assert frozen.check(PYPROJECT.replace(b"example", b"renamed"))
+    assert not frozen.check(PYPROJECT.replace(b"click", b"click>=8"))
+    assert not frozen.check(b"[dependency-groups")
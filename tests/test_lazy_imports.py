@@ -0,0 +1,76 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _imported_modules(code):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+@pytest.mark.parametrize(
+    "module",
+    (
+        "dependency_groups",
+        "dependency_groups.__main__",
+        "dependency_groups._lint_dependency_groups",
+        "dependency_groups._pip_wrapper",
+    ),
+)
+def test_cli_modules_do_not_import_packaging(module):
+    assert "packaging" not in _imported_modules(f"import {module}")
+
+
+def test_public_api_is_importable():
+    import dependency_groups
+
+    for name in dependency_groups.__all__:
+        assert getattr(dependency_groups, name) is not None
+    assert set(dependency_groups.__all__) <= set(dir(dependency_groups))
+    with pytest.raises(AttributeError):
+        dependency_groups.no_such_attribute
+
+
+@pytest.mark.parametrize("argv", (["--list"], ["test"]))
+def test_cli_runs_do_not_import_packaging(tmp_path, argv):
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text('[dependency-groups]\ntest = ["pytest"]\n')
+    # populate the cache, so that `test` can be resolved from it
+    subprocess.run(
+        [sys.executable, "-m", "dependency_groups", "-f", str(tomlfile), "test"],
+        check=True,
+        capture_output=True,
+    )
+
+    code = (
+        "from dependency_groups.__main__ import main; "
+        f"main(argv={['-f', str(tomlfile), *argv]!r})"
+    )
+    assert "packaging" not in _imported_modules(code)
+
+
+def test_frozen_loading_does_not_import_parsers(tmp_path):
+    from dependency_groups import FrozenDependencyGroups
+
+    frozen = FrozenDependencyGroups.from_table({"test": ["pytest"]})
+    path = tmp_path / "frozen.json"
+    frozen.dump(path)
+
+    code = (
+        "from dependency_groups import FrozenDependencyGroups; "
+        f"FrozenDependencyGroups.load({str(path)!r}).resolve('test')"
+    )
+    modules = _imported_modules(code)
+    assert "packaging" not in modules
+    assert "tomllib" not in modules
+    assert "tomli" not in modules
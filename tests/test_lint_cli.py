@@ -83,3 +83,98 @@ errors encountered while examining dependency groups:
 """
     )
     assert res.stderr == ""
+
+
+def test_lint_reports_each_cycle_once(run, tmp_path):
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text(
+        """\
+[dependency-groups]
+group1 = [{include-group = "group2"}]
+group2 = [{include-group = "group1"}]
+root = [{include-group = "group1"}]
+"""
+    )
+
+    res = run("-f", tomlfile)
+    assert res.code == 1
+    assert (
+        res.stdout
+        == """\
+errors encountered while examining dependency groups:
+  CyclicDependencyError: Cyclic dependency group include while resolving group1: \
+group1 -> group2, group2 -> group1
+"""
+    )
+
+
+@pytest.fixture
+def monorepo(tmp_path):
+    good = '[dependency-groups]\ntest = ["pytest"]\n'
+    bad = '[dependency-groups]\nfoo = [{include-group = "bar"}]\n'
+    layout = {
+        "pkg-a/pyproject.toml": good,
+        "pkg-b/pyproject.toml": bad,
+        "nested/pkg-c/pyproject.toml": good,
+        ".hidden/pyproject.toml": bad,
+    }
+    for path, content in layout.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    return tmp_path
+
+
+def test_lint_multiple_files(run, monorepo):
+    res = run(monorepo / "pkg-a/pyproject.toml", monorepo / "pkg-b")
+    assert res.code == 1
+    assert res.stdout == (
+        "errors encountered while examining dependency groups:\n"
+        f"  {monorepo / 'pkg-b/pyproject.toml'}:\n"
+        "    LookupError: Dependency group 'bar' not found\n"
+        "1 of 2 files had errors\n"
+    )
+
+
+def test_lint_multiple_files_ok(run, monorepo):
+    res = run("-f", monorepo / "pkg-a/pyproject.toml", monorepo / "nested/pkg-c")
+    assert res.code == 0
+    assert res.stdout == "ok (2 files)\n"
+
+
+def test_lint_recursive_skips_hidden_dirs(run, monorepo):
+    res = run("--recursive", monorepo)
+    assert res.code == 1
+    assert res.stdout.endswith("1 of 3 files had errors\n")
+    assert ".hidden" not in res.stdout
+
+
+def test_lint_glob(run, monorepo):
+    res = run(str(monorepo / "**/pkg-*"))
+    assert res.code == 1
+    assert res.stdout.endswith("1 of 3 files had errors\n")
+
+
+def test_lint_parallel_matches_serial(run, monorepo):
+    serial = run("-r", monorepo)
+    parallel = run("-r", "-j", "2", monorepo)
+    assert parallel == serial
+
+
+def test_lint_missing_file(run, tmp_path):
+    res = run("-f", tmp_path / "nonexistent.toml")
+    assert res.code == 1
+    assert "FileNotFoundError" in res.stdout
+
+
+def test_lint_invalid_toml(run, tmp_path):
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text("[dependency-groups\n")
+    res = run("-f", tomlfile)
+    assert res.code == 1
+    assert "TOMLDecodeError" in res.stdout
+
+
+def test_lint_no_files_found(run, tmp_path):
+    res = run(str(tmp_path / "*.toml"))
+    assert res.code == 3
+    assert res.stderr == "no pyproject.toml files found\n"
@@ -0,0 +1,94 @@
+import pytest
+
+from dependency_groups import _loader
+from dependency_groups._loader import scan_dependency_groups
+
+BIG_TOOL_TABLE = "".join(
+    f'[tool.example.section{i}]\nkey = "value"\n' for i in range(50)
+)
+
+
+@pytest.fixture
+def full_parses(monkeypatch):
+    calls = []
+    original = _loader.parse_dependency_groups
+
+    def parse(content):
+        calls.append(content)
+        return original(content)
+
+    monkeypatch.setattr(_loader, "parse_dependency_groups", parse)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "content",
+    (
+        # the table in the middle, at the end, and alone
+        '[project]\nname = "x"\n\n[dependency-groups]\ntest = ["pytest"]\n\n'
+        + BIG_TOOL_TABLE,
+        BIG_TOOL_TABLE + '\n[dependency-groups]  # groups\ntest = ["pytest"]\n',
+        (
+            '[dependency-groups]\ntest = [\n  "pytest",\n  {include-group = "a"},\n]\n'
+            'a = ["attrs"]\n'
+        ),
+        # CRLF line endings
+        '[dependency-groups]\r\ntest = ["pytest"]\r\n[tool.x]\r\ny = 1\r\n',
+    ),
+)
+def test_scan_parses_only_the_table(tmp_path, full_parses, content):
+    path = tmp_path / "pyproject.toml"
+    path.write_bytes(content.encode())
+    assert scan_dependency_groups(str(path)) == _loader.parse_dependency_groups(
+        content.encode()
+    )
+    assert len(full_parses) == 1
+
+
+@pytest.mark.parametrize(
+    "content",
+    (
+        # dotted keys and inline tables
+        'dependency-groups.test = ["pytest"]\n',
+        '[project]\nname = "x"\n[tool.x]\ny = 1\n',
+        'dependency-groups = {test = ["pytest"]}\n',
+        # a quoted header
+        '["dependency-groups"]\ntest = ["pytest"]\n',
+        # the name appears elsewhere
+        '[dependency-groups]\ntest = ["pytest"]\n[tool.x]\ndependency-groups = 1\n',
+        # a region which cannot be parsed on its own
+        '[dependency-groups]\ntest = [\n["pytest"]]\n',
+        # a header inside a multi-line string
+        (
+            '[project.readme]\ntext = """\n[dependency-groups]\ntest = ["pytest"]\n\n'
+            '[tool.x]\n"""\n'
+        ),
+        "[project]\ndescription = '''\n[dependency-groups]\ntest = []\n'''\n",
+    ),
+)
+def test_scan_falls_back_for_ambiguous_layouts(tmp_path, full_parses, content):
+    path = tmp_path / "pyproject.toml"
+    path.write_bytes(content.encode())
+    try:
+        expected = _loader.parse_dependency_groups(content.encode())
+    except ValueError:
+        with pytest.raises(ValueError):
+            scan_dependency_groups(str(path))
+    else:
+        assert scan_dependency_groups(str(path)) == expected
+    assert len(full_parses) == 2
+
+
+def test_scan_ignores_the_rest_of_the_file(tmp_path, full_parses):
+    path = tmp_path / "pyproject.toml"
+    path.write_bytes(b'[dependency-groups]\ntest = ["pytest"]\n[tool.x]\ny = \n')
+    assert scan_dependency_groups(str(path)) == {"test": ["pytest"]}
+    assert full_parses == []
+
+
+def test_scan_empty_and_missing_files(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_bytes(b"")
+    assert scan_dependency_groups(str(path)) == {}
+    with pytest.raises(FileNotFoundError):
+        scan_dependency_groups(str(tmp_path / "missing.toml"))
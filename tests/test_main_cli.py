@@ -0,0 +1,359 @@
+import dataclasses
+
+import pytest
+
+
+@dataclasses.dataclass
+class CLIResult:
+    code: int
+    stdout: str
+    stderr: str
+
+
+@pytest.fixture
+def run(capsys):
+    from dependency_groups.__main__ import main as cli_main
+
+    def _run(*argv):
+        try:
+            cli_main(argv=[str(arg) for arg in argv])
+            rc = 0
+        except SystemExit as e:
+            rc = e.code
+
+        stdio = capsys.readouterr()
+        return CLIResult(rc, stdio.out, stdio.err)
+
+    return _run
+
+
+@pytest.fixture
+def tomlfile(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        """\
+[dependency-groups]
+test = ["pytest", {include-group = "runtime"}]
+lint = ["flake8", {include-group = "runtime"}]
+Runtime = ["click"]
+"""
+    )
+    return path
+
+
+def test_list(run, tomlfile):
+    res = run("-f", tomlfile, "--list")
+    assert res.code == 0
+    assert res.stdout == "test lint Runtime\n"
+
+
+def test_resolve(run, tomlfile):
+    res = run("-f", tomlfile, "test")
+    assert res.code == 0
+    assert res.stdout == "pytest\nclick\n"
+
+
+def test_resolve_dedupe(run, tomlfile):
+    res = run("-f", tomlfile, "test", "lint", "--dedupe")
+    assert res.code == 0
+    assert res.stdout == "pytest\nclick\nflake8\n"
+
+
+def test_group_name_required(run, tomlfile):
+    res = run("-f", tomlfile)
+    assert res.code == 3
+    assert res.stderr == "A GROUP_NAME is required\n"
+
+
+def test_output_file(run, tomlfile, tmp_path):
+    outfile = tmp_path / "requirements.txt"
+    res = run("-f", tomlfile, "lint", "-o", outfile)
+    assert res.code == 0
+    assert res.stdout == ""
+    assert outfile.read_text() == "flake8\nclick\n"
+
+
+@pytest.mark.parametrize("cache_args", ([], ["--no-cache"]))
+@pytest.mark.parametrize(
+    "args, expect_output",
+    (
+        (["test"], "pytest\nclick\n"),
+        (["test", "lint"], "pytest\nclick\nflake8\nclick\n"),
+        (["test", "lint", "--dedupe"], "pytest\nclick\nflake8\n"),
+        (["test", "lint", "--merge"], "pytest\nclick\nflake8\n"),
+    ),
+)
+def test_output_with_and_without_cache(run, tomlfile, cache_args, args, expect_output):
+    res = run("-f", tomlfile, *cache_args, *args)
+    assert res.code == 0
+    assert res.stdout == expect_output
+
+
+def test_empty_group_output(run, tmp_path):
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text("[dependency-groups]\nempty = []\n")
+    res = run("-f", tomlfile, "--no-cache", "empty")
+    assert res.code == 0
+    assert res.stdout == "\n"
+
+
+def test_why(run, tomlfile):
+    res = run("why", "Click", "-f", tomlfile)
+    assert res.code == 0
+    assert res.stdout == (
+        "test: click (via test -> runtime)\n"
+        "lint: click (via lint -> runtime)\n"
+        "runtime: click\n"
+    )
+
+
+def test_why_not_found(run, tomlfile):
+    res = run("why", "requests", "-f", tomlfile)
+    assert res.code == 1
+    assert res.stdout == ""
+    assert "requests is not required by any dependency group" in res.stderr
+
+
+def test_why_reports_invalid_groups(run, tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        "[dependency-groups]\n"
+        'broken = [{include-group = "missing"}]\n'
+        'test = ["pytest"]\n'
+    )
+    res = run("why", "pytest", "-f", path)
+    assert res.code == 1
+    assert res.stdout == "test: pytest\n"
+    assert res.stderr == (
+        "errors encountered while examining dependency groups:\n"
+        "  LookupError: Dependency group 'missing' not found\n"
+    )
+
+
+def test_why_invalid_table(run, tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text("[project]\ndependency-groups = 1\n[dependency-groups]\na = 1\n")
+    res = run("why", "pytest", "-f", path)
+    assert res.code == 1
+    assert "errors encountered while examining dependency groups:" in res.stderr
+    assert "Traceback" not in res.stderr
+
+
+@pytest.mark.parametrize("name", ("why", "export", "daemon"))
+def test_group_named_like_subcommand(run, tmp_path, name):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(f'[dependency-groups]\n{name} = ["pytest"]\nother = ["attrs"]\n')
+    res = run("-f", path, "--", name)
+    assert res.code == 0
+    assert res.stdout == "pytest\n"
+    # subcommands are only recognized as the first argument
+    res = run("-f", path, name, "other")
+    assert res.code == 0
+    assert res.stdout == "pytest\nattrs\n"
+
+
+@pytest.fixture
+def structured_tomlfile(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        """\
+[dependency-groups]
+test = ["pytest>=7", {include-group = "runtime"}]
+runtime = ["attrs[tests]; python_version < '3.10'", "pytest>=7"]
+"""
+    )
+    return path
+
+
+def test_format_jsonl(run, structured_tomlfile):
+    import json
+
+    res = run("-f", structured_tomlfile, "test", "--format", "jsonl")
+    assert res.code == 0
+    records = [json.loads(line) for line in res.stdout.splitlines()]
+    assert records == [
+        {
+            "requirement": "pytest>=7",
+            "name": "pytest",
+            "extras": [],
+            "specifier": ">=7",
+            "marker": None,
+            "url": None,
+        },
+        {
+            "requirement": 'attrs[tests]; python_version < "3.10"',
+            "name": "attrs",
+            "extras": ["tests"],
+            "specifier": "",
+            "marker": 'python_version < "3.10"',
+            "url": None,
+        },
+        {
+            "requirement": "pytest>=7",
+            "name": "pytest",
+            "extras": [],
+            "specifier": ">=7",
+            "marker": None,
+            "url": None,
+        },
+    ]
+
+
+def test_format_json_with_source(run, structured_tomlfile):
+    import json
+
+    res = run(
+        "-f",
+        structured_tomlfile,
+        "test",
+        "--format",
+        "json",
+        "--with-source",
+        "--dedupe",
+    )
+    assert res.code == 0
+    records = json.loads(res.stdout)
+    assert [(r["name"], r["group"], r["path"]) for r in records] == [
+        ("pytest", "test", ["test"]),
+        ("attrs", "runtime", ["test", "runtime"]),
+    ]
+
+
+@pytest.mark.parametrize("fmt, expect", (("json", "[]\n"), ("jsonl", "")))
+def test_format_empty(run, tmp_path, fmt, expect):
+    path = tmp_path / "pyproject.toml"
+    path.write_text("[dependency-groups]\ntest = []\n")
+    res = run("-f", path, "test", "--format", fmt)
+    assert res.code == 0
+    assert res.stdout == expect
+
+
+def test_format_json_merge_and_filter(run, structured_tomlfile, tmp_path):
+    import json
+
+    envfile = tmp_path / "env.json"
+    envfile.write_text('{"python_version": "3.12"}')
+    res = run(
+        "-f",
+        structured_tomlfile,
+        "test",
+        "--format",
+        "json",
+        "--merge",
+        "--marker-environment",
+        envfile,
+    )
+    assert res.code == 0
+    assert [r["requirement"] for r in json.loads(res.stdout)] == ["pytest>=7"]
+
+
+@pytest.mark.parametrize(
+    "args",
+    (
+        ["--with-source"],
+        ["--format", "json", "--with-source", "--merge"],
+        ["--format", "jsonl", "--matrix", "matrix.json"],
+    ),
+)
+def test_format_usage_errors(run, structured_tomlfile, args):
+    res = run("-f", structured_tomlfile, "test", *args)
+    assert res.code == 2
+    assert "error:" in res.stderr
+
+
+def test_export(run, tomlfile, tmp_path):
+    from dependency_groups import FrozenDependencyGroups
+
+    output = tmp_path / "frozen.json"
+    res = run("export", "-f", tomlfile, "-o", output)
+    assert res.code == 0
+    frozen = FrozenDependencyGroups.load(output)
+    assert frozen.resolve("test") == ["pytest", "click"]
+
+    res = run("export", "-f", tomlfile, "-o", output, "--check")
+    assert res.code == 0
+
+    tomlfile.write_text(tomlfile.read_text().replace("click", "click>=8"))
+    res = run("export", "-f", tomlfile, "-o", output, "--check")
+    assert res.code == 1
+    assert res.stderr == f"{output} is out of date with {tomlfile}\n"
+
+
+def test_export_check_missing(run, tomlfile, tmp_path):
+    res = run("export", "-f", tomlfile, "-o", tmp_path / "missing.json", "--check")
+    assert res.code == 1
+    assert "could not be loaded" in res.stderr
+
+
+def test_export_invalid_table(run, tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text('[dependency-groups]\ntest = [{include-group = "nope"}]\n')
+    output = tmp_path / "frozen.json"
+    res = run("export", "-f", path, "-o", output)
+    assert res.code == 1
+    assert res.stderr == "LookupError: Dependency group 'nope' not found\n"
+    assert not output.exists()
+
+
+def test_list_json(run, tomlfile):
+    import json
+
+    expected = [
+        {"name": "test", "normalized": "test", "includes": ["runtime"]},
+        {"name": "lint", "normalized": "lint", "includes": ["runtime"]},
+        {"name": "Runtime", "normalized": "runtime", "includes": []},
+    ]
+    res = run("-f", tomlfile, "--list", "--format", "json")
+    assert res.code == 0
+    assert json.loads(res.stdout) == expected
+
+    res = run("-f", tomlfile, "--list", "--format", "jsonl")
+    assert res.code == 0
+    assert [json.loads(line) for line in res.stdout.splitlines()] == expected
+
+
+@pytest.mark.parametrize("output_format", ("requirements", "json"))
+def test_output_file_untouched_on_error(run, tmp_path, output_format):
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        '[dependency-groups]\ntest = ["pytest", {include-group = "missing"}]\n'
+    )
+    output = tmp_path / "out.txt"
+    output.write_text("previous\n")
+    with pytest.raises(LookupError):
+        run("-f", path, "-o", output, "test", "--format", output_format)
+    assert output.read_text() == "previous\n"
+    # the temporary file was removed
+    assert sorted(p.name for p in tmp_path.iterdir() if p.name != "cache") == [
+        "out.txt",
+        "pyproject.toml",
+    ]
+
+
+def test_output_file_keeps_mode(run, tomlfile, tmp_path):
+    import os
+    import stat
+
+    output = tmp_path / "out.txt"
+    output.write_text("previous\n")
+    os.chmod(output, 0o640)
+    res = run("-f", tomlfile, "-o", output, "test")
+    assert res.code == 0
+    assert output.read_text() == "pytest\nclick\n"
+    assert stat.S_IMODE(output.stat().st_mode) == 0o640
+
+
+def test_output_file_through_symlink(run, tomlfile, tmp_path):
+    import os
+
+    target = tmp_path / "real.txt"
+    target.write_text("old\n")
+    link = tmp_path / "link.txt"
+    try:
+        os.symlink(target, link)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks are not supported")
+    res = run("-f", tomlfile, "-o", link, "test")
+    assert res.code == 0
+    assert link.is_symlink()
+    assert target.read_text() == "pytest\nclick\n"
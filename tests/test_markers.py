@@ -0,0 +1,248 @@
+import json
+import unittest.mock
+
+import pytest
+from packaging.markers import Marker
+
+from dependency_groups import DependencyGroupResolver, resolve
+
+GROUPS = {
+    "test": [
+        "pytest",
+        "colorama; sys_platform == 'win32'",
+        "tomli; python_version < '3.11'",
+        {"include-group": "runtime"},
+    ],
+    "runtime": ["pywin32; sys_platform == 'win32'", "uvloop; sys_platform != 'win32'"],
+}
+
+WINDOWS_PY310 = {"sys_platform": "win32", "python_version": "3.10"}
+LINUX_PY312 = {"sys_platform": "linux", "python_version": "3.12"}
+
+
+def test_resolve_filters_by_environment():
+    resolver = DependencyGroupResolver(GROUPS)
+    windows = resolver.resolve("test", environment=WINDOWS_PY310)
+    assert [r.name for r in windows] == ["pytest", "colorama", "tomli", "pywin32"]
+    linux = resolver.resolve("test", environment=LINUX_PY312)
+    assert [r.name for r in linux] == ["pytest", "uvloop"]
+    # no environment means no filtering
+    assert len(resolver.resolve("test")) == 5
+
+
+def test_filtered_results_are_cached():
+    resolver = DependencyGroupResolver(GROUPS)
+    first = resolver.resolve("test", environment=WINDOWS_PY310)
+    assert resolver.resolve("test", environment=dict(WINDOWS_PY310)) is first
+
+
+def test_markers_are_evaluated_once_per_environment():
+    groups = {
+        "a": ["foo; sys_platform == 'win32'", {"include-group": "b"}],
+        "b": ["bar; sys_platform == 'win32'"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    real_evaluate = Marker.evaluate
+    with unittest.mock.patch.object(
+        Marker, "evaluate", autospec=True, side_effect=real_evaluate
+    ) as spy:
+        resolver.resolve("a", environment=LINUX_PY312)
+        resolver.resolve("b", environment=LINUX_PY312)
+        assert spy.call_count == 1
+        resolver.resolve("a", environment=WINDOWS_PY310)
+        assert spy.call_count == 2
+
+
+def test_iter_resolve_filters_by_environment():
+    resolver = DependencyGroupResolver(GROUPS)
+    streamed = resolver.iter_resolve("test", environment=LINUX_PY312)
+    assert [r.name for r in streamed] == ["pytest", "uvloop"]
+
+
+def test_resolve_func_with_environment():
+    assert resolve(GROUPS, "test", "runtime", dedupe=True, environment=LINUX_PY312) == (
+        "pytest",
+        'uvloop; sys_platform != "win32"',
+    )
+
+
+def test_empty_environment_uses_current_interpreter():
+    groups = {"test": ["always; python_version >= '3'", "never; python_version < '3'"]}
+    assert resolve(groups, "test", environment={}) == ('always; python_version >= "3"',)
+
+
+@pytest.mark.parametrize("cache_args", ([], ["--no-cache"]))
+def test_main_cli_marker_environment(tmp_path, capsys, cache_args):
+    from dependency_groups.__main__ import main
+
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text(
+        """\
+[dependency-groups]
+test = ["pytest", "colorama; sys_platform == 'win32'"]
+"""
+    )
+    envfile = tmp_path / "env.json"
+    envfile.write_text(json.dumps({"sys_platform": "linux"}))
+
+    main(argv=["-f", str(tomlfile), *cache_args, "test"])
+    assert capsys.readouterr().out == 'pytest\ncolorama; sys_platform == "win32"\n'
+    main(
+        argv=[
+            "-f",
+            str(tomlfile),
+            *cache_args,
+            "--marker-environment",
+            str(envfile),
+            "test",
+        ]
+    )
+    assert capsys.readouterr().out == "pytest\n"
+
+
+@pytest.mark.parametrize("content", ("[]", '{"sys_platform": 1}', "{nope"))
+def test_main_cli_bad_marker_environment(tmp_path, capsys, content):
+    from dependency_groups.__main__ import main
+
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text("[dependency-groups]\ntest = []\n")
+    envfile = tmp_path / "env.json"
+    envfile.write_text(content)
+    with pytest.raises(SystemExit) as excinfo:
+        main(argv=["-f", str(tomlfile), "--marker-environment", str(envfile), "test"])
+    assert excinfo.value.code == 2
+    assert "Usage error" in capsys.readouterr().err
+
+
+def test_pip_wrapper_filter_markers(tmp_path, monkeypatch):
+    from dependency_groups._pip_wrapper import main
+
+    pip_calls = []
+    monkeypatch.setattr(
+        "dependency_groups._pip_wrapper._invoke_pip",
+        lambda deps: pip_calls.append(deps),
+    )
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text(
+        """\
+[dependency-groups]
+test = ["pytest", "oldlib; python_version < '3'"]
+"""
+    )
+    main(argv=["-f", str(tomlfile), "--filter-markers", "test"])
+    assert pip_calls == [["pytest"]]
+
+
+def test_pip_wrapper_marker_options_are_exclusive(tmp_path, capsys):
+    from dependency_groups._pip_wrapper import main
+
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text("[dependency-groups]\ntest = []\n")
+    envfile = tmp_path / "env.json"
+    envfile.write_text(json.dumps(LINUX_PY312))
+    with pytest.raises(SystemExit) as excinfo:
+        main(
+            argv=[
+                "-f",
+                str(tomlfile),
+                "--filter-markers",
+                "--marker-environment",
+                str(envfile),
+                "test",
+            ]
+        )
+    assert excinfo.value.code == 2
+    assert "not allowed with" in capsys.readouterr().err
+
+
+MATRIX = {
+    "windows-py310": WINDOWS_PY310,
+    "linux-py310": {"sys_platform": "linux", "python_version": "3.10"},
+    "linux-py312": LINUX_PY312,
+}
+
+
+def test_resolve_matrix():
+    resolver = DependencyGroupResolver(GROUPS)
+    result = resolver.resolve_matrix("test", environments=MATRIX)
+    assert {name: [r.name for r in reqs] for name, reqs in result.items()} == {
+        "windows-py310": ["pytest", "colorama", "tomli", "pywin32"],
+        "linux-py310": ["pytest", "tomli", "uvloop"],
+        "linux-py312": ["pytest", "uvloop"],
+    }
+    for name, environment in MATRIX.items():
+        assert result[name] == resolver.resolve("test", environment=environment)
+
+
+def test_resolve_matrix_evaluates_each_marker_once_per_environment():
+    groups = {
+        "a": [
+            "foo; sys_platform == 'win32'",
+            "bar; sys_platform == 'win32'",
+            "baz",
+            {"include-group": "b"},
+        ],
+        "b": ["foo; sys_platform == 'win32'"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    real_evaluate = Marker.evaluate
+    with unittest.mock.patch.object(
+        Marker, "evaluate", autospec=True, side_effect=real_evaluate
+    ) as spy:
+        result = resolver.resolve_matrix("a", "b", environments=MATRIX)
+    assert spy.call_count == len(MATRIX)
+    assert len(result["windows-py310"]) == 5
+    assert [r.name for r in result["linux-py312"]] == ["baz"]
+
+
+def test_resolve_matrix_dedupe():
+    resolver = DependencyGroupResolver(GROUPS)
+    result = resolver.resolve_matrix(
+        "test", "runtime", environments=MATRIX, dedupe=True
+    )
+    assert [r.name for r in result["linux-py312"]] == ["pytest", "uvloop"]
+
+
+def test_resolve_matrix_rejects_non_mapping():
+    resolver = DependencyGroupResolver(GROUPS)
+    with pytest.raises(TypeError):
+        resolver.resolve_matrix("test", environments=[WINDOWS_PY310])
+
+
+def test_main_cli_matrix(tmp_path, capsys):
+    from dependency_groups.__main__ import main
+
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text(
+        """\
+[dependency-groups]
+test = ["pytest", "colorama; sys_platform == 'win32'"]
+"""
+    )
+    matrixfile = tmp_path / "matrix.json"
+    matrixfile.write_text(
+        json.dumps(
+            {"win": {"sys_platform": "win32"}, "linux": {"sys_platform": "linux"}}
+        )
+    )
+    main(argv=["-f", str(tomlfile), "--matrix", str(matrixfile), "test"])
+    assert json.loads(capsys.readouterr().out) == {
+        "win": ["pytest", 'colorama; sys_platform == "win32"'],
+        "linux": ["pytest"],
+    }
+
+
+@pytest.mark.parametrize(
+    "content", ('{"win": []}', '{"win": {"sys_platform": 3}}', "[]")
+)
+def test_main_cli_bad_matrix(tmp_path, capsys, content):
+    from dependency_groups.__main__ import main
+
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text("[dependency-groups]\ntest = []\n")
+    matrixfile = tmp_path / "matrix.json"
+    matrixfile.write_text(content)
+    with pytest.raises(SystemExit) as excinfo:
+        main(argv=["-f", str(tomlfile), "--matrix", str(matrixfile), "test"])
+    assert excinfo.value.code == 2
+    assert "Usage error" in capsys.readouterr().err
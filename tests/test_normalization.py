@@ -0,0 +1,66 @@
+import re
+
+import pytest
+
+from dependency_groups import DependencyGroupResolver
+from dependency_groups._normalization import _group_name_aliases, _normalize_name
+
+
+@pytest.mark.parametrize(
+    "name",
+    (
+        "test",
+        "Test",
+        "typing-extensions",
+        "Typing_Extensions",
+        "a--b",
+        "a-_.b",
+        "a.b",
+        "123",
+        "-leading",
+        "trailing_",
+        "Straße",
+        "ǅungla",
+    ),
+)
+def test_normalize_name_matches_reference(name):
+    assert _normalize_name(name) == re.sub(r"[-_.]+", "-", name).lower()
+
+
+@pytest.mark.parametrize("name", (1, b"test", None))
+def test_normalize_name_rejects_non_strings(name):
+    with pytest.raises(TypeError):
+        _normalize_name(name)
+    with pytest.raises(TypeError):
+        DependencyGroupResolver({name: ["attrs"]})
+
+
+def test_normalize_name_is_memoized():
+    _normalize_name.cache_clear()
+    _normalize_name("Some_Group")
+    _normalize_name("Some_Group")
+    info = _normalize_name.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_group_name_aliases():
+    assert _group_name_aliases({"Test_Group": [], "docs": []}) == {
+        "Test_Group": "test-group",
+        "test-group": "test-group",
+        "docs": "docs",
+    }
+
+
+def test_resolver_accepts_any_spelling():
+    resolver = DependencyGroupResolver({"Test_Group": ["pytest"]})
+    expected = resolver.resolve("test-group")
+    for spelling in ("Test_Group", "TEST.GROUP", "test__group"):
+        assert resolver.resolve(spelling) is expected
+
+
+def test_update_rebuilds_aliases():
+    resolver = DependencyGroupResolver({"Old_Name": ["pytest"]})
+    resolver.update({"New_Name": ["pytest"]})
+    assert resolver._aliases == {"New_Name": "new-name", "new-name": "new-name"}
+    with pytest.raises(LookupError):
+        resolver.resolve("Old_Name")
@@ -0,0 +1,259 @@
+import dataclasses
+
+import pytest
+
+
+@dataclasses.dataclass
+class CLIResult:
+    code: int
+    stdout: str
+    stderr: str
+
+
+@pytest.fixture
+def pip_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        "dependency_groups._pip_wrapper._invoke_pip", lambda deps: calls.append(deps)
+    )
+    return calls
+
+
+@pytest.fixture
+def run(capsys, pip_calls):
+    from dependency_groups._pip_wrapper import main as cli_main
+
+    def _run(*argv):
+        try:
+            cli_main(argv=[str(arg) for arg in argv])
+            rc = 0
+        except SystemExit as e:
+            rc = e.code
+
+        stdio = capsys.readouterr()
+        return CLIResult(rc, stdio.out, stdio.err)
+
+    return _run
+
+
+def test_install_dedupes_across_groups(run, pip_calls, tmp_path):
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text(
+        """\
+[dependency-groups]
+test = ["pytest", {include-group = "runtime"}]
+lint = ["flake8", {include-group = "runtime"}]
+runtime = ["click"]
+"""
+    )
+
+    res = run("-f", tomlfile, "test", "lint")
+    assert res.code == 0
+    assert pip_calls == [["pytest", "click", "flake8"]]
+
+
+def test_install_reports_all_group_errors(run, pip_calls, tmp_path):
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text(
+        """\
+[dependency-groups]
+test = ["pytest"]
+"""
+    )
+
+    res = run("-f", tomlfile, "nope1", "test", "nope2")
+    assert res.code == 1
+    assert (
+        res.stdout
+        == """\
+errors encountered while examining dependency groups:
+  LookupError: Dependency group 'nope1' not found
+  LookupError: Dependency group 'nope2' not found
+"""
+    )
+    assert pip_calls == []
+
+
+class FakeDistribution:
+    def __init__(self, name, version) -> None:
+        self.metadata = {"Name": name}
+        self.version = version
+
+
+def test_installed_versions():
+    from dependency_groups._satisfied import installed_versions
+
+    assert installed_versions(
+        [
+            FakeDistribution("Typing_Extensions", "4.0"),
+            FakeDistribution("typing-extensions", "3.0"),
+            FakeDistribution(None, "1.0"),
+        ]
+    ) == {"typing-extensions": "4.0"}
+    # the default scans the current environment
+    assert "pytest" in installed_versions()
+
+
+@pytest.mark.parametrize(
+    "requirement, satisfied",
+    (
+        ("attrs", True),
+        ("attrs>=22", True),
+        ("attrs<22", False),
+        ("Typing_Extensions~=4.0", True),
+        ("missing", False),
+        ("attrs[tests]", False),
+        ("attrs @ https://example.com/attrs.whl", False),
+        ("prerelease>=1.0", True),
+        ("badversion", False),
+        ("missing; python_version < '3'", True),
+        ("attrs<22; python_version >= '3'", False),
+    ),
+)
+def test_unsatisfied_requirements(requirement, satisfied):
+    from dependency_groups._satisfied import unsatisfied_requirements
+
+    installed = {
+        "attrs": "23.1.0",
+        "typing-extensions": "4.7.1",
+        "prerelease": "2.0rc1",
+        "badversion": "not a version",
+    }
+    result = unsatisfied_requirements([requirement], installed)
+    assert result == ([] if satisfied else [requirement])
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    versions = {"pytest": "8.0.0", "click": "7.0"}
+    monkeypatch.setattr(
+        "dependency_groups._satisfied.installed_versions", lambda: versions
+    )
+    return versions
+
+
+def test_skip_satisfied_keeps_satisfied_constraints(
+    run, pip_calls, installed, tmp_path
+):
+    # "click<8" is satisfied, but must still be passed to pip, in case one of the
+    # other requirements would otherwise upgrade click
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text(
+        '[dependency-groups]\ntest = ["pytest>=7", "click<8", "flake8"]\n'
+    )
+    res = run("-f", tomlfile, "test", "--skip-satisfied")
+    assert res.code == 0
+    assert pip_calls == [["pytest>=7", "click<8", "flake8"]]
+
+
+def test_skip_satisfied_skips_pip(run, pip_calls, installed, tmp_path):
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text('[dependency-groups]\ntest = ["pytest>=7", "click"]\n')
+    res = run("-f", tomlfile, "test", "--skip-satisfied")
+    assert res.code == 0
+    assert res.stdout == "all requirements are already satisfied\n"
+    assert pip_calls == []
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    import subprocess
+
+    calls = []
+
+    def fake_run(command, **kwargs):
+        calls.append(command)
+        output = "ok\n" if kwargs.get("stdout") == subprocess.PIPE else None
+        returncode = 3 if "broken-python" in command else 0
+        return subprocess.CompletedProcess(command, returncode, output)
+
+    monkeypatch.setattr("dependency_groups._installers.subprocess.run", fake_run)
+    return calls
+
+
+@pytest.fixture
+def tomlfile(tmp_path):
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text('[dependency-groups]\ntest = ["pytest", "click"]\n')
+    return tomlfile
+
+
+def test_uv_installer(run, pip_calls, commands, tomlfile):
+    import sys
+
+    res = run("-f", tomlfile, "test", "--installer", "uv")
+    assert res.code == 0
+    assert commands == [
+        ["uv", "pip", "install", "--python", sys.executable, "pytest", "click"]
+    ]
+    assert pip_calls == []
+
+
+def test_install_into_many_pythons(run, commands, tomlfile):
+    res = run(
+        "-f", tomlfile, "test", "--python", "py1", "--python", "py2", "--python", "py1"
+    )
+    assert res.code == 0
+    assert sorted(commands) == [
+        ["py1", "-m", "pip", "install", "pytest", "click"],
+        ["py2", "-m", "pip", "install", "pytest", "click"],
+    ]
+    # output is grouped by target, in the order given
+    assert res.stdout == "==> py1\nok\n==> py2\nok\n"
+
+
+def test_install_aggregates_failures(run, commands, tomlfile):
+    res = run(
+        "-f",
+        tomlfile,
+        "test",
+        "-j",
+        "1",
+        "--installer",
+        "uv",
+        "--python",
+        "broken-python",
+        "--python",
+        "py2",
+    )
+    assert res.code == 3
+    assert len(commands) == 2
+    assert res.stderr == "uv failed for broken-python (exit status 3)\n"
+
+
+def test_install_reports_missing_installer(run, tomlfile, tmp_path):
+    missing = str(tmp_path / "no-such-python")
+    res = run("-f", tomlfile, "test", "--python", missing)
+    assert res.code == 1
+    assert res.stderr.startswith(f"could not run {missing}: ")
+    assert res.stderr.endswith(f"pip failed for {missing} (exit status 1)\n")
+
+
+@pytest.mark.parametrize("output", ("-", "file"))
+def test_requirements_file_installer(run, pip_calls, tomlfile, tmp_path, output):
+    argv = ["-f", tomlfile, "test", "--installer", "requirements-file"]
+    if output == "file":
+        argv += ["-o", tmp_path / "requirements.txt"]
+    res = run(*argv)
+    assert res.code == 0
+    assert pip_calls == []
+    if output == "file":
+        assert res.stdout == ""
+        assert (tmp_path / "requirements.txt").read_text() == "pytest\nclick\n"
+    else:
+        assert res.stdout == "pytest\nclick\n"
+
+
+@pytest.mark.parametrize(
+    "argv, message",
+    (
+        (["--installer", "requirements-file", "--python", "py"], "--python cannot"),
+        (["-o", "out.txt"], "--output can only"),
+        (["--skip-satisfied", "--python", "py"], "--skip-satisfied cannot"),
+        (["-j", "-1"], "--jobs must not"),
+    ),
+)
+def test_installer_usage_errors(run, tomlfile, argv, message):
+    res = run("-f", tomlfile, "test", *argv)
+    assert res.code == 2
+    assert message in res.stderr
@@ -0,0 +1,104 @@
+import pytest
+from packaging.requirements import InvalidRequirement
+
+from dependency_groups import (
+    DEFAULT_REQUIREMENT_CACHE,
+    DependencyGroupResolver,
+    RequirementCache,
+)
+
+
+def test_cache_hits_and_misses():
+    cache = RequirementCache()
+    first = cache.get("pytest>=8")
+    second = cache.get("pytest>=8")
+    assert first is second
+    assert first.name == "pytest"
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RequirementCache(maxsize=2)
+    a = cache.get("a")
+    cache.get("b")
+    # touch `a` so that `b` is the least recently used
+    cache.get("a")
+    cache.get("c")
+
+    assert cache.info().currsize == 2
+    assert cache.get("a") is a
+    assert cache.info().misses == 3
+    cache.get("b")
+    assert cache.info().misses == 4
+
+
+def test_cache_shrinking_maxsize_evicts():
+    cache = RequirementCache(maxsize=3)
+    for name in ("a", "b", "c"):
+        cache.get(name)
+    cache.maxsize = 1
+    assert cache.info() == (0, 3, 1, 1)
+
+
+def test_cache_zero_size_disables_caching():
+    cache = RequirementCache(maxsize=0)
+    assert cache.get("a") is not cache.get("a")
+    assert cache.info() == (0, 2, 0, 0)
+
+
+def test_cache_clear_resets_stats():
+    cache = RequirementCache()
+    cache.get("a")
+    cache.get("a")
+    cache.clear()
+    assert cache.info() == (0, 0, 4096, 0)
+
+
+def test_cache_rejects_negative_size():
+    with pytest.raises(ValueError):
+        RequirementCache(maxsize=-1)
+    cache = RequirementCache()
+    with pytest.raises(ValueError):
+        cache.maxsize = -1
+
+
+def test_cache_does_not_store_invalid_requirements():
+    cache = RequirementCache()
+    with pytest.raises(InvalidRequirement):
+        cache.get("not a requirement!")
+    assert cache.info().currsize == 0
+
+
+def test_resolvers_share_the_default_cache():
+    groups = {"test": ["pytest", "coverage[toml]"]}
+    first = DependencyGroupResolver(groups).resolve("test")
+    second = DependencyGroupResolver(groups).resolve("test")
+    assert all(a is b for a, b in zip(first, second))
+    assert DEFAULT_REQUIREMENT_CACHE.info().currsize >= 2
+
+
+def test_resolver_with_custom_cache():
+    cache = RequirementCache()
+    groups = {"test": ["pytest", {"include-group": "runtime"}], "runtime": ["pytest"]}
+    resolver = DependencyGroupResolver(groups, requirement_cache=cache)
+    resolved = resolver.resolve("test")
+    assert resolved[0] is resolved[1]
+    assert cache.info() == (1, 1, 4096, 1)
+
+
+def test_resolver_can_opt_out_of_caching():
+    groups = {"test": ["pytest"], "other": ["pytest"]}
+    resolver = DependencyGroupResolver(groups, requirement_cache=None)
+    assert resolver.resolve("test")[0] is not resolver.resolve("other")[0]
+
+
+def test_uncached_resolver_returns_unshared_requirements():
+    from dependency_groups import DependencyGroupResolver
+
+    groups = {"a": ["foo>=1"]}
+    shared = DependencyGroupResolver(groups).resolve("a")[0]
+    private = DependencyGroupResolver(groups, requirement_cache=None).resolve("a")[0]
+    assert private is not shared
+    assert DependencyGroupResolver(groups).resolve("a")[0] is shared
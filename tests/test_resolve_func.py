@@ -161,3 +161,72 @@ def test_unknown_object_shape(item):
     groups = {"test": [item]}
     with pytest.raises(ValueError, match="Invalid dependency group item:"):
         resolve(groups, "test")
+
+
+DIAMOND_GROUPS = {
+    "dev": [{"include-group": "test"}, {"include-group": "lint"}],
+    "test": ["pytest", "attrs[tests]", {"include-group": "runtime"}],
+    "lint": ["flake8", "attrs>=22", {"include-group": "runtime"}],
+    "runtime": ["attrs", "click>=8", "click<9"],
+}
+
+
+def test_diamond_include_duplicates_by_default():
+    assert resolve(DIAMOND_GROUPS, "dev") == (
+        "pytest",
+        "attrs[tests]",
+        "attrs",
+        "click>=8",
+        "click<9",
+        "flake8",
+        "attrs>=22",
+        "attrs",
+        "click>=8",
+        "click<9",
+    )
+
+
+def test_dedupe_preserves_order():
+    assert resolve(DIAMOND_GROUPS, "dev", dedupe=True) == (
+        "pytest",
+        "attrs[tests]",
+        "attrs",
+        "click>=8",
+        "click<9",
+        "flake8",
+        "attrs>=22",
+    )
+
+
+def test_dedupe_across_groups():
+    assert resolve(DIAMOND_GROUPS, "test", "lint", dedupe=True) == resolve(
+        DIAMOND_GROUPS, "dev", dedupe=True
+    )
+
+
+def test_merge_combines_extras_and_specifiers():
+    assert resolve(DIAMOND_GROUPS, "dev", merge=True) == (
+        "pytest",
+        "attrs[tests]>=22",
+        "click<9,>=8",
+        "flake8",
+    )
+
+
+def test_merge_uses_normalized_names():
+    groups = {"test": ["Foo_Bar>=1", "foo-bar[x]"]}
+    assert resolve(groups, "test", merge=True) == ("Foo_Bar[x]>=1",)
+
+
+def test_merge_keeps_distinct_markers_separate():
+    groups = {
+        "test": [
+            "foo>=1; python_version < '3.10'",
+            "foo>=2; python_version >= '3.10'",
+            "foo<3; python_version >= '3.10'",
+        ]
+    }
+    assert resolve(groups, "test", merge=True) == (
+        'foo>=1; python_version < "3.10"',
+        'foo<3,>=2; python_version >= "3.10"',
+    )
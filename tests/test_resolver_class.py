@@ -1,9 +1,14 @@
+import sys
 import unittest.mock
 
 import pytest
 from packaging.requirements import Requirement
 
-from dependency_groups import DependencyGroupInclude, DependencyGroupResolver
+from dependency_groups import (
+    CyclicDependencyError,
+    DependencyGroupInclude,
+    DependencyGroupResolver,
+)
 
 
 def test_resolver_init_handles_bad_type():
@@ -80,21 +85,62 @@ def test_expand_contract_model_only_does_inner_lookup_once():
     }
     resolver = DependencyGroupResolver(groups)
 
-    real_inner_resolve = resolver._resolve
+    real_parse_group = resolver._parse_group
     with unittest.mock.patch(
-        "dependency_groups.DependencyGroupResolver._resolve",
-        side_effect=real_inner_resolve,
+        "dependency_groups.DependencyGroupResolver._parse_group",
+        side_effect=real_parse_group,
     ) as spy:
         resolved = resolver.resolve("root")
         assert len(resolved) == 4
         assert all(item.name == "attrs" for item in resolved)
 
-        # each of the `mid` nodes will call resolution with `contract`, but only the
-        # first of those evaluations should call for resolution of `leaf` -- after that,
-        # `contract` will be in the cache and `leaf` will not need to be resolved
-        spy.assert_any_call("leaf", "root")
+        # each of the `mid` nodes will include `contract`, but only the first of
+        # those evaluations should walk into `leaf` -- after that, `contract` will be
+        # in the cache and `leaf` will not need to be visited
+        spy.assert_any_call("leaf")
         leaf_calls = [c for c in spy.mock_calls if c.args[0] == "leaf"]
         assert len(leaf_calls) == 1
+        contract_calls = [c for c in spy.mock_calls if c.args[0] == "contract"]
+        assert len(contract_calls) == 1
+
+
+def test_deep_include_chain_does_not_recurse():
+    depth = sys.getrecursionlimit() * 2
+    groups = {f"group{i}": [{"include-group": f"group{i+1}"}] for i in range(depth)}
+    groups[f"group{depth}"] = ["attrs"]
+    resolver = DependencyGroupResolver(groups)
+
+    resolved = resolver.resolve("group0")
+    assert len(resolved) == 1
+    assert resolved[0].name == "attrs"
+    # every group on the chain is now cached
+    assert len(resolver._resolve_cache) == depth + 1
+
+
+def test_deep_include_chain_cycle_detected():
+    depth = sys.getrecursionlimit() * 2
+    groups = {f"group{i}": [{"include-group": f"group{i+1}"}] for i in range(depth)}
+    groups[f"group{depth}"] = [{"include-group": "group1"}]
+    resolver = DependencyGroupResolver(groups)
+
+    with pytest.raises(CyclicDependencyError) as excinfo:
+        resolver.resolve("group0")
+    assert excinfo.value.requested_group == "group0"
+    assert excinfo.value.group == f"group{depth}"
+    assert excinfo.value.include_group == "group1"
+
+
+def test_resolution_after_cycle_error_is_unaffected():
+    groups = {
+        "bad": [{"include-group": "loop"}],
+        "loop": [{"include-group": "bad"}],
+        "good": ["attrs", {"include-group": "leaf"}],
+        "leaf": ["click"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    with pytest.raises(CyclicDependencyError):
+        resolver.resolve("bad")
+    assert [r.name for r in resolver.resolve("good")] == ["attrs", "click"]
 
 
 def test_no_double_parse():
@@ -127,3 +173,409 @@ def test_no_double_parse():
         assert len(deceived_parse) == 1
         assert isinstance(deceived_parse[0], DependencyGroupInclude)
         assert deceived_parse[0].include_group == "perfidy"
+
+
+def test_compile_fills_cache_for_all_groups():
+    groups = {
+        "dev": [{"include-group": "test"}, {"include-group": "lint"}],
+        "test": ["pytest", {"include-group": "runtime"}],
+        "lint": ["flake8", {"include-group": "runtime"}],
+        "runtime": ["click"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    assert resolver.compile() == []
+    assert set(resolver._resolve_cache) == {"dev", "test", "lint", "runtime"}
+    assert [r.name for r in resolver._resolve_cache["dev"]] == [
+        "pytest",
+        "click",
+        "flake8",
+        "click",
+    ]
+    # the results agree with lazy resolution
+    fresh_resolver = DependencyGroupResolver(groups)
+    for group in groups:
+        assert resolver.resolve(group) == fresh_resolver.resolve(group)
+
+
+def test_compile_reports_every_cycle_once():
+    groups = {
+        "a": [{"include-group": "b"}],
+        "b": [{"include-group": "a"}],
+        "self": [{"include-group": "self"}],
+        "ring0": [{"include-group": "ring1"}],
+        "ring1": [{"include-group": "ring2"}],
+        "ring2": [{"include-group": "ring0"}],
+        "above": ["attrs", {"include-group": "a"}],
+        "ok": ["click"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    errors = resolver.compile()
+
+    assert all(isinstance(e, CyclicDependencyError) for e in errors)
+    assert sorted(str(e) for e in errors) == [
+        "Cyclic dependency group include while resolving a: a -> b, b -> a",
+        (
+            "Cyclic dependency group include while resolving ring0: "
+            "ring0 -> ring2, ring2 -> ring0"
+        ),
+        "Cyclic dependency group include while resolving self: self includes itself",
+    ]
+    # only the valid group is resolved
+    assert set(resolver._resolve_cache) == {"ok"}
+
+
+def test_compile_collects_parse_and_lookup_errors():
+    groups = {
+        "bad-item": [{"badkey": "value"}],
+        "not-a-list": "pytest",
+        "missing": [{"include-group": "nonexistent"}],
+        "also-missing": [{"include-group": "nonexistent"}],
+        "includes-bad": [{"include-group": "bad-item"}],
+        "ok": ["click"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    errors = resolver.compile()
+    assert [(type(e), str(e)) for e in errors] == [
+        (ValueError, "Invalid dependency group item: {'badkey': 'value'}"),
+        (TypeError, "Dependency group 'not-a-list' is not a list"),
+        (LookupError, "Dependency group 'nonexistent' not found"),
+    ]
+    assert set(resolver._resolve_cache) == {"ok"}
+
+
+def test_compile_handles_deep_chains():
+    depth = sys.getrecursionlimit() * 2
+    groups = {f"group{i}": [{"include-group": f"group{i+1}"}] for i in range(depth)}
+    groups[f"group{depth}"] = ["attrs"]
+    resolver = DependencyGroupResolver(groups)
+    assert resolver.compile() == []
+    assert len(resolver._resolve_cache) == depth + 1
+
+
+def test_resolve_all():
+    groups = {
+        "test": ["pytest", {"include-group": "runtime"}],
+        "Runtime": ["click"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    resolved = resolver.resolve_all()
+    assert {k: [r.name for r in v] for k, v in resolved.items()} == {
+        "test": ["pytest", "click"],
+        "runtime": ["click"],
+    }
+
+
+def test_resolve_all_raises_first_error():
+    groups = {
+        "group1": [{"include-group": "group2"}],
+        "group2": [{"include-group": "group1"}],
+    }
+    resolver = DependencyGroupResolver(groups)
+    with pytest.raises(CyclicDependencyError, match="while resolving group1"):
+        resolver.resolve_all()
+
+
+def test_dedupe_result_is_cached_per_group():
+    groups = {
+        "test": ["pytest", {"include-group": "runtime"}, {"include-group": "runtime"}],
+        "runtime": ["click"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    deduped = resolver.resolve("test", dedupe=True)
+    assert [r.name for r in deduped] == ["pytest", "click"]
+    assert resolver.resolve("Test", dedupe=True) is deduped
+    # the undeduplicated form is unaffected
+    assert [r.name for r in resolver.resolve("test")] == ["pytest", "click", "click"]
+
+
+def test_merge_does_not_modify_shared_requirements():
+    groups = {"test": ["attrs[tests]", "attrs>=22"]}
+    resolver = DependencyGroupResolver(groups)
+    (merged,) = resolver.resolve("test", merge=True)
+    assert str(merged) == "attrs[tests]>=22"
+    assert [str(r) for r in resolver.resolve("test")] == ["attrs[tests]", "attrs>=22"]
+
+
+def test_resolve_many():
+    groups = {
+        "test": ["pytest", {"include-group": "runtime"}],
+        "lint": ["flake8", {"include-group": "runtime"}],
+        "runtime": ["click"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    resolution = resolver.resolve_many("Test", "lint", "test")
+
+    assert list(resolution.groups) == ["test", "lint"]
+    assert resolution.groups["test"] is resolver.resolve("test")
+    assert [r.name for r in resolution.groups["lint"]] == ["flake8", "click"]
+    assert [r.name for r in resolution.requirements] == [
+        "pytest",
+        "click",
+        "flake8",
+        "click",
+        "pytest",
+        "click",
+    ]
+
+
+def test_resolve_many_dedupe():
+    groups = {
+        "test": ["pytest", {"include-group": "runtime"}, {"include-group": "runtime"}],
+        "lint": ["flake8", {"include-group": "runtime"}],
+        "runtime": ["click"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    resolution = resolver.resolve_many("test", "lint", dedupe=True)
+    assert [r.name for r in resolution.groups["test"]] == ["pytest", "click"]
+    assert [r.name for r in resolution.groups["lint"]] == ["flake8", "click"]
+    assert [r.name for r in resolution.requirements] == ["pytest", "click", "flake8"]
+
+
+def test_resolve_many_shares_work():
+    groups = {
+        "test": [{"include-group": "runtime"}],
+        "lint": [{"include-group": "runtime"}],
+        "runtime": ["click"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    real_parse_group = resolver._parse_group
+    with unittest.mock.patch(
+        "dependency_groups.DependencyGroupResolver._parse_group",
+        side_effect=real_parse_group,
+    ) as spy:
+        resolver.resolve_many("test", "lint")
+    runtime_calls = [c for c in spy.mock_calls if c.args[0] == "runtime"]
+    assert len(runtime_calls) == 1
+
+
+def test_resolve_many_catches_bad_type():
+    resolver = DependencyGroupResolver({"test": ["pytest"]})
+    with pytest.raises(TypeError):
+        resolver.resolve_many("test", 0)
+
+
+def test_iter_resolve_matches_resolve():
+    groups = {
+        "dev": [{"include-group": "test"}, "tox", {"include-group": "test"}],
+        "test": ["pytest", {"include-group": "runtime"}],
+        "runtime": ["click"],
+    }
+    resolver = DependencyGroupResolver(groups)
+    streamed = list(resolver.iter_resolve("Dev"))
+    # streaming does not populate the cache
+    assert resolver._resolve_cache == {}
+    assert streamed == list(resolver.resolve("dev"))
+
+    # once cached, the cached results are used
+    assert list(resolver.iter_resolve("dev")) == streamed
+
+
+def test_iter_resolve_is_lazy():
+    groups = {
+        "test": ["pytest", {"include-group": "missing"}],
+    }
+    resolver = DependencyGroupResolver(groups)
+    iterator = resolver.iter_resolve("test")
+    assert next(iterator).name == "pytest"
+    with pytest.raises(LookupError):
+        next(iterator)
+
+
+def test_iter_resolve_checks_type_eagerly():
+    resolver = DependencyGroupResolver({"test": ["pytest"]})
+    with pytest.raises(TypeError):
+        resolver.iter_resolve(0)
+
+
+def test_iter_resolve_detects_cycles():
+    groups = {
+        "root": ["attrs", {"include-group": "group1"}],
+        "group1": [{"include-group": "group2"}],
+        "group2": [{"include-group": "group1"}],
+    }
+    resolver = DependencyGroupResolver(groups)
+    with pytest.raises(CyclicDependencyError) as excinfo:
+        list(resolver.iter_resolve("root"))
+    assert str(excinfo.value) == (
+        "Cyclic dependency group include while resolving root: "
+        "group1 -> group2, group2 -> group1"
+    )
+
+
+def test_iter_resolve_deep_chain():
+    depth = sys.getrecursionlimit() * 2
+    groups = {f"group{i}": [{"include-group": f"group{i+1}"}] for i in range(depth)}
+    groups[f"group{depth}"] = ["attrs"]
+    resolver = DependencyGroupResolver(groups)
+    assert [r.name for r in resolver.iter_resolve("group0")] == ["attrs"]
+
+
+UPDATE_GROUPS = {
+    "base": ["attrs"],
+    "test": ["pytest", {"include-group": "base"}],
+    "ci": [{"include-group": "test"}],
+    "docs": ["sphinx"],
+}
+
+
+def test_update_reparses_only_changed_groups():
+    resolver = DependencyGroupResolver(UPDATE_GROUPS)
+    resolver.compile()
+    docs = resolver.resolve("docs")
+
+    spy = unittest.mock.Mock(wraps=resolver._parse_group)
+    resolver._parse_group = spy
+    invalidated = resolver.update({**UPDATE_GROUPS, "base": ["attrs>=23"]})
+    assert invalidated == {"base", "test", "ci"}
+
+    assert resolver.resolve("ci") == (Requirement("pytest"), Requirement("attrs>=23"))
+    assert resolver.resolve("docs") is docs
+    parsed = {call.args[0] for call in spy.call_args_list}
+    assert parsed == {"ci", "test", "base"}
+    assert "docs" in resolver._parsed_groups
+    # only the changed group had to be parsed again
+    assert resolver.lookup("test")[0] is resolver._parsed_groups["test"][0]
+
+
+def test_update_with_no_changes_keeps_everything():
+    resolver = DependencyGroupResolver(UPDATE_GROUPS)
+    resolved = resolver.resolve("ci", dedupe=True)
+    assert resolver.update(dict(UPDATE_GROUPS)) == set()
+    assert resolver.resolve("ci", dedupe=True) is resolved
+
+
+def test_update_invalidates_derived_caches():
+    resolver = DependencyGroupResolver(UPDATE_GROUPS)
+    resolver.resolve("ci", dedupe=True)
+    resolver.resolve("ci", environment={"sys_platform": "linux"})
+    resolver.update({**UPDATE_GROUPS, "base": ["attrs", "attrs"]})
+    assert resolver.resolve("ci", dedupe=True) == (
+        Requirement("pytest"),
+        Requirement("attrs"),
+    )
+    assert len(resolver.resolve("ci", environment={"sys_platform": "linux"})) == 3
+
+
+def test_update_added_and_removed_groups():
+    resolver = DependencyGroupResolver(UPDATE_GROUPS)
+    resolver.compile()
+    table = {k: v for k, v in UPDATE_GROUPS.items() if k != "base"}
+    table["test"] = ["pytest", {"include-group": "new-base"}]
+    table["New_Base"] = ["cattrs"]
+    assert resolver.update(table) == {"base", "test", "ci", "new-base"}
+
+    with pytest.raises(LookupError):
+        resolver.resolve("base")
+    assert resolver.resolve("ci") == (Requirement("pytest"), Requirement("cattrs"))
+
+
+def test_update_can_introduce_and_fix_cycles():
+    resolver = DependencyGroupResolver(UPDATE_GROUPS)
+    resolver.compile()
+    resolver.update({**UPDATE_GROUPS, "base": [{"include-group": "ci"}]})
+    with pytest.raises(CyclicDependencyError):
+        resolver.resolve("ci")
+    resolver.update(UPDATE_GROUPS)
+    assert resolver.resolve_all()["ci"] == (
+        Requirement("pytest"),
+        Requirement("attrs"),
+    )
+
+
+def test_update_validates_before_changing_state():
+    resolver = DependencyGroupResolver(UPDATE_GROUPS)
+    resolved = resolver.resolve("ci")
+    with pytest.raises(TypeError):
+        resolver.update([])
+    with pytest.raises(ValueError, match="Duplicate dependency group names"):
+        resolver.update({"ci": [], "CI": []})
+    assert resolver.resolve("ci") is resolved
+
+
+WHY_GROUPS = {
+    "base": ["urllib3<2", "attrs"],
+    "test": ["pytest", {"include-group": "base"}],
+    "ci": [{"include-group": "test"}, {"include-group": "base"}, "URLLib3"],
+    "docs": ["sphinx"],
+}
+
+
+def test_why():
+    resolver = DependencyGroupResolver(WHY_GROUPS)
+    assert [(s.group, str(s.requirement), s.path) for s in resolver.why("urllib3")] == [
+        ("base", "urllib3<2", ("base",)),
+        ("test", "urllib3<2", ("test", "base")),
+        ("ci", "URLLib3", ("ci",)),
+        ("ci", "urllib3<2", ("ci", "base")),
+    ]
+    assert [s.group for s in resolver.why("Sphinx")] == ["docs"]
+    assert resolver.why("requests") == ()
+
+
+def test_why_builds_index_once():
+    resolver = DependencyGroupResolver(WHY_GROUPS)
+    resolver.why("attrs")
+    with unittest.mock.patch.object(resolver, "compile") as spy:
+        resolver.why("pytest")
+    spy.assert_not_called()
+
+
+def test_why_skips_invalid_groups():
+    resolver = DependencyGroupResolver(
+        {
+            "a": ["attrs", {"include-group": "missing"}],
+            "b": [{"include-group": "a"}],
+            "c": ["attrs"],
+            "d": ["attrs>="],
+        }
+    )
+    assert [s.group for s in resolver.why("attrs")] == ["c"]
+    errors = resolver.compile()
+    assert len(errors) == 2
+    assert all(isinstance(e, (LookupError, ValueError)) for e in errors)
+    with pytest.raises(TypeError):
+        resolver.why(None)
+
+
+def test_why_deep_chain():
+    depth = 2000
+    groups = {f"g{i}": [{"include-group": f"g{i + 1}"}] for i in range(depth)}
+    groups[f"g{depth}"] = ["leaf"]
+    sources = DependencyGroupResolver(groups).why("leaf")
+    assert len(sources) == depth + 1
+    assert sources[0].path == tuple(f"g{i}" for i in range(depth + 1))
+
+
+def test_update_invalidates_why_index():
+    resolver = DependencyGroupResolver(WHY_GROUPS)
+    assert [s.group for s in resolver.why("sphinx")] == ["docs"]
+    resolver.update({**WHY_GROUPS, "test": ["pytest", {"include-group": "docs"}]})
+    assert [s.group for s in resolver.why("sphinx")] == ["test", "ci", "docs"]
+
+
+def test_iter_resolve_sources():
+    resolver = DependencyGroupResolver(WHY_GROUPS)
+    sources = list(resolver.iter_resolve_sources("CI"))
+    assert [(str(s.requirement), s.path) for s in sources] == [
+        ("pytest", ("ci", "test")),
+        ("urllib3<2", ("ci", "test", "base")),
+        ("attrs", ("ci", "test", "base")),
+        ("urllib3<2", ("ci", "base")),
+        ("attrs", ("ci", "base")),
+        ("URLLib3", ("ci",)),
+    ]
+    assert {s.group for s in sources} == {"ci"}
+    assert [s.requirement for s in sources] == list(resolver.resolve("ci"))
+
+    filtered = resolver.iter_resolve_sources(
+        "test", environment={"python_version": "3.12"}
+    )
+    assert [str(s.requirement) for s in filtered] == ["pytest", "urllib3<2", "attrs"]
+
+
+def test_iter_resolve_sources_detects_cycles():
+    resolver = DependencyGroupResolver(
+        {"a": ["x", {"include-group": "b"}], "b": [{"include-group": "a"}]}
+    )
+    with pytest.raises(CyclicDependencyError):
+        list(resolver.iter_resolve_sources("a"))
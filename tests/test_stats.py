@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+from dependency_groups import DependencyGroupResolver, RequirementCache, ResolverStats
+
+GROUPS = {
+    "base": ["attrs", "urllib3"],
+    "test": ["pytest", {"include-group": "base"}],
+    "ci": [{"include-group": "test"}, {"include-group": "base"}],
+}
+
+
+def make_resolver(**kwargs):
+    return DependencyGroupResolver(
+        GROUPS, requirement_cache=RequirementCache(), collect_stats=True, **kwargs
+    )
+
+
+def test_stats_require_opt_in():
+    resolver = DependencyGroupResolver(GROUPS)
+    with pytest.raises(RuntimeError, match="collect_stats=True"):
+        resolver.stats()
+
+
+def test_resolve_stats():
+    resolver = make_resolver()
+    resolver.resolve("ci")
+    stats = resolver.stats()
+    assert isinstance(stats, ResolverStats)
+    assert stats.parse_misses == 3
+    assert stats.parse_hits == 0
+    assert stats.requirements_parsed == 3
+    # ci, test, and base are resolved, then base is found in the cache
+    assert stats.resolve_misses == 3
+    assert stats.resolve_hits == 1
+    assert stats.edges_walked == 3
+    assert stats.max_include_depth == 2
+    assert stats.resolve_time >= stats.parse_time > 0
+    assert stats.normalize_time > 0
+
+    resolver.resolve("ci")
+    stats = resolver.stats()
+    assert stats.resolve_hits == 2
+    assert stats.parse_misses == 3
+
+
+def test_compile_stats():
+    resolver = make_resolver()
+    assert resolver.compile() == []
+    stats = resolver.stats()
+    assert stats.parse_misses == 3
+    assert stats.resolve_misses == 3
+    assert stats.resolve_hits == 3
+    assert stats.edges_walked == 3
+    # compile() visits each group once, so its depth depends on the table order
+    assert stats.max_include_depth <= 2
+
+
+def test_iter_resolve_stats():
+    resolver = make_resolver()
+    list(resolver.iter_resolve("ci"))
+    stats = resolver.stats()
+    assert stats.edges_walked == 3
+    assert stats.max_include_depth == 2
+    assert stats.parse_misses == 3
+    # base is parsed once, but walked twice
+    assert stats.parse_hits == 1
+
+
+def test_stats_are_snapshots():
+    resolver = make_resolver()
+    before = resolver.stats()
+    resolver.resolve("base")
+    assert before.parse_misses == 0
+    assert resolver.stats().parse_misses == 1
+
+
+@pytest.mark.parametrize(
+    "module, argv",
+    (
+        ("dependency_groups.__main__", ["test"]),
+        ("dependency_groups._lint_dependency_groups", []),
+    ),
+)
+def test_cli_stats(tmp_path, capsys, monkeypatch, module, argv):
+    import importlib
+
+    main = importlib.import_module(module).main
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text(
+        '[dependency-groups]\ntest = ["pytest", {include-group = "base"}]\n'
+        'base = ["attrs"]\n'
+    )
+
+    def run():
+        try:
+            main(argv=["-f", str(tomlfile), "--stats", *argv])
+        except SystemExit as e:
+            assert e.code == 0
+        return json.loads(capsys.readouterr().err)
+
+    cold = run()
+    assert cold["cache"] == {"hit": 0, "miss": 1, "disabled": 0}
+    assert cold["resolver"]["parse_misses"] == 2
+    assert cold["resolver"]["edges_walked"] == 1
+
+    warm = run()
+    assert warm["cache"] == {"hit": 1, "miss": 0, "disabled": 0}
+    assert warm["resolver"] is None
+
+
+def test_pip_wrapper_stats(tmp_path, capsys, monkeypatch):
+    from dependency_groups._pip_wrapper import main
+
+    monkeypatch.setattr("dependency_groups._pip_wrapper._invoke_pip", lambda deps: None)
+    tomlfile = tmp_path / "pyproject.toml"
+    tomlfile.write_text('[dependency-groups]\ntest = ["pytest"]\n')
+    main(argv=["-f", str(tomlfile), "--stats", "--no-cache", "test"])
+    report = json.loads(capsys.readouterr().err)
+    assert report["cache"] == {"hit": 0, "miss": 0, "disabled": 1}
+    assert report["resolver"]["requirements_parsed"] == 1
+
+
+def test_lint_stats_combine_files(tmp_path, capsys):
+    from dependency_groups._lint_dependency_groups import main
+
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "pyproject.toml").write_text(
+            '[dependency-groups]\ntest = ["pytest", {include-group = "x"}]\n'
+            'x = [{include-group = "y"}]\ny = ["attrs"]\n'
+        )
+    with pytest.raises(SystemExit):
+        main(argv=["-r", str(tmp_path), "--stats", "--no-cache"])
+    report = json.loads(capsys.readouterr().err)
+    assert report["cache"]["disabled"] == 2
+    assert report["resolver"]["parse_misses"] == 6
+    assert report["resolver"]["max_include_depth"] == 2
@@ -0,0 +1,99 @@
+import sys
+import threading
+import unittest.mock
+
+import pytest
+
+from dependency_groups import DependencyGroupResolver
+
+
+def make_groups(diamond, depth=50):
+    # a diamond, reached through a chain of includes
+    groups = diamond(layers=4, width=4, requirements=["shared>=1"])
+    for i in range(depth):
+        groups[f"chain-{i}"] = [
+            f"chain-package-{i}",
+            {"include-group": f"chain-{i + 1}"},
+        ]
+    groups[f"chain-{depth}"] = [{"include-group": "node-0-0"}]
+    return groups
+
+
+@pytest.fixture(autouse=True)
+def fast_thread_switching():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(target, num_threads=16):
+    barrier = threading.Barrier(num_threads)
+    errors = []
+    results = [None] * num_threads
+
+    def worker(n):
+        try:
+            barrier.wait()
+            results[n] = target(n)
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    return results
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_concurrent_resolves_match_and_parse_once(diamond, compact):
+    groups = make_groups(diamond)
+    expected = DependencyGroupResolver(groups).resolve_all()
+    names = list(groups)
+
+    for _ in range(3):
+        resolver = DependencyGroupResolver(
+            groups, requirement_cache=None, compact=compact
+        )
+        with unittest.mock.patch.object(
+            resolver, "_parse_group_items", wraps=resolver._parse_group_items
+        ) as spy:
+
+            def resolve_some(n, resolver=resolver):
+                # each thread walks the groups in a different order, so that they
+                # overlap in different places
+                order = names[n % len(names) :] + names[: n % len(names)]
+                return {group: resolver.resolve(group) for group in order}
+
+            results = run_threads(resolve_some)
+
+        parsed = [call.args[0] for call in spy.call_args_list]
+        assert sorted(parsed) == sorted(names)
+        assert results[0] == expected
+        for result in results[1:]:
+            assert result == results[0]
+        if not compact:
+            # every thread sees the same cached object
+            for group in names:
+                assert len({id(result[group]) for result in results}) == 1
+
+
+def test_concurrent_compile_and_why(diamond):
+    groups = make_groups(diamond, depth=20)
+    resolver = DependencyGroupResolver(groups)
+
+    def work(n):
+        if n % 3 == 0:
+            return resolver.compile()
+        if n % 3 == 1:
+            return resolver.why("shared")
+        return resolver.resolve("chain-0", dedupe=True, environment={})
+
+    results = run_threads(work, num_threads=12)
+    assert all(result == [] for result in results[0::3])
+    assert len({id(result) for result in results[1::3]}) == 1
+    assert len(results[1]) == len(groups)
+    assert len({id(result) for result in results[2::3]}) == 1